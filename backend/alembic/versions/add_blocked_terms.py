@@ -0,0 +1,39 @@
+"""Add the blocked_terms table for the review content filter.
+
+Revision ID: add_blocked_terms
+Revises: add_review_risk_scores
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_blocked_terms"
+down_revision: Union[str, Sequence[str], None] = "add_review_risk_scores"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("blocked_terms"):
+        return
+    op.create_table(
+        "blocked_terms",
+        sa.Column("term", sa.String(length=100), nullable=False),
+        sa.Column("category", sa.String(length=40), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.CheckConstraint(
+            "category IN ('hate_speech', 'harassment', 'spam', 'other')",
+            name="ck_blocked_term_category",
+        ),
+        sa.PrimaryKeyConstraint("term"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("blocked_terms")
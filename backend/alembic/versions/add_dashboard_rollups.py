@@ -0,0 +1,91 @@
+"""Add admin dashboard rollups (running counters + daily activity) and backfill them.
+
+Revision ID: add_dashboard_rollups
+Revises: add_violation_groups
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_dashboard_rollups"
+down_revision: Union[str, Sequence[str], None] = "add_violation_groups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DAILY_COLUMNS = (
+    "reviews_submitted",
+    "reviews_approved",
+    "reviews_rejected",
+    "violations_reported",
+    "users_created",
+    "active_users",
+)
+
+# Backfill: the rebuild statements of app.crud.dashboard as of this revision,
+# copied here so later changes to the app can't alter what this migration does.
+BACKFILL_SQL = [
+    "LOCK TABLE dashboard_counters, dashboard_daily IN SHARE ROW EXCLUSIVE MODE",
+    "DELETE FROM dashboard_counters",
+    """
+INSERT INTO dashboard_counters (name, value)
+SELECT 'reviews.' || status, count(*) FROM reviews GROUP BY status
+UNION ALL
+SELECT 'violations.' || status || '.' || severity, count(*) FROM violations GROUP BY status, severity
+UNION ALL
+SELECT 'users.' || status, count(*) FROM users GROUP BY status
+""",
+    "DELETE FROM dashboard_daily",
+    """
+INSERT INTO dashboard_daily (
+    day, reviews_submitted, reviews_approved, reviews_rejected,
+    violations_reported, users_created, active_users
+)
+SELECT day, sum(rs), sum(ra), sum(rr), sum(vr), sum(uc), sum(au)
+FROM (
+    SELECT CAST(created_at AS date) AS day, 1 AS rs, 0 AS ra, 0 AS rr, 0 AS vr, 0 AS uc, 0 AS au FROM reviews
+    UNION ALL
+    SELECT CAST(updated_at AS date), 0, CAST(status = 'approved' AS int), CAST(status = 'rejected' AS int), 0, 0, 0
+    FROM reviews WHERE status IN ('approved', 'rejected')
+    UNION ALL
+    SELECT CAST(created_at AS date), 0, 0, 0, 1, 0, 0 FROM violations
+    UNION ALL
+    SELECT CAST(created_at AS date), 0, 0, 0, 0, 1, 0 FROM users
+    UNION ALL
+    SELECT CAST(last_login AS date), 0, 0, 0, 0, 0, 1 FROM users WHERE last_login IS NOT NULL
+) activity
+GROUP BY day
+""",
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("dashboard_counters"):
+        op.create_table(
+            "dashboard_counters",
+            sa.Column("name", sa.String(length=64), nullable=False),
+            sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.PrimaryKeyConstraint("name"),
+        )
+    if not inspector.has_table("dashboard_daily"):
+        op.create_table(
+            "dashboard_daily",
+            sa.Column("day", sa.Date(), nullable=False),
+            *[sa.Column(column, sa.Integer(), nullable=False, server_default="0") for column in DAILY_COLUMNS],
+            sa.PrimaryKeyConstraint("day"),
+        )
+
+    # Backfill from the base tables.
+    for statement in BACKFILL_SQL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_table("dashboard_daily")
+    op.drop_table("dashboard_counters")
@@ -0,0 +1,45 @@
+"""Add oauth_states table for cross-worker PKCE state storage.
+
+Also merges the two violation-schema heads
+(fix_violation_status_constraint, relax_legacy_violations_reason).
+
+Revision ID: add_oauth_states
+Revises: fix_violation_status_constraint, relax_legacy_violations_reason
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_oauth_states"
+down_revision: Union[str, Sequence[str], None] = (
+    "fix_violation_status_constraint",
+    "relax_legacy_violations_reason",
+)
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if inspector.has_table("oauth_states"):
+        return
+
+    op.create_table(
+        "oauth_states",
+        sa.Column("state", sa.String(length=128), nullable=False),
+        sa.Column("code_verifier", sa.String(length=128), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("state"),
+    )
+    op.create_index(op.f("ix_oauth_states_expires_at"), "oauth_states", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_oauth_states_expires_at"), table_name="oauth_states")
+    op.drop_table("oauth_states")
@@ -0,0 +1,45 @@
+"""Add rate_limit_counters table for the shared rate-limit backend.
+
+Revision ID: add_rate_limit_counters
+Revises: add_oauth_states
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_rate_limit_counters"
+down_revision: Union[str, Sequence[str], None] = "add_oauth_states"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if inspector.has_table("rate_limit_counters"):
+        return
+
+    op.create_table(
+        "rate_limit_counters",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("window", sa.BigInteger(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key", "window"),
+    )
+    op.create_index(
+        op.f("ix_rate_limit_counters_expires_at"),
+        "rate_limit_counters",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_rate_limit_counters_expires_at"), table_name="rate_limit_counters")
+    op.drop_table("rate_limit_counters")
@@ -0,0 +1,47 @@
+"""Add review_fingerprints (MinHash signature + LSH buckets) for near-duplicate detection.
+
+Existing reviews are fingerprinted by scripts/backfill_fingerprints.py, not
+here: it hashes every review in Python and is safe to run while serving.
+
+Revision ID: add_review_fingerprints
+Revises: add_blocked_terms
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_review_fingerprints"
+down_revision: Union[str, Sequence[str], None] = "add_blocked_terms"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("review_fingerprints"):
+        return
+    op.create_table(
+        "review_fingerprints",
+        sa.Column("review_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("signature", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column("buckets", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["review_id"], ["reviews.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("review_id"),
+    )
+    op.create_index(
+        "ix_review_fingerprints_buckets",
+        "review_fingerprints",
+        ["buckets"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_review_fingerprints_buckets", table_name="review_fingerprints")
+    op.drop_table("review_fingerprints")
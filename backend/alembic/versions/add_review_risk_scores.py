@@ -0,0 +1,35 @@
+"""Add pre-moderation risk_score / risk_flags to reviews.
+
+Revision ID: add_review_risk_scores
+Revises: add_dashboard_rollups
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_review_risk_scores"
+down_revision: Union[str, Sequence[str], None] = "add_dashboard_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {column["name"] for column in sa.inspect(bind).get_columns("reviews")}
+    # Nullable, no default: a metadata-only change even on a large table.
+    # Existing pending reviews are picked up by the premoderate_backlog job.
+    if "risk_score" not in columns:
+        op.add_column("reviews", sa.Column("risk_score", sa.Float(), nullable=True))
+    if "risk_flags" not in columns:
+        op.add_column("reviews", sa.Column("risk_flags", postgresql.ARRAY(sa.String(length=40)), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("reviews", "risk_flags")
+    op.drop_column("reviews", "risk_score")
@@ -0,0 +1,30 @@
+"""Add (created_at, id) index on users for keyset pagination of the admin list.
+
+Revision ID: add_users_created_at_index
+Revises: add_rate_limit_counters
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_users_created_at_index"
+down_revision: Union[str, Sequence[str], None] = "add_rate_limit_counters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {ix["name"] for ix in inspector.get_indexes("users")}
+    if "ix_users_created_at_id" not in existing:
+        op.create_index("ix_users_created_at_id", "users", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_at_id", table_name="users")
@@ -0,0 +1,94 @@
+"""Add violation_groups (per-review report aggregates) and backfill them.
+
+Revision ID: add_violation_groups
+Revises: add_violation_queue_indexes
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_violation_groups"
+down_revision: Union[str, Sequence[str], None] = "add_violation_queue_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Backfill: the full-recompute aggregate of app.crud.violation_groups as of
+# this revision, copied here so later changes to the app can't alter what
+# this migration does.
+BACKFILL_SQL = """
+WITH v AS (
+    SELECT review_id, violation_type, created_at,
+           CASE severity WHEN 'low' THEN 1 WHEN 'medium' THEN 2 WHEN 'high' THEN 3 WHEN 'critical' THEN 4 ELSE 0 END AS rank,
+           status IN ('open', 'in_review') AS is_open
+    FROM violations
+), agg AS (
+    SELECT review_id,
+           count(*) FILTER (WHERE is_open) AS open_count,
+           count(*) AS total_count,
+           coalesce(max(rank) FILTER (WHERE is_open), 0) AS max_severity_rank,
+           coalesce(array_agg(DISTINCT violation_type) FILTER (WHERE is_open), '{}') AS violation_types,
+           min(created_at) AS first_reported_at,
+           coalesce(max(created_at) FILTER (WHERE is_open), max(created_at)) AS last_reported_at
+    FROM v
+    GROUP BY review_id
+)
+INSERT INTO violation_groups AS g (
+    review_id, open_count, total_count, max_severity_rank, violation_types,
+    first_reported_at, last_reported_at, priority, updated_at
+)
+SELECT review_id, open_count, total_count, max_severity_rank, violation_types,
+       first_reported_at, last_reported_at,
+       CASE WHEN open_count > 0 THEN ln(power(2, greatest(max_severity_rank, 1) - 1) * open_count) + ln(2) * extract(epoch FROM last_reported_at) / 86400 END,
+       now() AT TIME ZONE 'utc'
+FROM agg
+ON CONFLICT (review_id) DO UPDATE SET
+    open_count = EXCLUDED.open_count,
+    total_count = EXCLUDED.total_count,
+    max_severity_rank = EXCLUDED.max_severity_rank,
+    violation_types = EXCLUDED.violation_types,
+    first_reported_at = EXCLUDED.first_reported_at,
+    last_reported_at = EXCLUDED.last_reported_at,
+    priority = EXCLUDED.priority,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("violation_groups"):
+        op.create_table(
+            "violation_groups",
+            sa.Column("review_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("open_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("total_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("max_severity_rank", sa.SmallInteger(), nullable=False, server_default="0"),
+            sa.Column("violation_types", postgresql.ARRAY(sa.String(length=40)), nullable=False, server_default="{}"),
+            sa.Column("first_reported_at", sa.DateTime(), nullable=False),
+            sa.Column("last_reported_at", sa.DateTime(), nullable=False),
+            sa.Column("priority", sa.Float(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["review_id"], ["reviews.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("review_id"),
+        )
+        op.create_index(
+            "ix_violation_groups_open_priority",
+            "violation_groups",
+            [sa.text("priority DESC"), sa.text("review_id DESC")],
+            unique=False,
+            postgresql_where=sa.text("open_count > 0"),
+        )
+
+    # Backfill from existing reports.
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_violation_groups_open_priority", table_name="violation_groups")
+    op.drop_table("violation_groups")
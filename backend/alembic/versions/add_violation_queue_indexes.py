@@ -0,0 +1,48 @@
+"""Add full-text and keyset indexes for the moderation queue.
+
+Revision ID: add_violation_queue_indexes
+Revises: add_users_created_at_index
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_violation_queue_indexes"
+down_revision: Union[str, Sequence[str], None] = "add_users_created_at_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    violation_indexes = {ix["name"] for ix in inspector.get_indexes("violations")}
+    if "ix_violations_status_created_at_id" not in violation_indexes:
+        op.create_index(
+            "ix_violations_status_created_at_id",
+            "violations",
+            ["status", "created_at", "id"],
+            unique=False,
+        )
+
+    # Expression indexes must match the query expressions in crud.violations exactly.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_violations_reason_fts ON violations "
+        "USING gin (to_tsvector('english'::regconfig, coalesce(reason, '')))"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_reviews_content_fts ON reviews "
+        "USING gin (to_tsvector('english'::regconfig, content))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_reviews_content_fts")
+    op.execute("DROP INDEX IF EXISTS ix_violations_reason_fts")
+    op.drop_index("ix_violations_status_created_at_id", table_name="violations")
@@ -1,71 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+"""
+Moderation sanctions: mute, unmute, block and unblock a user.
+
+Enforcement is enforce_not_muted_or_blocked in app.dependencies, which reads
+the state from the already-authenticated User row (see app.core.sanctions),
+so a change made here applies from the user's next request.
+"""
+
+import uuid
 from datetime import datetime, timedelta
 
-from app.dependencies import get_db, get_current_user
+from fastapi import APIRouter, HTTPException, status
+
+from app.core.events import publish_event
+from app.dependencies import AdminUser, DBDep
 from app.models.user import User
 from app.schemas import MuteUserRequest, UserStatusOut
+from app import crud
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(prefix="/admin/users", tags=["admin"])
 
 
-def require_admin(user: User):
-    # If your project uses a roles table instead, tell me and I’ll rewrite this.
-    if getattr(user, "role", None) != "admin":
-        raise HTTPException(status_code=403, detail="Admin only")
+async def _get_target(db: DBDep, admin: User, user_id: uuid.UUID) -> User:
+    user = await crud.users.get_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if user.id == admin.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You cannot mute or block your own account.",
+        )
     return user
 
 
-@router.post("/users/{user_id}/mute", response_model=UserStatusOut)
-def mute_user(
-    user_id: str,
-    body: MuteUserRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    require_admin(current_user)
+async def _apply(db: DBDep, admin: User, user_id: uuid.UUID, **changes) -> UserStatusOut:
+    user = await _get_target(db, admin, user_id)
+    user = await crud.users.update_sanctions(db, user, **changes)
+    await db.commit()
+    publish_event(
+        "user.sanctioned",
+        user_id=user.id,
+        is_blocked=user.is_blocked,
+        muted_until=user.muted_until,
+    )
+    return UserStatusOut.model_validate(user)
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
 
-    user.muted_until = datetime.utcnow() + timedelta(minutes=body.minutes)
-    db.commit()
-    db.refresh(user)
-    return user
+@router.post("/{user_id}/mute", response_model=UserStatusOut)
+async def mute_user(user_id: uuid.UUID, body: MuteUserRequest, db: DBDep, admin: AdminUser):
+    """Stop the user writing reviews for `minutes` (replaces any current mute)."""
+    muted_until = datetime.utcnow() + timedelta(minutes=body.minutes)
+    return await _apply(db, admin, user_id, muted_until=muted_until)
 
 
-@router.post("/users/{user_id}/block", response_model=UserStatusOut)
-def block_user(
-    user_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    require_admin(current_user)
+@router.post("/{user_id}/unmute", response_model=UserStatusOut)
+async def unmute_user(user_id: uuid.UUID, db: DBDep, admin: AdminUser):
+    return await _apply(db, admin, user_id, unmute=True)
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    user.is_blocked = True
-    db.commit()
-    db.refresh(user)
-    return user
 
+@router.post("/{user_id}/block", response_model=UserStatusOut)
+async def block_user(user_id: uuid.UUID, db: DBDep, admin: AdminUser):
+    return await _apply(db, admin, user_id, is_blocked=True)
 
-@router.post("/users/{user_id}/unblock", response_model=UserStatusOut)
-def unblock_user(
-    user_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    require_admin(current_user)
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
 
-    user.is_blocked = False
-    db.commit()
-    db.refresh(user)
-    return user
\ No newline at end of file
+@router.post("/{user_id}/unblock", response_model=UserStatusOut)
+async def unblock_user(user_id: uuid.UUID, db: DBDep, admin: AdminUser):
+    return await _apply(db, admin, user_id, is_blocked=False)
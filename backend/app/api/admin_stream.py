@@ -0,0 +1,39 @@
+"""
+Admin moderation feed: GET /admin/stream (server-sent events).
+
+Pushes lightweight events from app.core.events so the admin page can refetch
+only what changed instead of polling the pending-review and violation lists.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+
+from app.core.events import get_event_bus
+from app.dependencies import AdminUser, DBDep
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/stream")
+async def admin_stream(
+    db: DBDep,
+    _: AdminUser,
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+):
+    """
+    Event stream of moderation activity. Event types:
+      review.submitted, review.edited, review.moderated, review.deleted,
+      violation.reported, violation.updated, violation.group_resolved.
+    Send Last-Event-ID to resume; a `reset` event means the gap could not be
+    replayed and the client should refetch its lists.
+    """
+    # Auth is done; return the connection to the pool rather than holding it
+    # for the lifetime of the stream.
+    await db.close()
+    return StreamingResponse(
+        get_event_bus().stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -16,38 +16,37 @@ Privacy rules:
   - All log lines that reference a user identity use the HMAC blind index only.
 """
 
-import asyncio
 import hashlib
 import hmac as hmac_mod
 import os
 import secrets
-import smtplib
 from base64 import urlsafe_b64encode
-from email.mime.text import MIMEText
 from urllib.parse import urlencode
 
-from fastapi import APIRouter, HTTPException, Query, status
+import httpx
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from fastapi.responses import RedirectResponse
+from jose import JWTError
 
-from app.dependencies import DBDep
+from app.dependencies import DBDep, raise_rate_limited
 from app.schemas import OTPRequest, OTPVerify, TokenResponse
 from app.core.jwt import create_access_token
 from app.core.config import settings
 from app.core.encryption import blind_index
-from app.core.oauth2 import entra_client, decode_id_token
+from app.core.oauth2 import get_entra_client
 from app.core.logger import get_logger
+from app.core.mailer import build_otp_message, get_mail_dispatcher
+from app.core.rate_limit import get_client_ip, get_rate_limiter
+from app.core.state_store import STATE_TTL_SECONDS, get_state_store
 from app import crud
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 # ---------------------------------------------------------------------------
-# In-process PKCE / state store
-# Each entry: { "code_verifier": str, "expires_at": float }
-# Entries are tiny and short-lived (5 min); cleaned up on each /login hit.
+# PKCE / state — stored via app.core.state_store (in-process or shared DB,
+# see OAUTH_STATE_BACKEND) so /callback can be served by any worker.
 # ---------------------------------------------------------------------------
-_pending_states: dict[str, dict] = {}
-_STATE_TTL = 300  # seconds
 
 
 def _pkce_pair() -> tuple[str, str]:
@@ -58,12 +57,12 @@ def _pkce_pair() -> tuple[str, str]:
     return verifier, challenge
 
 
-def _purge_stale_states() -> None:
-    import time
-    now = time.time()
-    stale = [k for k, v in _pending_states.items() if v["expires_at"] < now]
-    for k in stale:
-        del _pending_states[k]
+async def _begin_oauth_state() -> tuple[str, str]:
+    """Create and store a new state + PKCE verifier. Returns (state, code_challenge)."""
+    state = secrets.token_urlsafe(32)
+    code_verifier, code_challenge = _pkce_pair()
+    await get_state_store().put(state, code_verifier, ttl_seconds=STATE_TTL_SECONDS)
+    return state, code_challenge
 
 
 # ---------------------------------------------------------------------------
@@ -76,23 +75,14 @@ async def login():
     Redirect the user to the Microsoft Entra ID login page.
     Requires ENABLE_OAUTH=true and all ENTRA_* variables set in .env.
     """
+    entra_client = get_entra_client()
     if not entra_client:
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
             detail="OAuth is not enabled. Set ENABLE_OAUTH=true in .env.",
         )
 
-    import time
-    _purge_stale_states()
-
-    state = secrets.token_urlsafe(32)
-    code_verifier, code_challenge = _pkce_pair()
-
-    _pending_states[state] = {
-        "code_verifier": code_verifier,
-        "expires_at": time.time() + _STATE_TTL,
-    }
-
+    state, code_challenge = await _begin_oauth_state()
     url = entra_client.get_authorization_url(state=state, code_challenge=code_challenge)
     return RedirectResponse(url=url, status_code=302)
 
@@ -108,32 +98,26 @@ async def oauth_callback(
     Exchanges the authorization code for tokens, creates or retrieves the user,
     and returns a JWT — same shape as the OTP verify endpoint.
     """
+    entra_client = get_entra_client()
     if not entra_client:
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
             detail="OAuth is not enabled.",
         )
 
-    # Validate state and retrieve PKCE verifier
-    entry = _pending_states.pop(state, None)
-    if entry is None:
+    # Validate state and retrieve PKCE verifier (single-use, expired states are rejected)
+    code_verifier = await get_state_store().pop(state)
+    if code_verifier is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired OAuth state. Please try logging in again.",
         )
 
-    import time
-    if entry["expires_at"] < time.time():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="OAuth state expired. Please try logging in again.",
-        )
-
     # Exchange code for tokens
     try:
         token_response = await entra_client.exchange_code_for_token(
             code=code,
-            code_verifier=entry["code_verifier"],
+            code_verifier=code_verifier,
         )
     except Exception as e:
         logger.error(f"Entra token exchange failed: {type(e).__name__}: {e}")
@@ -142,7 +126,7 @@ async def oauth_callback(
             detail="Failed to exchange authorization code. Please try again.",
         )
 
-    # Decode the ID token to get user claims
+    # Verify the ID token locally against the cached JWKS
     id_token = token_response.get("id_token")
     if not id_token:
         logger.error("Entra token response missing id_token")
@@ -152,14 +136,23 @@ async def oauth_callback(
         )
 
     try:
-        claims = decode_id_token(id_token)
-    except Exception:
+        claims = await entra_client.verify_id_token(id_token, access_token=token_response.get("access_token"))
+    except httpx.HTTPError as e:
+        logger.error(f"Entra signing keys unavailable: {type(e).__name__}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Could not verify Microsoft ID token. Please try again.",
+        )
+    except JWTError as e:
+        logger.warning(f"Entra ID token rejected: {e}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to decode Microsoft ID token.",
+            detail="Invalid Microsoft ID token.",
         )
 
-    email = (claims.get("email") or claims.get("preferred_username") or "").lower().strip()
+    # The home-tenant UPN (verify_id_token pinned the tenant). Not `email`:
+    # that claim is user-editable and not verified by Entra.
+    email = (claims.get("preferred_username") or "").lower().strip()
     if not email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -221,7 +214,7 @@ async def oauth_callback(
 # ---------------------------------------------------------------------------
 
 @router.post("/request-otp", status_code=status.HTTP_200_OK)
-async def request_otp(body: OTPRequest, db: DBDep):
+async def request_otp(body: OTPRequest, request: Request, db: DBDep):
     """
     Request an OTP for the given email. The code is sent by email.
     Rate-limited. Returns 200 regardless of email existence to prevent enumeration.
@@ -232,6 +225,7 @@ async def request_otp(body: OTPRequest, db: DBDep):
     # If OAuth is enabled we short-circuit to the Entra login flow.
     # Only allow AUB student emails for OAuth-initiated sign-in.
     if settings.ENABLE_OAUTH:
+        entra_client = get_entra_client()
         if not entra_client:
             raise HTTPException(
                 status_code=status.HTTP_501_NOT_IMPLEMENTED,
@@ -246,30 +240,36 @@ async def request_otp(body: OTPRequest, db: DBDep):
             )
 
         # Create PKCE + state and store it so /callback can validate
-        import time
-        _purge_stale_states()
-        state = secrets.token_urlsafe(32)
-        code_verifier, code_challenge = _pkce_pair()
-        _pending_states[state] = {
-            "code_verifier": code_verifier,
-            "expires_at": time.time() + _STATE_TTL,
-        }
-
+        state, code_challenge = await _begin_oauth_state()
         auth_url = entra_client.get_authorization_url(state=state, code_challenge=code_challenge, login_hint=email)
         return {"oauth": True, "auth_url": auth_url}
 
-    if await crud.otps.is_rate_limited(db, email):
-        logger.warning(f"OTP rate limit hit — email_index={idx}")
-        return {"message": "If this email is registered, a code has been sent."}
+    exceeded = await get_rate_limiter().check("otp_request", email_index=idx, ip=get_client_ip(request))
+    if exceeded:
+        logger.warning(f"OTP rate limit hit — scope={exceeded.scope} email_index={idx}")
+        if exceeded.scope == "email":
+            # Same response as success so the limit can't be used to probe addresses.
+            return {"message": "If this email is registered, a code has been sent."}
+        raise_rate_limited(exceeded)
+
+    dispatcher = get_mail_dispatcher()
+    if dispatcher is None or not dispatcher.running:
+        logger.error("Mail dispatcher unavailable — set SMTP_HOST/PORT/USER/PASS in .env")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to send OTP email. Check SMTP settings in .env.",
+        )
 
     otp, plain_code = await crud.otps.create(db, email=email)
+    # Commit before enqueueing: a worker may deliver the mail at once, and the
+    # code in it must already be verifiable.
     await db.commit()
 
-    sent = await _send_otp_email(email, plain_code)
-    if not sent:
+    if not dispatcher.enqueue(build_otp_message(email, plain_code), log_key=idx):
+        logger.warning(f"OTP mail queue full — email_index={idx}")
         raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail="Failed to send OTP email. Check SMTP settings in .env.",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Email service is busy. Please try again in a moment.",
         )
 
     logger.info(f"OTP issued — email_index={idx}")
@@ -277,7 +277,7 @@ async def request_otp(body: OTPRequest, db: DBDep):
 
 
 @router.post("/verify-otp", response_model=TokenResponse)
-async def verify_otp(body: OTPVerify, db: DBDep):
+async def verify_otp(body: OTPVerify, request: Request, db: DBDep):
     """
     Verify an OTP code. On success, returns a JWT access token.
     New users get a student profile created automatically.
@@ -285,6 +285,11 @@ async def verify_otp(body: OTPVerify, db: DBDep):
     email = body.email.lower().strip()
     idx = blind_index(email)
 
+    exceeded = await get_rate_limiter().check("otp_verify", email_index=idx, ip=get_client_ip(request))
+    if exceeded:
+        logger.warning(f"OTP verify rate limit hit — scope={exceeded.scope} email_index={idx}")
+        raise_rate_limited(exceeded)
+
     success, otp, error = await crud.otps.verify(db, email=email, plain_code=body.code)
 
     if not success:
@@ -330,37 +335,3 @@ async def verify_otp(body: OTPVerify, db: DBDep):
 async def logout():
     """Logout — JWT is stateless, client discards the token."""
     return {"message": "Logged out successfully."}
-
-
-# ---------------------------------------------------------------------------
-# Email sending helper (OTP only)
-# ---------------------------------------------------------------------------
-
-async def _send_otp_email(email: str, code: str) -> bool:
-    if not all([settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_USER, settings.SMTP_PASS]):
-        logger.error("SMTP not fully configured — set SMTP_HOST/PORT/USER/PASS in .env")
-        return False
-
-    def _send_blocking():
-        msg = MIMEText(
-            f"Your {settings.APP_NAME} verification code is: {code}\n\n"
-            f"This code expires in {settings.OTP_EXPIRY_MINUTES} minutes.\n"
-            f"If you didn't request this, you can safely ignore this email."
-        )
-        msg["Subject"] = f"Your {settings.APP_NAME} verification code"
-        msg["From"] = settings.SMTP_FROM or settings.SMTP_USER
-        msg["To"] = email
-
-        with smtplib.SMTP(settings.SMTP_HOST, int(settings.SMTP_PORT)) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASS)
-            server.send_message(msg)
-
-    idx = blind_index(email)
-    try:
-        await asyncio.get_event_loop().run_in_executor(None, _send_blocking)
-        logger.info(f"OTP email delivered — email_index={idx}")
-        return True
-    except Exception as e:
-        logger.error(f"OTP email delivery failed — email_index={idx} — {type(e).__name__}: {e}")
-        return False
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Admin blocklist for the review content filter: /admin/blocklist.
+
+Edits take effect immediately in the worker that served them and within
+CONTENT_FILTER_REFRESH_SECONDS everywhere else (see app.core.content_filter).
+"""
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.core.content_filter import normalize_term, reload_content_filter
+from app.dependencies import AdminUser, DBDep
+from app.schemas import BlockedTermCreate, BlockedTermOut
+from app import crud
+
+router = APIRouter(prefix="/admin/blocklist", tags=["admin"])
+
+
+@router.get("", response_model=list[BlockedTermOut])
+async def list_blocked_terms(db: DBDep, _: AdminUser):
+    return [BlockedTermOut.model_validate(t) for t in await crud.blocked_terms.get_all(db)]
+
+
+@router.post("", response_model=BlockedTermOut, status_code=status.HTTP_201_CREATED)
+async def add_blocked_term(body: BlockedTermCreate, db: DBDep, _: AdminUser):
+    """Add a word or phrase (or change its category). Stored in normalised form."""
+    term = normalize_term(body.term)
+    if not term:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Term must contain a word")
+    blocked = await crud.blocked_terms.upsert(db, term, body.category)
+    await db.commit()
+    await reload_content_filter()
+    return BlockedTermOut.model_validate(blocked)
+
+
+@router.delete("/{term}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_blocked_term(term: str, db: DBDep, _: AdminUser):
+    if not await crud.blocked_terms.remove(db, normalize_term(term)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Term not found")
+    await db.commit()
+    await reload_content_filter()
@@ -7,7 +7,7 @@ from typing import Optional, Literal
 
 from fastapi import APIRouter, HTTPException, Query, status
 
-from app.dependencies import DBDep, CurrentUserOptional
+from app.dependencies import ReadDBDep, CurrentUserOptional
 from app.schemas import (
     CourseOut, CourseOutWithStats,
     SectionOut, SectionOutBrief,
@@ -25,7 +25,7 @@ courses_router = APIRouter(prefix="/courses", tags=["courses"])
 
 @courses_router.get("", response_model=list[CourseOutWithStats])
 async def list_courses(
-    db: DBDep,
+    db: ReadDBDep,
     department: Optional[str] = Query(default=None),
     search: Optional[str] = Query(default=None, min_length=2),
     skip: int = Query(default=0, ge=0),
@@ -45,13 +45,13 @@ async def list_courses(
 
 
 @courses_router.get("/departments", response_model=list[str])
-async def list_departments(db: DBDep):
+async def list_departments(db: ReadDBDep):
     """Return all distinct department codes."""
     return await crud.courses.get_departments(db)
 
 
 @courses_router.get("/{course_id}", response_model=CourseOutWithStats)
-async def get_course(course_id: uuid.UUID, db: DBDep):
+async def get_course(course_id: uuid.UUID, db: ReadDBDep):
     course = await crud.courses.get_by_id(db, course_id)
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
@@ -62,7 +62,7 @@ async def get_course(course_id: uuid.UUID, db: DBDep):
 @courses_router.get("/{course_id}/sections", response_model=list[SectionOut])
 async def get_course_sections(
     course_id: uuid.UUID,
-    db: DBDep,
+    db: ReadDBDep,
     semester_id: Optional[uuid.UUID] = Query(default=None),
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=100),
@@ -83,7 +83,7 @@ professors_router = APIRouter(prefix="/professors", tags=["professors"])
 
 @professors_router.get("", response_model=list[ProfessorOut])
 async def list_professors(
-    db: DBDep,
+    db: ReadDBDep,
     department: Optional[str] = Query(default=None),
     search: Optional[str] = Query(default=None, min_length=2),
     skip: int = Query(default=0, ge=0),
@@ -95,7 +95,7 @@ async def list_professors(
 
 
 @professors_router.get("/{professor_id}", response_model=ProfessorOutWithStats)
-async def get_professor(professor_id: uuid.UUID, db: DBDep):
+async def get_professor(professor_id: uuid.UUID, db: ReadDBDep):
     professor = await crud.professors.get_by_id(db, professor_id)
     if not professor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Professor not found")
@@ -109,7 +109,7 @@ async def get_professor(professor_id: uuid.UUID, db: DBDep):
 @professors_router.get("/{professor_id}/sections", response_model=list[SectionOut])
 async def get_professor_sections(
     professor_id: uuid.UUID,
-    db: DBDep,
+    db: ReadDBDep,
     semester_id: Optional[uuid.UUID] = Query(default=None),
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=100),
@@ -124,7 +124,7 @@ async def get_professor_sections(
 @professors_router.get("/{professor_id}/courses", response_model=list[CourseOut])
 async def get_professor_courses(
     professor_id: uuid.UUID,
-    db: DBDep,
+    db: ReadDBDep,
 ):
     professor = await crud.professors.get_by_id(db, professor_id)
     if not professor:
@@ -139,7 +139,7 @@ sections_router = APIRouter(prefix="/sections", tags=["sections"])
 
 
 @sections_router.get("/{section_id}", response_model=SectionOut)
-async def get_section(section_id: uuid.UUID, db: DBDep):
+async def get_section(section_id: uuid.UUID, db: ReadDBDep):
     section = await crud.sections.get_by_id(db, section_id, load_relations=True)
     if not section:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
@@ -154,10 +154,10 @@ semesters_router = APIRouter(prefix="/semesters", tags=["semesters"])
 
 
 @semesters_router.get("", response_model=list[SemesterOut])
-async def list_semesters(db: DBDep):
+async def list_semesters(db: ReadDBDep):
     return await crud.semesters.get_all(db)
 
 
 @semesters_router.get("/current", response_model=Optional[SemesterOut])
-async def get_current_semester(db: DBDep):
+async def get_current_semester(db: ReadDBDep):
     return await crud.semesters.get_current(db)
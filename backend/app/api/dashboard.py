@@ -0,0 +1,86 @@
+"""
+Admin overview: GET /admin/dashboard, GET /admin/premoderation and
+GET /admin/slow-queries.
+
+The dashboard is served entirely from the rollups in crud.dashboard, so it
+costs the same on a table of a hundred reviews as on one of ten million.
+"""
+
+from typing import get_args
+
+from fastapi import APIRouter, Query
+
+from app.core.premoderation import get_premoderation
+from app.core.slow_queries import SortBy, get_slow_query_log
+from app.dependencies import AdminUser, ReadDBDep
+from app.schemas import DashboardDay, DashboardOut, PremoderationOut, SlowQueriesOut, SlowQueryOut
+from app import crud
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+REVIEW_STATUSES = get_args(crud.reviews.ReviewStatus)
+VIOLATION_STATUSES = get_args(crud.violations.ViolationStatus)
+VIOLATION_SEVERITIES = get_args(crud.violations.ViolationSeverity)
+USER_STATUSES = ("active", "suspended", "inactive")
+
+
+@router.get("/dashboard", response_model=DashboardOut)
+async def admin_dashboard(
+    db: ReadDBDep,
+    _: AdminUser,
+    days: int = Query(default=30, ge=1, le=365),
+):
+    """Queue sizes, user counts and daily activity for the last `days` UTC days."""
+    counters = await crud.dashboard.get_counters(db)
+    daily = await crud.dashboard.get_daily(db, days)
+
+    def count(key: str) -> int:
+        return counters.get(key, 0)
+
+    return DashboardOut(
+        reviews_by_status={s: count(crud.dashboard.review_key(s)) for s in REVIEW_STATUSES},
+        violations_by_status={
+            s: sum(count(crud.dashboard.violation_key(s, sev)) for sev in VIOLATION_SEVERITIES)
+            for s in VIOLATION_STATUSES
+        },
+        open_violations_by_severity={
+            sev: sum(count(crud.dashboard.violation_key(s, sev)) for s in crud.violation_groups.OPEN_STATUSES)
+            for sev in VIOLATION_SEVERITIES
+        },
+        users_by_status={s: count(crud.dashboard.user_key(s)) for s in USER_STATUSES},
+        daily=[DashboardDay(**row) for row in daily],
+    )
+
+
+@router.get("/premoderation", response_model=PremoderationOut)
+async def premoderation_status(_: AdminUser):
+    """Pre-moderation pipeline counters for this worker process."""
+    pipeline = get_premoderation()
+    if pipeline is None:
+        return PremoderationOut(enabled=False)
+    return PremoderationOut(
+        enabled=True,
+        running=pipeline.running,
+        model_loaded=pipeline.scorer.model is not None,
+        auto_approve_below=pipeline.auto_approve_below,
+        queue_size=pipeline.qsize(),
+        stats=pipeline.stats.snapshot(),
+    )
+
+
+@router.get("/slow-queries", response_model=SlowQueriesOut)
+async def slow_queries(
+    _: AdminUser,
+    limit: int = Query(default=20, ge=1, le=100),
+    sort_by: SortBy = "total",
+):
+    """Slowest statement fingerprints seen by this worker process, with their last EXPLAIN plan."""
+    slow_log = get_slow_query_log()
+    if slow_log is None:
+        return SlowQueriesOut(enabled=False)
+    return SlowQueriesOut(
+        enabled=True,
+        threshold_ms=slow_log.threshold_ms,
+        dropped=slow_log.dropped,
+        queries=[SlowQueryOut.model_validate(stat) for stat in slow_log.top(limit, sort_by)],
+    )
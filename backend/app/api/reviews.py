@@ -5,37 +5,62 @@ Reviews routes — submit, edit, delete, like/dislike.
 import uuid
 from typing import Literal
 
-from datetime import datetime
 from fastapi import APIRouter, HTTPException, Query, status, Depends
 
-from app.dependencies import DBDep, CurrentUserOptional, CurrentStudent, AdminUser
-from app.schemas import ReviewCreate, ReviewUpdate, ReviewOut, ReviewStatusUpdate, InteractionResponse
+from app.core.config import settings
+from app.core.content_filter import check_review_content
+from app.core.events import publish_event
+from app.core.premoderation import enqueue_review
+from app.dependencies import (
+    DBDep,
+    ReadDBDep,
+    CurrentUserOptional,
+    CurrentStudent,
+    AdminUser,
+    enforce_not_muted_or_blocked,
+    rate_limited,
+)
+from app.schemas import (
+    ReviewCreate,
+    ReviewUpdate,
+    ReviewOut,
+    PendingReviewOut,
+    ReviewStatusUpdate,
+    BulkReviewStatusUpdate,
+    BulkActionResult,
+    InteractionResponse,
+)
 from app import crud
 
 router = APIRouter(tags=["reviews"])
 
 
 # ---------------------------------------------------------------------------
-# Muted / Blocked enforcement
+# Near-duplicate detection
 # ---------------------------------------------------------------------------
 
-def enforce_not_muted_or_blocked(student: CurrentStudent):
-    """
-    Blocks review posting/editing/deleting if the user is blocked or muted.
-    """
-    user = getattr(student, "user", None)
-    if not user:
-        raise HTTPException(status_code=401, detail="No user linked to student")
+async def _check_near_duplicates(db: DBDep, review):
+    """Fingerprint the review; hold and (optionally) report it if it copies another."""
+    duplicates = await crud.review_fingerprints.index_review(db, review, settings.DUPLICATE_SIMILARITY_THRESHOLD)
+    if not duplicates:
+        return None
+    return await crud.review_fingerprints.flag_near_duplicate(
+        db, review, duplicates, auto_report=settings.DUPLICATE_AUTO_REPORT
+    )
 
-    if getattr(user, "is_blocked", False):
-        raise HTTPException(status_code=403, detail="User is blocked")
 
-    muted_until = getattr(user, "muted_until", None)
-    if muted_until and muted_until > datetime.utcnow():
-        raise HTTPException(
-            status_code=403,
-            detail=f"User is muted until {muted_until.isoformat()}",
+def _after_duplicate_check(review, report) -> None:
+    """After commit: announce an automatic report, or hand a clean review to pre-moderation."""
+    if report is not None:
+        publish_event(
+            "violation.reported",
+            violation_id=report.id,
+            review_id=review.id,
+            violation_type=report.violation_type,
+            severity=report.severity,
         )
+    if review.risk_score is None:
+        enqueue_review(review.id, review.updated_at)
 
 
 # ---------------------------------------------------------------------------
@@ -45,7 +70,7 @@ def enforce_not_muted_or_blocked(student: CurrentStudent):
 @router.get("/sections/{section_id}/reviews", response_model=list[ReviewOut])
 async def get_section_reviews(
     section_id: uuid.UUID,
-    db: DBDep,
+    db: ReadDBDep,
     user: CurrentUserOptional,
     sort_by: Literal["newest", "top_rated", "worst_rated", "most_liked"] = Query(default="newest"),
     skip: int = Query(default=0, ge=0),
@@ -61,7 +86,12 @@ async def get_section_reviews(
     return await _annotate_interactions(db, reviews, user)
 
 
-@router.post("/sections/{section_id}/reviews", response_model=ReviewOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/sections/{section_id}/reviews",
+    response_model=ReviewOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[rate_limited("review_write")],
+)
 async def create_review(
     section_id: uuid.UUID,
     body: ReviewCreate,
@@ -69,6 +99,7 @@ async def create_review(
     student: CurrentStudent,
     _=Depends(enforce_not_muted_or_blocked),
 ):
+    check_review_content(body.content)
     section = await crud.sections.get_by_id(db, section_id)
     if not section:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
@@ -87,7 +118,10 @@ async def create_review(
         content=body.content,
         rating=body.rating,
     )
+    report = await _check_near_duplicates(db, review)
     await db.commit()
+    publish_event("review.submitted", review_id=review.id, section_id=section_id, status=review.status)
+    _after_duplicate_check(review, report)
     await db.refresh(review, attribute_names=["student", "section"])
     await db.refresh(review.section, attribute_names=["course", "professor", "semester"])
     return ReviewOut.model_validate(review)
@@ -100,7 +134,7 @@ async def create_review(
 @router.get("/professors/{professor_id}/reviews", response_model=list[ReviewOut])
 async def get_professor_reviews(
     professor_id: uuid.UUID,
-    db: DBDep,
+    db: ReadDBDep,
     user: CurrentUserOptional,
     sort_by: Literal["newest", "top_rated", "worst_rated", "most_liked"] = Query(default="newest"),
     skip: int = Query(default=0, ge=0),
@@ -120,16 +154,16 @@ async def get_professor_reviews(
 # Admin review moderation
 # ---------------------------------------------------------------------------
 
-@router.get("/reviews/pending", response_model=list[ReviewOut])
+@router.get("/reviews/pending", response_model=list[PendingReviewOut])
 async def list_pending_reviews(
     db: DBDep,
     _: AdminUser,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=100),
 ):
-    """Admin-only: list all reviews awaiting approval."""
+    """Admin-only: list all reviews awaiting approval, with their pre-moderation risk."""
     reviews = await crud.reviews.get_pending(db, skip=skip, limit=limit)
-    return [ReviewOut.model_validate(r) for r in reviews]
+    return [PendingReviewOut.model_validate(r) for r in reviews]
 
 
 @router.patch("/reviews/{review_id}/status", response_model=ReviewOut)
@@ -140,17 +174,35 @@ async def update_review_status(
     _: AdminUser,
 ):
     """Admin-only: approve or reject a pending review."""
-    review = await crud.reviews.get_by_id(db, review_id)
+    review = await crud.reviews.get_by_id(db, review_id, for_update=True)
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
     review = await crud.reviews.update_status(db, review, body.status)
     await db.commit()
+    publish_event("review.moderated", review_ids=[review.id], status=review.status)
     await db.refresh(review, attribute_names=["student", "section"])
     if review.section is not None:
         await db.refresh(review.section, attribute_names=["course", "professor", "semester"])
     return ReviewOut.model_validate(review)
 
 
+@router.post("/admin/reviews/bulk-status", response_model=BulkActionResult)
+async def bulk_update_review_status(
+    body: BulkReviewStatusUpdate,
+    db: DBDep,
+    _: AdminUser,
+):
+    """
+    Admin-only: approve or reject many reviews in one transaction.
+    Each id comes back as updated, unchanged (already in that status) or not_found.
+    """
+    updated, existing = await crud.reviews.bulk_update_status(db, body.review_ids, body.status)
+    await db.commit()
+    if updated:
+        publish_event("review.moderated", review_ids=sorted(updated), status=body.status)
+    return BulkActionResult.build(body.review_ids, updated, existing)
+
+
 @router.delete("/admin/reviews/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def admin_delete_review(
     review_id: uuid.UUID,
@@ -164,13 +216,14 @@ async def admin_delete_review(
 
     await crud.reviews.delete(db, review)
     await db.commit()
+    publish_event("review.deleted", review_id=review_id)
 
 
 # ---------------------------------------------------------------------------
 # Individual review operations
 # ---------------------------------------------------------------------------
 
-@router.patch("/reviews/{review_id}", response_model=ReviewOut)
+@router.patch("/reviews/{review_id}", response_model=ReviewOut, dependencies=[rate_limited("review_write")])
 async def update_review(
     review_id: uuid.UUID,
     body: ReviewUpdate,
@@ -178,12 +231,15 @@ async def update_review(
     student: CurrentStudent,
     _=Depends(enforce_not_muted_or_blocked),
 ):
-    review = await crud.reviews.get_by_id(db, review_id)
+    if body.content is not None:
+        check_review_content(body.content)
+    review = await crud.reviews.get_by_id(db, review_id, for_update=True)
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
     if review.student_id != student.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your review")
 
+    report = None
     if body.content is not None or body.rating is not None:
         review = await crud.reviews.update_content(
             db,
@@ -191,7 +247,12 @@ async def update_review(
             content=body.content or review.content,
             rating=body.rating or review.rating,
         )
+        if body.content is not None:
+            report = await _check_near_duplicates(db, review)
     await db.commit()
+    publish_event("review.edited", review_id=review.id, status=review.status)
+    if review.status == "pending":
+        _after_duplicate_check(review, report)
     await db.refresh(review, attribute_names=["student", "section"])
     if review.section is not None:
         await db.refresh(review.section, attribute_names=["course", "professor", "semester"])
@@ -213,23 +274,28 @@ async def delete_review(
 
     await crud.reviews.delete(db, review)
     await db.commit()
+    publish_event("review.deleted", review_id=review_id)
 
 
 # ---------------------------------------------------------------------------
 # Like / Dislike
 # ---------------------------------------------------------------------------
 
-@router.post("/reviews/{review_id}/like", response_model=InteractionResponse)
+@router.post("/reviews/{review_id}/like", response_model=InteractionResponse, dependencies=[rate_limited("review_vote")])
 async def like_review(review_id: uuid.UUID, db: DBDep, student: CurrentStudent):
     return await _interact(db, review_id, student.id, "like")
 
 
-@router.post("/reviews/{review_id}/dislike", response_model=InteractionResponse)
+@router.post("/reviews/{review_id}/dislike", response_model=InteractionResponse, dependencies=[rate_limited("review_vote")])
 async def dislike_review(review_id: uuid.UUID, db: DBDep, student: CurrentStudent):
     return await _interact(db, review_id, student.id, "dislike")
 
 
-@router.delete("/reviews/{review_id}/interaction", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/reviews/{review_id}/interaction",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[rate_limited("review_vote")],
+)
 async def remove_interaction(review_id: uuid.UUID, db: DBDep, student: CurrentStudent):
     review = await crud.reviews.get_by_id(db, review_id)
     if not review:
@@ -3,10 +3,12 @@ User routes — current user profile and admin user management.
 """
 
 import uuid
+from datetime import datetime, timedelta
 from typing import Optional, Literal
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 
+from app.core.pagination import decode_cursor, encode_cursor
 from app.dependencies import DBDep, CurrentUser, CurrentStudent, AdminUser
 from app.schemas import (
     MeResponse,
@@ -16,6 +18,9 @@ from app.schemas import (
     AdminUserOut,
     AdminUserRolesUpdate,
     AdminUserStatusUpdate,
+    AdminBulkUserUpdate,
+    AdminBulkUserResult,
+    AdminBulkUserResponse,
 )
 from app import crud
 
@@ -64,12 +69,28 @@ async def delete_my_account(db: DBDep, user: CurrentUser):
 async def list_users_for_admin(
     db: DBDep,
     _: AdminUser,
+    response: Response,
     role: Optional[Literal["admin", "professor", "student"]] = Query(default=None),
     status_filter: Optional[Literal["active", "suspended", "inactive"]] = Query(default=None),
     search: Optional[str] = Query(default=None, min_length=2),
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page"),
+    include_total: bool = Query(default=False),
 ):
+    """
+    Page of users for the admin screen: one page query (student/professor
+    eager-loaded) + one roles query, whatever the page size.
+
+    Prefer `cursor` over `skip`: the next page's cursor is returned in the
+    X-Next-Cursor header (absent on the last page). `include_total=true`
+    adds X-Total-Count, which costs one extra COUNT.
+    """
+    try:
+        after = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
     users = await crud.users.list_for_admin(
         db,
         role=role,
@@ -77,8 +98,89 @@ async def list_users_for_admin(
         search=search,
         skip=skip,
         limit=limit,
+        after=after,
     )
-    return [await _to_admin_user_out(db, u) for u in users]
+    roles = await crud.roles.get_roles_for_users(db, [u.id for u in users])
+
+    if len(users) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(users[-1].created_at, users[-1].id)
+    if include_total:
+        total = await crud.users.count_for_admin(db, role=role, status=status_filter, search=search)
+        response.headers["X-Total-Count"] = str(total)
+
+    return [_to_admin_user_out(u, roles.get(u.id, [])) for u in users]
+
+
+@router.post("/admin/bulk", response_model=AdminBulkUserResponse)
+async def bulk_update_users(
+    body: AdminBulkUserUpdate,
+    db: DBDep,
+    admin: AdminUser,
+):
+    """
+    Apply role sets, status, mute and block changes to many users in one
+    transaction. Each change is one set-based statement for all accepted
+    users, so round trips don't grow with the number of users.
+
+    Users that fail a guard (unknown id, changing your own admin role or
+    access, removing the last admin) are skipped entirely and reported in
+    `results`; the rest are updated.
+    """
+    user_ids = list(dict.fromkeys(body.user_ids))
+    errors: dict[uuid.UUID, str] = {}
+
+    existing = await crud.users.get_existing_ids(db, user_ids)
+    for user_id in user_ids:
+        if user_id not in existing:
+            errors[user_id] = "User not found"
+
+    if admin.id in existing:
+        if body.roles is not None and "admin" not in body.roles:
+            errors[admin.id] = "You cannot remove your own admin role."
+        elif (body.status not in (None, "active")) or body.is_blocked or body.mute_minutes:
+            errors[admin.id] = "You cannot suspend, mute or block your own account."
+
+    current_roles = await crud.roles.get_roles_for_users(db, list(existing))
+    if body.roles is not None and "admin" not in body.roles:
+        demoted = [u for u in existing if u not in errors and "admin" in current_roles.get(u, [])]
+        if demoted and await crud.roles.count_users_with_role(db, "admin") - len(demoted) < 1:
+            for user_id in demoted:
+                errors[user_id] = "Cannot remove the last admin from the system."
+
+    accepted = [u for u in user_ids if u not in errors]
+    if accepted:
+        if body.roles is not None:
+            try:
+                await crud.roles.set_roles_for_users(db, accepted, sorted(set(body.roles)))
+            except LookupError as e:
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+        values = {}
+        if body.status is not None:
+            values["status"] = body.status
+        if body.is_blocked is not None:
+            values["is_blocked"] = body.is_blocked
+        if body.mute_minutes is not None:
+            values["muted_until"] = (
+                datetime.utcnow() + timedelta(minutes=body.mute_minutes) if body.mute_minutes else None
+            )
+        await crud.users.bulk_update(db, accepted, **values)
+        await db.commit()
+
+    final_roles = await crud.roles.get_roles_for_users(db, accepted) if body.roles is not None else {}
+    statuses = await crud.users.get_statuses(db, accepted) if body.status is not None else {}
+    results = [
+        AdminBulkUserResult(id=user_id, ok=False, error=errors[user_id])
+        if user_id in errors
+        else AdminBulkUserResult(
+            id=user_id,
+            ok=True,
+            roles=final_roles.get(user_id, []) if body.roles is not None else None,
+            status=statuses.get(user_id),
+        )
+        for user_id in user_ids
+    ]
+    return AdminBulkUserResponse(updated=len(accepted), failed=len(errors), results=results)
 
 
 @router.patch("/admin/{user_id}/roles", response_model=AdminUserOut)
@@ -109,26 +211,13 @@ async def update_user_roles(
                 detail="Cannot remove the last admin from the system.",
             )
 
-    role_map = {}
-    for role_name in ["admin", "professor", "student"]:
-        role_obj = await crud.roles.get_role_by_name(db, role_name)
-        if role_obj is None:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Role '{role_name}' is not configured.",
-            )
-        role_map[role_name] = role_obj
-
-    for role_name in current_roles:
-        if role_name not in desired_roles and role_name in role_map:
-            await crud.roles.revoke_role_from_user(db, target.id, role_map[role_name].id)
-
-    for role_name in desired_roles:
-        await crud.roles.assign_role_to_user(db, target.id, role_map[role_name].id)
+    try:
+        await crud.roles.set_roles_for_users(db, [target.id], desired_roles)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
     await db.commit()
-    updated = await crud.users.get_by_id(db, target.id)
-    return await _to_admin_user_out(db, updated)
+    return await _load_admin_user_out(db, target.id)
 
 
 @router.patch("/admin/{user_id}/status", response_model=AdminUserOut)
@@ -138,7 +227,7 @@ async def update_user_status(
     db: DBDep,
     admin: AdminUser,
 ):
-    target = await crud.users.get_by_id(db, user_id)
+    target = await crud.users.get_by_id(db, user_id, for_update=True)
     if not target:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -148,15 +237,21 @@ async def update_user_status(
             detail="You cannot suspend or deactivate your own account.",
         )
 
-    target = await crud.users.update_status(db, target, body.status)
+    await crud.users.update_status(db, target, body.status)
     await db.commit()
-    return await _to_admin_user_out(db, target)
+    return await _load_admin_user_out(db, target.id)
 
 
-async def _to_admin_user_out(db: DBDep, user) -> AdminUserOut:
-    roles = [r.role for r in await crud.roles.get_user_roles(db, user.id)]
-    student = await crud.students.get_by_user_id(db, user.id)
-    professor = await crud.professors.get_by_user_id(db, user.id)
+async def _load_admin_user_out(db: DBDep, user_id: uuid.UUID) -> AdminUserOut:
+    user = await crud.users.get_for_admin(db, user_id)
+    roles = [r.role for r in await crud.roles.get_user_roles(db, user_id)]
+    return _to_admin_user_out(user, roles)
+
+
+def _to_admin_user_out(user, roles: list[str]) -> AdminUserOut:
+    """Build the admin view from a user whose student/professor are already loaded."""
+    student = user.student
+    professor = user.professor
     professor_name = None
     if professor:
         professor_name = f"{professor.first_name} {professor.last_name}"
@@ -5,12 +5,23 @@ Violation routes — student reporting and admin moderation queue.
 import uuid
 from typing import Optional, Literal
 
-from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import text
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from sqlalchemy.exc import IntegrityError
 
-from app.dependencies import DBDep, CurrentStudent, AdminUser
-from app.schemas import ViolationCreate, ViolationAdminUpdate, ViolationOut
+from app.core.events import publish_event
+from app.core.pagination import decode_cursor, decode_score_cursor, encode_cursor, encode_score_cursor
+from app.dependencies import DBDep, CurrentStudent, AdminUser, rate_limited
+from app.schemas import (
+    BulkActionResult,
+    BulkViolationUpdate,
+    ViolationCreate,
+    ViolationAdminUpdate,
+    ViolationGroupOut,
+    ViolationGroupResolve,
+    ViolationGroupResolveResult,
+    ViolationListItem,
+    ViolationOut,
+)
 from app import crud
 
 router = APIRouter(tags=["violations"])
@@ -20,6 +31,7 @@ router = APIRouter(tags=["violations"])
     "/reviews/{review_id}/violations",
     response_model=ViolationOut,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[rate_limited("violation_report")],
 )
 async def report_review_violation(
     review_id: uuid.UUID,
@@ -58,14 +70,22 @@ async def report_review_violation(
         reason=body.reason,
     )
     await db.commit()
+    publish_event(
+        "violation.reported",
+        violation_id=violation.id,
+        review_id=review_id,
+        violation_type=violation.violation_type,
+        severity=violation.severity,
+    )
     violation = await crud.violations.get_by_id(db, violation.id, load_relations=True)
     return ViolationOut.model_validate(violation)
 
 
-@router.get("/violations", response_model=list[ViolationOut])
+@router.get("/violations", response_model=list[ViolationListItem])
 async def list_violations(
     db: DBDep,
     _: AdminUser,
+    response: Response,
     status_filter: Optional[Literal["open", "in_review", "resolved", "dismissed"]] = Query(default=None),
     severity: Optional[Literal["low", "medium", "high", "critical"]] = Query(default=None),
     violation_type: Optional[Literal[
@@ -76,12 +96,24 @@ async def list_violations(
         "personal_data",
         "other",
     ]] = Query(default=None),
-    search: Optional[str] = Query(default=None),
+    search: Optional[str] = Query(default=None, max_length=200),
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page"),
 ):
-    """Admin-only moderation queue with filtering by status, severity, type, and text search."""
-    violations = await crud.violations.list_for_admin(
+    """
+    Admin-only moderation queue with filtering by status, severity, type, and
+    full-text search over review content and report reasons.
+
+    Returns a lightweight projection; use GET /violations/{id} for the full
+    case. The next page's cursor is in the X-Next-Cursor header.
+    """
+    try:
+        after = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    rows = await crud.violations.list_for_admin(
         db,
         status=status_filter,
         severity=severity,
@@ -89,8 +121,82 @@ async def list_violations(
         search=search,
         skip=skip,
         limit=limit,
+        after=after,
     )
-    return [ViolationOut.model_validate(v) for v in violations]
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return [ViolationListItem(**row) for row in rows]
+
+
+@router.get("/violations/groups", response_model=list[ViolationGroupOut])
+async def list_violation_groups(
+    db: DBDep,
+    _: AdminUser,
+    response: Response,
+    min_severity: Optional[Literal["low", "medium", "high", "critical"]] = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page"),
+):
+    """
+    Triage queue: one entry per reported review with open reports, highest
+    priority (severity × report count × recency) first.
+    """
+    try:
+        after = decode_score_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    rows = await crud.violation_groups.list_queue(db, limit=limit, after=after, min_severity=min_severity)
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_score_cursor(rows[-1]["priority"], rows[-1]["review_id"])
+    return [ViolationGroupOut(**row) for row in rows]
+
+
+@router.post("/violations/groups/{review_id}/resolve", response_model=ViolationGroupResolveResult)
+async def resolve_violation_group(
+    review_id: uuid.UUID,
+    body: ViolationGroupResolve,
+    db: DBDep,
+    admin: AdminUser,
+):
+    """Resolve or dismiss every open report on a review at once."""
+    closed = await crud.violation_groups.resolve(
+        db,
+        review_id=review_id,
+        admin_user_id=admin.id,
+        status=body.status,
+        admin_notes=body.admin_notes,
+    )
+    await db.commit()
+    publish_event("violation.group_resolved", review_id=review_id, status=body.status, closed=closed, admin_id=admin.id)
+
+    group = await crud.violation_groups.get(db, review_id)
+    if group is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No reports for this review")
+    return ViolationGroupResolveResult(closed=closed, group=ViolationGroupOut(**group))
+
+
+@router.post("/violations/bulk", response_model=BulkActionResult)
+async def bulk_update_violations(
+    body: BulkViolationUpdate,
+    db: DBDep,
+    admin: AdminUser,
+):
+    """
+    Triage, resolve or dismiss many reports in one transaction; the affected
+    review groups are re-aggregated before commit.
+    """
+    updated, existing = await crud.violations.bulk_update_status(
+        db,
+        body.violation_ids,
+        admin_user_id=admin.id,
+        status=body.status,
+        admin_notes=body.admin_notes,
+    )
+    await db.commit()
+    if updated:
+        publish_event("violation.updated", violation_ids=sorted(updated), status=body.status, admin_id=admin.id)
+    return BulkActionResult.build(body.violation_ids, updated, existing)
 
 
 @router.get("/violations/{violation_id}", response_model=ViolationOut)
@@ -114,32 +220,12 @@ async def update_violation(
     admin: AdminUser,
 ):
     """Admin moderation action: triage, resolve, dismiss, add notes."""
-    violation = await crud.violations.get_by_id(db, violation_id)
+    violation = await crud.violations.get_by_id(db, violation_id, for_update=True)
     if not violation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Violation not found")
 
-    async def repair_status_constraint() -> bool:
-        try:
-            await db.rollback()
-            await db.execute(
-                text(
-                    "ALTER TABLE violations DROP CONSTRAINT IF EXISTS ck_violation_status"
-                )
-            )
-            await db.execute(
-                text(
-                    "ALTER TABLE violations ADD CONSTRAINT ck_violation_status CHECK (status IN ('open', 'in_review', 'resolved', 'dismissed'))"
-                )
-            )
-            await db.commit()
-            return True
-        except Exception:
-            await db.rollback()
-            return False
-
-    async def perform_update() -> None:
-        nonlocal violation
-        violation = await crud.violations.update_for_admin(
+    try:
+        await crud.violations.update_for_admin(
             db,
             violation=violation,
             admin_user_id=admin.id,
@@ -148,31 +234,21 @@ async def update_violation(
             admin_notes=body.admin_notes,
         )
         await db.commit()
-
-    try:
-        await perform_update()
     except IntegrityError as exc:
-        if "ck_violation_status" in str(exc) or "status" in str(exc):
-            if await repair_status_constraint():
-                try:
-                    await perform_update()
-                except IntegrityError as exc2:
-                    await db.rollback()
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Invalid violation update. Please ensure the status is one of open, in_review, resolved, or dismissed.",
-                    ) from exc2
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to repair violation status constraint.",
-                ) from exc
-        else:
-            await db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid violation update. Please ensure the status is one of open, in_review, resolved, or dismissed.",
-            ) from exc
+        # Schema drift (e.g. a stale ck_violation_status) is reported and
+        # repaired by app.db.schema_check at startup, never from a request.
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid violation update. Please ensure the status is one of open, in_review, resolved, or dismissed.",
+        ) from exc
 
     violation = await crud.violations.get_by_id(db, violation_id, load_relations=True)
+    publish_event(
+        "violation.updated",
+        violation_ids=[violation.id],
+        status=violation.status,
+        severity=violation.severity,
+        admin_id=admin.id,
+    )
     return ViolationOut.model_validate(violation)
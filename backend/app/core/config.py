@@ -12,6 +12,7 @@ class Settings(BaseSettings):
     ENTRA_REDIRECT_URI: str = "http://localhost:8000/api/v1/auth/callback"
     ENTRA_AUTHORITY: str | None = None
     ENABLE_OAUTH: bool = False
+    OAUTH_STATE_BACKEND: str = "memory"  # "memory" (single worker) | "db" (shared across workers)
 
     ## frontend ##
     FRONTEND_URL: str = "http://localhost:5173"
@@ -22,17 +23,72 @@ class Settings(BaseSettings):
     SMTP_USER: str | None = None
     SMTP_PASS: str | None = None
     SMTP_FROM: str | None = None
+    SMTP_STARTTLS: bool = True
+    MAIL_POOL_SIZE: int = 2         # persistent SMTP connections per worker process
+    MAIL_QUEUE_SIZE: int = 1000     # enqueue fails fast beyond this
+    MAIL_BATCH_SIZE: int = 20       # messages sent per connection checkout
+    MAIL_MAX_RETRIES: int = 3
     OTP_EXPIRY_MINUTES: int = 10
 
+    ## rate limiting ##
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) | "db" (shared across workers)
+    TRUSTED_PROXY_HOPS: int = 0  # reverse proxies in front of the app that append to X-Forwarded-For
+
+    ## background jobs ##
+    JOBS_ENABLED: bool = True
+
+    ## pre-moderation ##
+    PREMOD_ENABLED: bool = True
+    PREMOD_WORKERS: int = 2
+    PREMOD_QUEUE_SIZE: int = 1000
+    PREMOD_AUTO_APPROVE_BELOW: float = 0.2  # risk threshold; needs a trained model
+    PREMOD_MODEL_PATH: str = "premoderation_model.json"
+
+    ## content filter ##
+    CONTENT_FILTER_REFRESH_SECONDS: float = 30.0  # how soon blocklist edits reach other workers
+
+    ## near-duplicate detection ##
+    DUPLICATE_SIMILARITY_THRESHOLD: float = 0.8  # estimated Jaccard over 3-word shingles
+    DUPLICATE_AUTO_REPORT: bool = True           # file a spam report, not just a risk flag
+
+    ## metrics ##
+    METRICS_ENABLED: bool = True
+    METRICS_DIR: str | None = None        # shared dir for multi-worker aggregation; clear it on deploy
+    METRICS_FLUSH_SECONDS: float = 5.0    # how stale another worker's numbers can be
+    N_PLUS_ONE_THRESHOLD: int = 5         # dev: warn when one statement shape runs more often per request
+
+    ## logging ##
+    LOG_FORMAT: str = "json"              # "json" (one object per line) | "text"
+    LOG_MAX_BYTES: int = 20 * 1024 * 1024  # logs/app.log rotation size
+    LOG_BACKUPS: int = 5
+    LOG_QUEUE_SIZE: int = 10000           # records buffered for the writer thread; excess is dropped
+    LOG_SUCCESS_SAMPLE_RATE: float = 1.0  # share of successful requests logged
+    LOG_ROUTE_SAMPLE_RATES: str = ""      # per-route overrides: "/health=0,/api/v1/courses=0.1"
+    LOG_SLOW_REQUEST_MS: float = 1000.0   # always log requests slower than this
+
+    ## slow query log ##
+    SLOW_QUERY_MS: float = 200.0          # 0 disables
+    SLOW_QUERY_EXPLAIN: bool = True       # capture EXPLAIN plans in the background
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 5
+    SQL_COMMENTS: bool = True             # sqlcommenter /*route='...'*/ on request statements
+    SQL_COMMENT_REQUEST_ID: bool = False  # unique SQL per request: defeats the prepared-statement cache
+
     ## encryption ##
     FIELD_ENCRYPTION_KEY: str = ""  # base64-encoded 32 bytes — required in prod
     FIELD_HMAC_KEY: str = ""        # long random string — required in prod
+    FIELD_ENCRYPTION_KEY_VERSION: int = 1
+    FIELD_ENCRYPTION_OLD_KEYS: str = ""  # "<version>:<base64>,…" — retired keys, decrypt only
+    FIELD_HMAC_OLD_KEYS: str = ""        # comma-separated retired HMAC keys, lookup only
 
     ## sessions ##
     SESSION_SECRET: str = "change-me"
 
     ## database ##
     DATABASE_URL: str = "sqlite:///./aub_reviews.db"
+    DATABASE_REPLICA_URL: str | None = None  # read replica for get_read_db routes; unset = primary
+    SCHEMA_CHECK: str = "warn"  # startup schema verification: "off" | "warn" | "repair" | "strict"
 
     ## jwt ##
     JWT_SECRET: str = "change-me-in-prod"
@@ -0,0 +1,270 @@
+"""
+Review content filter: admin blocklist + personal-data (PII) detection,
+checked at submission so these reviews never reach the moderation queue.
+
+Each check is a linear scan done in C, with Python only touching candidates:
+  - emails: only around each "@" (str.find),
+  - phone numbers: one regex pass, only if the text has at least 8 digits
+    (counted with bytes.translate),
+  - blocklist: the text is case-folded, look-alike characters undone
+    (sh1t, $lur) and punctuation blanked in one str.translate, split into
+    words, and the words are fed to a word-level Aho-Corasick automaton,
+    so all terms, including multi-word phrases, are found in one step per
+    word however long the list. Terms only match whole words, so a blocked
+    word inside an innocent one (the Scunthorpe problem) is not flagged.
+scripts/bench_content_filter.py measures it on 5000-character reviews.
+
+The blocklist lives in the blocked_terms table (crud.blocked_terms). The
+active ContentFilter is immutable and swapped atomically:
+  - an admin edit rebuilds it immediately in the worker that served it,
+  - every worker polls a cheap signature query and rebuilds on change
+    (CONTENT_FILTER_REFRESH_SECONDS), so edits reach all workers without
+    a restart.
+PII detection needs no data and works even if the blocklist can't load.
+"""
+
+import asyncio
+import re
+import string
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.db.base import AsyncSessionLocal
+
+logger = get_logger(__name__)
+
+# One table: look-alike characters → letters, punctuation → word breaks.
+_WORD_TABLE = str.maketrans(
+    {
+        **{c: " " for c in string.punctuation + "\u2018\u2019\u201c\u201d\u2013\u2014\u2026\u00ab\u00bb"},
+        "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "@": "a", "$": "s",
+    }
+)
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_EMAIL_LOCAL_CHARS = frozenset("._+-")
+# International (+961 3 123 456), national trunk-0 (03-123456), North American
+# ((555) 123-4567) or a bare run of 8–15 digits. Years and course numbers
+# ("2023-2024", "CMPS 271") don't fit any of these shapes.
+_PHONE = re.compile(
+    r"(?<![\w.+])(?:"
+    r"\+[0-9](?:[\s().-]{0,2}[0-9]){7,14}"
+    r"|\(?0[0-9](?:[\s().-]{0,2}[0-9]){6,13}"
+    r"|\(?[0-9]{3}\)?[\s.-]?[0-9]{3}[\s.-]?[0-9]{4}"
+    r"|[0-9]{8,15}"
+    r")(?!\w)"
+)
+_PHONE_MIN_DIGITS = 8
+_DIGITS = b"0123456789"
+
+PII_KINDS = {"email": "email address", "phone": "phone number"}
+
+
+def normalize_term(term: str) -> str:
+    """Canonical form a blocklist term is stored and matched in ("" if it has no words)."""
+    return " ".join(term.casefold().translate(_WORD_TABLE).split())
+
+
+def find_emails(text: str) -> list[str]:
+    emails = []
+    at = text.find("@")
+    while at != -1:
+        start = at
+        while start and (text[start - 1].isalnum() or text[start - 1] in _EMAIL_LOCAL_CHARS):
+            start -= 1
+        m = _EMAIL.match(text, start)
+        if m:
+            emails.append(m.group())
+            at = text.find("@", m.end())
+        else:
+            at = text.find("@", at + 1)
+    return emails
+
+
+def find_phones(text: str) -> list[str]:
+    encoded = text.encode()
+    if len(encoded) - len(encoded.translate(None, _DIGITS)) < _PHONE_MIN_DIGITS:
+        return []
+    return _PHONE.findall(text)
+
+
+# ---------------------------------------------------------------------------
+# Aho-Corasick over words
+# ---------------------------------------------------------------------------
+
+class WordAutomaton:
+    """
+    Aho-Corasick automaton whose alphabet is normalised words. Outputs are
+    merged along failure links at build time, so matching never walks the
+    output chain.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[str, ...]] = [()]
+
+        for term in terms:
+            words = term.split()
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                nxt = self._goto[state].get(word)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][word] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (term,)
+
+        # Breadth-first failure links.
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for word, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self._goto) - 1
+
+    def step(self, state: int, word: str) -> int:
+        goto, fail = self._goto, self._fail
+        while True:
+            nxt = goto[state].get(word)
+            if nxt is not None:
+                return nxt
+            if state == 0:
+                return 0
+            state = fail[state]
+
+    @property
+    def root(self) -> dict[str, int]:
+        return self._goto[0]
+
+    def outputs(self, state: int) -> tuple[str, ...]:
+        return self._out[state]
+
+
+# ---------------------------------------------------------------------------
+# Filter
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ContentMatch:
+    kind: str                   # "email" | "phone" | "blocklist"
+    category: str               # violation type it would have been reported as
+    term: Optional[str] = None  # the blocklist term; PII values aren't kept
+
+
+class ContentFilter:
+    def __init__(self, blocklist: Optional[dict[str, str]] = None):
+        """blocklist: normalised term → category."""
+        self.blocklist = dict(blocklist or {})
+        self._automaton = WordAutomaton(self.blocklist)
+
+    def scan(self, text: str) -> list[ContentMatch]:
+        matches = [ContentMatch("email", "personal_data") for _ in find_emails(text)]
+        matches += [ContentMatch("phone", "personal_data") for _ in find_phones(text)]
+        if self.blocklist:
+            matches += self._scan_words(text)
+        return matches
+
+    def _scan_words(self, text: str) -> list[ContentMatch]:
+        automaton, blocklist = self._automaton, self.blocklist
+        root = automaton.root
+        matches = []
+        state = 0
+        for word in text.casefold().translate(_WORD_TABLE).split():
+            # Most words aren't the start of any term: one dict miss at the root.
+            state = root.get(word, 0) if state == 0 else automaton.step(state, word)
+            if state:
+                for term in automaton.outputs(state):
+                    matches.append(ContentMatch("blocklist", blocklist[term], term))
+        return matches
+
+
+def rejection_detail(matches: list[ContentMatch]) -> str:
+    pii = sorted({PII_KINDS[m.kind] for m in matches if m.kind in PII_KINDS})
+    parts = []
+    if pii:
+        parts.append(f"personal contact details ({', '.join(pii)})")
+    if any(m.kind == "blocklist" for m in matches):
+        parts.append("language that isn't allowed")
+    return f"Your review contains {' and '.join(parts)}. Please remove it and try again."
+
+
+# ---------------------------------------------------------------------------
+# Application singleton + hot reload
+# ---------------------------------------------------------------------------
+
+_filter = ContentFilter()
+_signature: Optional[tuple] = None
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def get_content_filter() -> ContentFilter:
+    return _filter
+
+
+def check_review_content(content: str) -> None:
+    """Raise 422 if a review contains PII or blocklisted terms. No I/O."""
+    matches = _filter.scan(content)
+    if matches:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=rejection_detail(matches))
+
+
+async def reload_content_filter(force: bool = False) -> bool:
+    """Rebuild the filter if the blocklist changed (or `force`). Returns True if rebuilt."""
+    global _filter, _signature
+    from app import crud  # crud.review_fingerprints imports this module's normaliser
+
+    async with AsyncSessionLocal() as db:
+        signature = await crud.blocked_terms.get_signature(db)
+        if not force and signature == _signature:
+            return False
+        terms = await crud.blocked_terms.get_all(db)
+    _filter = ContentFilter({t.term: t.category for t in terms})
+    _signature = signature
+    logger.info("Content filter loaded: %s blocklist terms", len(_filter.blocklist))
+    return True
+
+
+async def _refresh_loop() -> None:
+    while True:
+        await asyncio.sleep(settings.CONTENT_FILTER_REFRESH_SECONDS)
+        try:
+            await reload_content_filter()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Content filter refresh failed; keeping the current blocklist")
+
+
+async def start_content_filter() -> None:
+    global _refresh_task
+    try:
+        await reload_content_filter(force=True)
+    except Exception as exc:
+        logger.warning("Content filter blocklist unavailable at startup (%s); PII checks only until refresh", exc)
+    if _refresh_task is None:
+        _refresh_task = asyncio.create_task(_refresh_loop(), name="content-filter-refresh")
+
+
+async def stop_content_filter() -> None:
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        await asyncio.gather(_refresh_task, return_exceptions=True)
+        _refresh_task = None
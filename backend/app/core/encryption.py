@@ -9,34 +9,88 @@ Required environment variables:
                           Generate: python -c "import os,base64; print(base64.b64encode(os.urandom(32)).decode())"
     FIELD_HMAC_KEY:       Any long random string (≥32 chars recommended)
                           Generate: python -c "import secrets; print(secrets.token_hex(32))"
+
+Key rotation:
+    Ciphertexts are prefixed with the key version that produced them
+    ("v2:<base64>"); unprefixed values are from before versioning and are
+    tried against every configured key. To rotate:
+      1. Move the current key into FIELD_ENCRYPTION_OLD_KEYS as
+         "<version>:<base64>", set the new FIELD_ENCRYPTION_KEY and bump
+         FIELD_ENCRYPTION_KEY_VERSION. For the blind index, move the current
+         FIELD_HMAC_KEY into FIELD_HMAC_OLD_KEYS and set the new one.
+         Lookups match any configured HMAC key while both are live.
+      2. Deploy, then run scripts/rotate_field_keys.py to re-encrypt and
+         re-index existing rows.
+      3. Remove the old keys once the script reports nothing left to rotate.
 """
 
 import os
 import hmac
 import hashlib
 import base64
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
+
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError, InvalidHashError
 
 from app.core.config import settings  # add this import
 
-def _load_encryption_key() -> bytes:
-    if not settings.FIELD_ENCRYPTION_KEY:
-        raise RuntimeError("FIELD_ENCRYPTION_KEY is not set.")
-    key = base64.b64decode(settings.FIELD_ENCRYPTION_KEY)
+
+def _decode_aes_key(encoded: str, name: str) -> bytes:
+    key = base64.b64decode(encoded)
     if len(key) != 32:
-        raise RuntimeError("FIELD_ENCRYPTION_KEY must decode to exactly 32 bytes.")
+        raise RuntimeError(f"{name} must decode to exactly 32 bytes.")
     return key
 
-def _load_hmac_key() -> bytes:
+
+def _load_ciphers() -> dict[int, AESGCM]:
+    """One cached AESGCM per key version (current + retired keys still accepted for decrypt)."""
+    if not settings.FIELD_ENCRYPTION_KEY:
+        raise RuntimeError("FIELD_ENCRYPTION_KEY is not set.")
+    ciphers: dict[int, AESGCM] = {}
+    for entry in filter(None, (e.strip() for e in settings.FIELD_ENCRYPTION_OLD_KEYS.split(","))):
+        version, _, encoded = entry.partition(":")
+        if not version.isdigit() or not encoded:
+            raise RuntimeError("FIELD_ENCRYPTION_OLD_KEYS entries must look like '<version>:<base64 key>'.")
+        ciphers[int(version)] = AESGCM(_decode_aes_key(encoded, "FIELD_ENCRYPTION_OLD_KEYS"))
+    ciphers[settings.FIELD_ENCRYPTION_KEY_VERSION] = AESGCM(
+        _decode_aes_key(settings.FIELD_ENCRYPTION_KEY, "FIELD_ENCRYPTION_KEY")
+    )
+    return ciphers
+
+
+def _load_hmac_keys() -> list[bytes]:
+    """Current HMAC key first, then retired keys still matched on lookup."""
     if not settings.FIELD_HMAC_KEY:
         raise RuntimeError("FIELD_HMAC_KEY is not set.")
-    return settings.FIELD_HMAC_KEY.encode()
+    old = [k.strip().encode() for k in settings.FIELD_HMAC_OLD_KEYS.split(",") if k.strip()]
+    return [settings.FIELD_HMAC_KEY.encode(), *old]
 
 
-_ENCRYPTION_KEY: bytes = _load_encryption_key()
-_HMAC_KEY: bytes = _load_hmac_key()
+CURRENT_KEY_VERSION: int = settings.FIELD_ENCRYPTION_KEY_VERSION
+
+
+@lru_cache(maxsize=1)
+def _ciphers() -> dict[int, AESGCM]:
+    return _load_ciphers()
+
+
+@lru_cache(maxsize=1)
+def _hmac_keys() -> list[bytes]:
+    return _load_hmac_keys()
+
+
+def load_keys() -> None:
+    """
+    Decode and validate all configured keys. Called from the app lifespan so a
+    misconfigured key fails at startup rather than on the first request, while
+    plain imports (tests, scripts, alembic) stay cheap.
+    """
+    _ciphers()
+    _hmac_keys()
 
 # argon2id hasher with sensible defaults
 _ph = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
@@ -48,32 +102,69 @@ _ph = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
 
 def encrypt_field(plaintext: str) -> str:
     """
-    Encrypt a string with AES-256-GCM.
-    Returns a base64-encoded string: nonce (12 bytes) + ciphertext + tag.
+    Encrypt a string with AES-256-GCM under the current key version.
+    Returns "v<version>:" + base64(nonce (12 bytes) + ciphertext + tag).
     Each call produces a different ciphertext (random nonce) — not searchable.
     Use blind_index() for equality lookups.
     """
-    aesgcm = AESGCM(_ENCRYPTION_KEY)
     nonce = os.urandom(12)
-    ciphertext = aesgcm.encrypt(nonce, plaintext.encode("utf-8"), None)
-    return base64.b64encode(nonce + ciphertext).decode("ascii")
+    ciphertext = _ciphers()[CURRENT_KEY_VERSION].encrypt(nonce, plaintext.encode("utf-8"), None)
+    return f"v{CURRENT_KEY_VERSION}:" + base64.b64encode(nonce + ciphertext).decode("ascii")
+
+
+def ciphertext_version(encrypted: str) -> Optional[int]:
+    """Key version embedded in a ciphertext, or None for legacy unversioned values."""
+    prefix, sep, _ = encrypted.partition(":")
+    if sep and prefix[:1] == "v" and prefix[1:].isdigit():
+        return int(prefix[1:])
+    return None
 
 
 def decrypt_field(encrypted: str) -> str:
     """
     Decrypt an AES-256-GCM encrypted field produced by encrypt_field().
-    Raises cryptography.exceptions.InvalidTag if tampered.
+    Raises cryptography.exceptions.InvalidTag if tampered or no configured key matches.
     """
-    aesgcm = AESGCM(_ENCRYPTION_KEY)
-    raw = base64.b64decode(encrypted)
+    version = ciphertext_version(encrypted)
+    if version is None:
+        # Legacy value: try the current key first, then retired ones.
+        raw = base64.b64decode(encrypted)
+        ciphers = _ciphers()
+        candidates = [ciphers[CURRENT_KEY_VERSION], *(c for v, c in ciphers.items() if v != CURRENT_KEY_VERSION)]
+    else:
+        cipher = _ciphers().get(version)
+        if cipher is None:
+            raise RuntimeError(f"No field encryption key configured for version {version}.")
+        raw = base64.b64decode(encrypted.partition(":")[2])
+        candidates = [cipher]
+
     nonce, ciphertext = raw[:12], raw[12:]
-    return aesgcm.decrypt(nonce, ciphertext, None).decode("utf-8")
+    for cipher in candidates:
+        try:
+            return cipher.decrypt(nonce, ciphertext, None).decode("utf-8")
+        except InvalidTag:
+            continue
+    raise InvalidTag()
+
+
+def decrypt_fields(values: Iterable[str]) -> Iterator[str]:
+    """Lazily decrypt many fields (bulk exports, rotation) reusing the cached ciphers."""
+    for value in values:
+        yield decrypt_field(value)
+
+
+def needs_reencryption(encrypted: str) -> bool:
+    return ciphertext_version(encrypted) != CURRENT_KEY_VERSION
 
 
 # ---------------------------------------------------------------------------
 # Blind index (HMAC-SHA256) — for searching encrypted fields
 # ---------------------------------------------------------------------------
 
+def _hmac_index(key: bytes, value: str) -> str:
+    return hmac.new(key, value.strip().lower().encode("utf-8"), hashlib.sha256).hexdigest()
+
+
 def blind_index(value: str) -> str:
     """
     Compute a deterministic HMAC-SHA256 blind index for an encrypted field.
@@ -82,7 +173,16 @@ def blind_index(value: str) -> str:
     Store this alongside the encrypted value and query by it:
         WHERE email_index = blind_index(user_input)
     """
-    return hmac.new(_HMAC_KEY, value.strip().lower().encode("utf-8"), hashlib.sha256).hexdigest()
+    return _hmac_index(_hmac_keys()[0], value)
+
+
+def blind_indexes(value: str) -> list[str]:
+    """
+    Blind index under every configured HMAC key, current first.
+    Use for lookups (WHERE email_index IN (...)) so rows not yet re-indexed
+    after an HMAC key rotation are still found.
+    """
+    return [_hmac_index(key, value) for key in _hmac_keys()]
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,172 @@
+"""
+In-process event bus for the admin moderation feed (GET /admin/stream).
+
+Routes publish small events after their transaction commits; every open
+stream gets a copy. Delivery is cheap per connection:
+  - each subscriber has a bounded queue; publish() never blocks or awaits,
+  - a subscriber that falls SUBSCRIBER_BUFFER_SIZE events behind is dropped
+    (its stream ends) instead of growing memory; the browser reconnects with
+    Last-Event-ID and catches up from history,
+  - the last EVENT_HISTORY_SIZE events are kept for that resume.
+
+Event ids are "<epoch>-<seq>". The epoch changes each time the process
+starts, so a Last-Event-ID from another process (or from before a restart)
+is recognised as unresumable and the client is told to refetch.
+
+The bus is per worker process. With several workers an admin only sees
+events from writes handled by the worker serving their stream.
+"""
+
+import asyncio
+import json
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+EVENT_HISTORY_SIZE = 1000
+SUBSCRIBER_BUFFER_SIZE = 100
+HEARTBEAT_SECONDS = 15
+CLIENT_RETRY_MS = 3000
+
+
+@dataclass(frozen=True)
+class Event:
+    id: str
+    seq: int
+    type: str
+    data: dict
+
+    def encode(self) -> bytes:
+        payload = json.dumps(self.data, default=str, separators=(",", ":"))
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n".encode()
+
+
+class Subscription:
+    """One stream's bounded buffer. A None entry means the bus dropped it."""
+
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue[Optional[Event]] = asyncio.Queue(maxsize=buffer_size)
+
+
+class EventBus:
+    def __init__(self, history_size: int = EVENT_HISTORY_SIZE, buffer_size: int = SUBSCRIBER_BUFFER_SIZE):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.buffer_size = buffer_size
+        self._seq = 0
+        self._history: deque[Event] = deque(maxlen=history_size)
+        self._subscribers: set[Subscription] = set()
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    @property
+    def last_id(self) -> str:
+        return f"{self.epoch}-{self._seq}"
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, **data) -> Event:
+        """Fan an event out to every subscriber. Call from the event loop, after commit."""
+        self._seq += 1
+        event = Event(id=f"{self.epoch}-{self._seq}", seq=self._seq, type=event_type, data=data)
+        self._history.append(event)
+        self.published += 1
+
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+        return event
+
+    def _drop(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        self.dropped_subscribers += 1
+        # Make room for the end-of-stream marker; the client resumes from history.
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.buffer_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def replay(self, last_event_id: str) -> Optional[list[Event]]:
+        """
+        Events after `last_event_id`, or None if they can't be replayed
+        (another process's id, or older than the history window).
+        """
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq >= self._seq:
+            return []
+        if not self._history or self._history[0].seq > seq + 1:
+            return None
+        return [event for event in self._history if event.seq > seq]
+
+    async def stream(
+        self,
+        last_event_id: Optional[str] = None,
+        heartbeat: float = HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[bytes]:
+        """
+        SSE byte stream for one client: a `ready` (or `reset`) event carrying
+        the current id, any replayed backlog, then live events with comment
+        heartbeats while idle.
+        """
+        subscription = self.subscribe()
+        # subscribe() and replay() run without an await in between, so the
+        # backlog and the live queue neither overlap nor leave a gap.
+        backlog = self.replay(last_event_id) if last_event_id else []
+        try:
+            yield f"retry: {CLIENT_RETRY_MS}\n\n".encode()
+            if backlog is None:
+                yield f"id: {self.last_id}\nevent: reset\ndata: {{}}\n\n".encode()
+                backlog = []
+            elif not last_event_id:
+                yield f"id: {self.last_id}\nevent: ready\ndata: {{}}\n\n".encode()
+            for event in backlog:
+                yield event.encode()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    logger.info("Event stream dropped: subscriber fell %s events behind", self.buffer_size)
+                    return
+                yield event.encode()
+        finally:
+            self.unsubscribe(subscription)
+
+
+# ---------------------------------------------------------------------------
+# Application singleton
+# ---------------------------------------------------------------------------
+
+_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    global _bus
+    if _bus is None:
+        _bus = EventBus()
+    return _bus
+
+
+def publish_event(event_type: str, **data) -> None:
+    get_event_bus().publish(event_type, **data)
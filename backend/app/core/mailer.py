@@ -0,0 +1,361 @@
+"""
+Background mail dispatcher for transactional email (OTP codes).
+
+Design:
+  - Routes enqueue an EmailMessage and return immediately; nothing on the
+    request path touches the network.
+  - A fixed pool of workers each owns one long-lived, authenticated SMTP
+    connection (EHLO + STARTTLS + LOGIN happen once per connection, not per
+    message). Idle connections are probed with NOOP and re-opened on failure.
+  - Workers drain the queue in batches so a burst of OTPs is sent over the
+    same connection back-to-back.
+  - Failed messages are retried with exponential backoff + jitter, up to
+    MAIL_MAX_RETRIES, then dropped with an error log.
+  - The queue is bounded; enqueue() returns False when it is full so the
+    caller can shed load instead of buffering unbounded memory.
+
+smtplib is blocking, so every SMTP call runs on a dedicated thread pool sized
+to the connection pool. Each connection belongs to one worker and is only ever
+used by one thread at a time.
+
+Privacy: messages carry a `log_key` (the email blind index) which is the only
+recipient identifier ever written to logs.
+"""
+
+import asyncio
+import random
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Probe a connection with NOOP before reuse if it has been idle this long.
+_IDLE_PROBE_SECONDS = 30.0
+
+
+@dataclass
+class OutgoingMail:
+    message: EmailMessage
+    log_key: str
+    attempts: int = 0
+
+
+@dataclass
+class MailStats:
+    enqueued: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    dropped_queue_full: int = 0
+    connections_opened: int = 0
+    batches: int = 0
+
+
+@dataclass
+class _PooledConnection:
+    smtp: Optional[smtplib.SMTP] = None
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class MailDispatcher:
+    """Bounded async mail queue drained by a pool of persistent SMTP connections."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        sender: Optional[str] = None,
+        use_starttls: bool = True,
+        pool_size: int = 2,
+        queue_size: int = 1000,
+        batch_size: int = 20,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        timeout: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender or username
+        self.use_starttls = use_starttls
+        self.pool_size = max(1, pool_size)
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+
+        self.stats = MailStats()
+        self._queue: asyncio.Queue[OutgoingMail] = asyncio.Queue(maxsize=queue_size)
+        self._workers: list[asyncio.Task] = []
+        self._retry_tasks: set[asyncio.Task] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connections: list[_PooledConnection] = []
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="smtp")
+        self._connections = [_PooledConnection() for _ in range(self.pool_size)]
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"mail-worker-{i}")
+            for i in range(self.pool_size)
+        ]
+        logger.info(
+            "Mail dispatcher started: pool_size=%s batch_size=%s queue_size=%s",
+            self.pool_size,
+            self.batch_size,
+            self._queue.maxsize,
+        )
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """Wait up to `drain_timeout` for queued mail, then close all connections."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Mail dispatcher stopped with %s message(s) still queued", self._queue.qsize())
+
+        for task in [*self._workers, *self._retry_tasks]:
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._retry_tasks, return_exceptions=True)
+        self._workers = []
+        self._retry_tasks.clear()
+
+        loop = asyncio.get_running_loop()
+        for slot in range(len(self._connections)):
+            await loop.run_in_executor(self._executor, self._close, slot)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        logger.info(
+            "Mail dispatcher stopped: sent=%s failed=%s retried=%s",
+            self.stats.sent,
+            self.stats.failed,
+            self.stats.retried,
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def enqueue(self, message: EmailMessage, log_key: str) -> bool:
+        """Queue a message for delivery. Returns False if the queue is full."""
+        if "From" not in message:
+            message["From"] = self.sender
+        try:
+            self._queue.put_nowait(OutgoingMail(message=message, log_key=log_key))
+        except asyncio.QueueFull:
+            self.stats.dropped_queue_full += 1
+            return False
+        self.stats.enqueued += 1
+        return True
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def join(self) -> None:
+        """Wait until every queued message has been sent or given up on."""
+        while True:
+            await self._queue.join()
+            if not self._retry_tasks:
+                return
+            await asyncio.gather(*list(self._retry_tasks), return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def _worker(self, slot: int) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                failed = await loop.run_in_executor(self._executor, self._send_batch, slot, batch)
+            except Exception as e:
+                # No connection could be opened: nothing was sent, so the whole batch is retried.
+                logger.warning("SMTP batch failed on slot %s — %s: %s", slot, type(e).__name__, e)
+                failed = [(item, e) for item in batch]
+
+            self.stats.batches += 1
+            self.stats.sent += len(batch) - len(failed)
+            for item, error in failed:
+                self._schedule_retry(item, error)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _schedule_retry(self, item: OutgoingMail, error: Exception) -> None:
+        item.attempts += 1
+        if item.attempts > self.max_retries:
+            self.stats.failed += 1
+            logger.error(
+                "Email delivery failed permanently — email_index=%s attempts=%s — %s: %s",
+                item.log_key,
+                item.attempts,
+                type(error).__name__,
+                error,
+            )
+            return
+
+        self.stats.retried += 1
+        delay = self.backoff_base * (2 ** (item.attempts - 1))
+        delay += random.uniform(0, delay / 2)
+        task = asyncio.create_task(self._requeue_after(item, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _requeue_after(self, item: OutgoingMail, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self._queue.put(item)
+
+    # ------------------------------------------------------------------
+    # Blocking SMTP side (runs on the executor thread for `slot`)
+    # ------------------------------------------------------------------
+
+    def _send_batch(self, slot: int, batch: list[OutgoingMail]) -> list[tuple[OutgoingMail, Exception]]:
+        """
+        Send `batch`; returns only the items that were not delivered, so a
+        retry never re-sends a message that already went out.
+        """
+        smtp = self._ensure_connection(slot)
+        failed: list[tuple[OutgoingMail, Exception]] = []
+        for i, item in enumerate(batch):
+            try:
+                smtp.send_message(item.message)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Reconnect once; if that fails the rest of the batch is retried later.
+                self._close(slot)
+                try:
+                    smtp = self._ensure_connection(slot)
+                except Exception as e:
+                    failed.extend((rest, e) for rest in batch[i:])
+                    break
+                try:
+                    smtp.send_message(item.message)
+                except (smtplib.SMTPServerDisconnected, OSError) as e:
+                    self._close(slot)
+                    failed.extend((rest, e) for rest in batch[i:])
+                    break
+                except Exception as e:
+                    failed.append((item, e))
+            except Exception as e:
+                # Per message (refused recipient, or e.g. a ValueError /
+                # UnicodeEncodeError for a malformed address): the rest of the
+                # batch still goes out on this connection.
+                failed.append((item, e))
+        self._connections[slot].last_used = time.monotonic()
+        return failed
+
+    def _ensure_connection(self, slot: int) -> smtplib.SMTP:
+        conn = self._connections[slot]
+        if conn.smtp is not None and time.monotonic() - conn.last_used > _IDLE_PROBE_SECONDS:
+            try:
+                if conn.smtp.noop()[0] != 250:
+                    self._close(slot)
+            except (smtplib.SMTPException, OSError):
+                self._close(slot)
+
+        if conn.smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                smtp.ehlo()
+                if self.use_starttls:
+                    smtp.starttls()
+                    smtp.ehlo()
+                if self.username and self.password:
+                    smtp.login(self.username, self.password)
+            except Exception:
+                smtp.close()
+                raise
+            conn.smtp = smtp
+            conn.last_used = time.monotonic()
+            self.stats.connections_opened += 1
+        return conn.smtp
+
+    def _close(self, slot: int) -> None:
+        conn = self._connections[slot]
+        if conn.smtp is None:
+            return
+        try:
+            conn.smtp.quit()
+        except Exception:
+            conn.smtp.close()
+        conn.smtp = None
+
+
+# ---------------------------------------------------------------------------
+# Application singleton
+# ---------------------------------------------------------------------------
+
+_dispatcher: Optional[MailDispatcher] = None
+
+
+def smtp_configured() -> bool:
+    return all([settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_USER, settings.SMTP_PASS])
+
+
+def get_mail_dispatcher() -> Optional[MailDispatcher]:
+    """Return the process-wide dispatcher, or None if SMTP is not configured."""
+    global _dispatcher
+    if _dispatcher is None and smtp_configured():
+        _dispatcher = MailDispatcher(
+            host=settings.SMTP_HOST,
+            port=int(settings.SMTP_PORT),
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASS,
+            sender=settings.SMTP_FROM or settings.SMTP_USER,
+            use_starttls=settings.SMTP_STARTTLS,
+            pool_size=settings.MAIL_POOL_SIZE,
+            queue_size=settings.MAIL_QUEUE_SIZE,
+            batch_size=settings.MAIL_BATCH_SIZE,
+            max_retries=settings.MAIL_MAX_RETRIES,
+        )
+    return _dispatcher
+
+
+async def start_mail_dispatcher() -> None:
+    dispatcher = get_mail_dispatcher()
+    if dispatcher is None:
+        logger.warning("SMTP not fully configured — mail dispatcher not started")
+        return
+    await dispatcher.start()
+
+
+async def stop_mail_dispatcher() -> None:
+    if _dispatcher is not None:
+        await _dispatcher.stop()
+
+
+def build_otp_message(email: str, code: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg.set_content(
+        f"Your {settings.APP_NAME} verification code is: {code}\n\n"
+        f"This code expires in {settings.OTP_EXPIRY_MINUTES} minutes.\n"
+        f"If you didn't request this, you can safely ignore this email."
+    )
+    msg["Subject"] = f"Your {settings.APP_NAME} verification code"
+    msg["To"] = email
+    return msg
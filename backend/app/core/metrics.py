@@ -0,0 +1,352 @@
+"""
+Prometheus metrics, rendered in the text exposition format at GET /metrics.
+
+No client library: the handful of metric types needed here are plain dicts
+of label tuples → numbers. Every update happens on the event-loop thread
+(middleware, SQLAlchemy pool/cursor events under asyncpg's greenlets), so
+an increment is a dict lookup and an add with no lock to take.
+
+Multiple uvicorn workers: set METRICS_DIR to a directory shared by the
+workers (cleared on deploy, like prometheus_client's multiprocess dir).
+Each worker writes a snapshot of its own registry to <dir>/<pid>.json every
+METRICS_FLUSH_SECONDS (atomic rename), and whichever worker serves /metrics
+flushes its own and merges all snapshots:
+  - counters and histograms are summed over every file, including workers
+    that have exited, so totals never go backwards when a worker restarts;
+  - gauges are summed over live workers only.
+Without METRICS_DIR, /metrics reports the serving process alone.
+
+Exported:
+  http_requests_total{method,route,status}        counter
+  http_request_duration_seconds{method,route}     histogram
+  http_requests_in_flight{method}                 gauge
+  db_pool_checkout_seconds{pool}                  histogram (wait + connect)
+  db_pool_checkout_timeouts_total{pool}           counter
+  db_pool_size / db_pool_checked_out / db_pool_overflow {pool}   gauges
+  cache_lookups_total{cache,result}               counter (hit / miss)
+Routes are labelled by their template (/api/v1/reviews/{review_id}), and
+unmatched paths as "unmatched", so label cardinality stays bounded.
+"""
+
+import asyncio
+import bisect
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ---------------------------------------------------------------------------
+# Metric types
+# ---------------------------------------------------------------------------
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.values: dict[tuple, object] = {}
+
+    def snapshot(self) -> list:
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        values = self.values
+        values[labels] = values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self.values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        values = self.values
+        values[labels] = values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Per-bucket (non-cumulative) counts + sum; rendered cumulative."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            # [count per bucket..., +Inf bucket, sum]
+            series = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, _Metric] = {}
+        self.collectors: dict[str, Callable[[], None]] = {}  # name → refresh gauges before a snapshot
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> dict:
+        for name, collect in self.collectors.items():
+            try:
+                collect()
+            except Exception:
+                logger.exception("Metrics collector %s failed", name)
+        return {
+            name: {
+                "type": m.kind,
+                "help": m.help,
+                "labelnames": list(m.labelnames),
+                "buckets": list(getattr(m, "buckets", ())),
+                "samples": m.snapshot(),
+            }
+            for name, m in self.metrics.items()
+        }
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status"),
+))
+HTTP_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"),
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ("method",),
+))
+DB_POOL_CHECKOUT = REGISTRY.register(Histogram(
+    "db_pool_checkout_seconds", "Time to obtain a pooled DB connection (queue wait + connect).", ("pool",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+))
+DB_POOL_TIMEOUTS = REGISTRY.register(Counter(
+    "db_pool_checkout_timeouts_total", "Connection checkouts that timed out waiting for the pool.", ("pool",),
+))
+DB_POOL_SIZE = REGISTRY.register(Gauge("db_pool_size", "Configured DB pool size.", ("pool",)))
+DB_POOL_CHECKED_OUT = REGISTRY.register(Gauge(
+    "db_pool_checked_out", "DB connections currently checked out.", ("pool",),
+))
+DB_POOL_OVERFLOW = REGISTRY.register(Gauge("db_pool_overflow", "DB connections open beyond the pool size.", ("pool",)))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "cache_lookups_total", "Cache lookups by cache and result (hit / miss).", ("cache", "result"),
+))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache, "hit" if hit else "miss")
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+def route_label(scope: dict) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    HTTP_REQUESTS.inc(method, route, str(status))
+    HTTP_DURATION.observe(seconds, method, route)
+
+
+# ---------------------------------------------------------------------------
+# Database
+# ---------------------------------------------------------------------------
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times each checkout from the queue."""
+
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"  # keep pool logs where they were
+    metrics_name = "primary"  # set per engine by instrument_engine
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc(self.metrics_name)
+            raise
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - start, self.metrics_name)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+def instrument_engine(engine, name: str = "primary") -> None:
+    """Pool gauges at collection time + SQL compiled-statement cache hit ratio."""
+    engine.sync_engine.pool.metrics_name = name
+
+    def collect_pool() -> None:
+        pool = engine.sync_engine.pool  # dispose() swaps in a new pool
+        if hasattr(pool, "size"):
+            DB_POOL_SIZE.set(pool.size(), name)
+            DB_POOL_CHECKED_OUT.set(pool.checkedout(), name)
+            DB_POOL_OVERFLOW.set(max(pool.overflow(), 0), name)
+
+    REGISTRY.collectors[f"db_pool_{name}"] = collect_pool  # replaces the one of a disposed engine
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _compiled_cache(conn, cursor, statement, parameters, context, executemany):
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CACHE_HIT:
+            CACHE_LOOKUPS.inc("sql_compiled", "hit")
+        elif cache_hit is CACHE_MISS:
+            CACHE_LOOKUPS.inc("sql_compiled", "miss")
+
+
+# ---------------------------------------------------------------------------
+# Exposition + multi-worker aggregation
+# ---------------------------------------------------------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(snapshot: dict) -> str:
+    lines = []
+    for name, m in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {m['help']}")
+        lines.append(f"# TYPE {name} {m['type']}")
+        labelnames = m["labelnames"]
+        for labels, value in sorted(m["samples"], key=lambda s: s[0]):
+            if m["type"] != "histogram":
+                lines.append(f"{name}{_labels(labelnames, labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip([*m["buckets"], "+Inf"], value[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{name}_bucket{_labels(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labelnames, labels)} {_format_value(value[-1])}")
+            lines.append(f"{name}_count{_labels(labelnames, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def merge(snapshots: list[tuple[dict, bool]]) -> dict:
+    """Combine (snapshot, worker alive) pairs: sum counters/histograms, sum gauges of live workers."""
+    merged: dict = {}
+    for snapshot, alive in snapshots:
+        for name, m in snapshot.items():
+            if m["type"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**m, "samples": {}})
+            samples = target["samples"]
+            for labels, value in m["samples"]:
+                key = tuple(labels)
+                if m["type"] == "histogram":
+                    current = samples.get(key)
+                    samples[key] = value if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    samples[key] = samples.get(key, 0) + value
+    for m in merged.values():
+        m["samples"] = [[list(k), v] for k, v in m["samples"].items()]
+    return merged
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def flush() -> None:
+    """Write this worker's snapshot to METRICS_DIR (atomically)."""
+    directory = Path(settings.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{os.getpid()}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(REGISTRY.snapshot(), separators=(",", ":")))
+    os.replace(tmp, path)
+
+
+def collect() -> str:
+    """The /metrics body: this process, or every worker when METRICS_DIR is set."""
+    if not settings.METRICS_DIR:
+        return render(REGISTRY.snapshot())
+
+    flush()
+    snapshots = []
+    for path in Path(settings.METRICS_DIR).glob("*.json"):
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue  # replaced or removed mid-read; the next scrape will see it
+        pid = int(path.stem) if path.stem.isdigit() else -1
+        snapshots.append((snapshot, pid == os.getpid() or _pid_alive(pid)))
+    return render(merge(snapshots))
+
+
+_flush_task: Optional[asyncio.Task] = None
+
+
+async def _flush_loop() -> None:
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+        try:
+            flush()
+        except OSError:
+            logger.exception("Metrics flush to %s failed", settings.METRICS_DIR)
+
+
+async def start_metrics() -> None:
+    global _flush_task
+    if settings.METRICS_DIR and _flush_task is None:
+        flush()
+        _flush_task = asyncio.create_task(_flush_loop(), name="metrics-flush")
+
+
+async def stop_metrics() -> None:
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        await asyncio.gather(_flush_task, return_exceptions=True)
+        _flush_task = None
+        flush()  # final counts survive the worker
@@ -1,24 +1,138 @@
 """
 OAuth2 integration with Microsoft Entra ID (Azure AD).
-Handles authorization URL generation, token exchange, and user info extraction.
+Handles authorization URL generation, token exchange, and ID token verification.
+
+The client is long-lived (started and stopped from the app lifespan):
+  - one pooled httpx.AsyncClient with keep-alive and timeouts, so callbacks
+    reuse connections instead of paying a TLS handshake per login,
+  - the OIDC discovery document and JWKS are cached in memory and refreshed
+    in the background; a refresh failure keeps serving the last good copy,
+  - ID tokens are verified locally (signature, issuer, audience, expiry,
+    at_hash) against the cached keys. An unknown `kid` triggers one
+    rate-limited JWKS refetch to pick up Microsoft's key rollover.
+  - The issuer is pinned to ENTRA_TENANT_ID, also when the authority is
+    "common"/"organizations": a token from any other tenant is rejected
+    before its claims are used.
+
+Tests can pass an httpx.MockTransport as `transport` to stand in for Entra.
 """
 
-import json
-import base64
+import asyncio
+import time
+from typing import Optional
+from urllib.parse import urlencode
+
 import httpx
+from jose import JWTError, jwt
+
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.metrics import record_cache
 
 logger = get_logger(__name__)
 
+METADATA_REFRESH_SECONDS = 60 * 60
+JWKS_MIN_REFETCH_SECONDS = 5 * 60
+
 
 class EntraAuthClient:
     """Client for Entra ID OAuth2 flow."""
 
-    def __init__(self):
-        self.authority = settings.ENTRA_AUTHORITY
+    def __init__(
+        self,
+        authority: Optional[str] = None,
+        client_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.authority = (authority or settings.ENTRA_AUTHORITY or "").rstrip("/")
+        self.client_id = client_id or settings.ENTRA_CLIENT_ID
+        self.tenant_id = tenant_id or settings.ENTRA_TENANT_ID
         self.token_url = f"{self.authority}/oauth2/v2.0/token"
         self.authorize_url = f"{self.authority}/oauth2/v2.0/authorize"
+        self.discovery_url = f"{self.authority}/v2.0/.well-known/openid-configuration"
+
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60),
+            transport=transport,
+        )
+        self._metadata: Optional[dict] = None
+        self._keys: dict[str, dict] = {}
+        self._keys_fetched_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Warm the metadata/JWKS caches and start the background refresher."""
+        try:
+            await self.refresh()
+        except httpx.HTTPError as e:
+            # Not fatal: the first login retries the fetch.
+            logger.warning(f"Entra metadata prefetch failed: {type(e).__name__}: {e}")
+        self._refresh_task = asyncio.create_task(self._refresh_loop(), name="entra-metadata-refresh")
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+        await self._http.aclose()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(METADATA_REFRESH_SECONDS)
+            try:
+                await self.refresh()
+            except httpx.HTTPError as e:
+                logger.warning(f"Entra metadata refresh failed, keeping cached copy: {type(e).__name__}: {e}")
+
+    # ------------------------------------------------------------------
+    # OIDC metadata + JWKS cache
+    # ------------------------------------------------------------------
+
+    async def refresh(self) -> None:
+        """Refetch the discovery document and JWKS."""
+        async with self._refresh_lock:
+            response = await self._http.get(self.discovery_url)
+            response.raise_for_status()
+            metadata = response.json()
+            keys = await self._fetch_keys(metadata["jwks_uri"])
+            self._metadata = metadata
+            self._keys = keys
+            self._keys_fetched_at = time.monotonic()
+
+    async def _fetch_keys(self, jwks_uri: str) -> dict[str, dict]:
+        response = await self._http.get(jwks_uri)
+        response.raise_for_status()
+        return {key["kid"]: key for key in response.json().get("keys", []) if "kid" in key}
+
+    async def get_metadata(self) -> dict:
+        if self._metadata is None:
+            await self.refresh()
+        return self._metadata
+
+    async def _get_signing_key(self, kid: str) -> Optional[dict]:
+        metadata = await self.get_metadata()
+        key = self._keys.get(kid)
+        record_cache("entra_jwks", key is not None)
+        if key is not None:
+            return key
+        # Unknown kid: Microsoft may have rolled keys. Refetch, but not more
+        # than once per JWKS_MIN_REFETCH_SECONDS so forged kids can't hammer it.
+        async with self._refresh_lock:
+            if kid not in self._keys and time.monotonic() - self._keys_fetched_at >= JWKS_MIN_REFETCH_SECONDS:
+                self._keys = await self._fetch_keys(metadata["jwks_uri"])
+                self._keys_fetched_at = time.monotonic()
+        return self._keys.get(kid)
+
+    # ------------------------------------------------------------------
+    # Authorization code flow
+    # ------------------------------------------------------------------
 
     def get_authorization_url(self, state: str, code_challenge: str, login_hint: str | None = None) -> str:
         """
@@ -26,7 +140,7 @@ class EntraAuthClient:
         Uses PKCE for enhanced security.
         """
         params = {
-            "client_id": settings.ENTRA_CLIENT_ID,
+            "client_id": self.client_id,
             "redirect_uri": settings.ENTRA_REDIRECT_URI,
             "response_type": "code",
             "scope": "openid profile email",
@@ -37,10 +151,7 @@ class EntraAuthClient:
         }
         if login_hint:
             params["login_hint"] = login_hint
-        # Build URL-encoded query string safely
-        from urllib.parse import urlencode
-        query_string = urlencode(params)
-        return f"{self.authorize_url}?{query_string}"
+        return f"{self.authorize_url}?{urlencode(params)}"
 
     async def exchange_code_for_token(
         self, code: str, code_verifier: str
@@ -49,7 +160,7 @@ class EntraAuthClient:
         Exchange authorization code for access and ID tokens.
         """
         payload = {
-            "client_id": settings.ENTRA_CLIENT_ID,
+            "client_id": self.client_id,
             "client_secret": settings.ENTRA_CLIENT_SECRET,
             "code": code,
             "redirect_uri": settings.ENTRA_REDIRECT_URI,
@@ -58,10 +169,42 @@ class EntraAuthClient:
             "scope": "openid profile email",
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.token_url, data=payload)
-            response.raise_for_status()
-            return response.json()
+        response = await self._http.post(self.token_url, data=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def verify_id_token(self, id_token: str, access_token: Optional[str] = None) -> dict:
+        """
+        Verify an ID token against the cached JWKS and return its claims.
+        Raises jose.JWTError if the token is malformed, unsigned by a known
+        key, expired, or issued for another audience/issuer; httpx.HTTPError
+        if the metadata cannot be fetched.
+        """
+        header = jwt.get_unverified_header(id_token)
+        kid = header.get("kid")
+        key = await self._get_signing_key(kid) if kid else None
+        if key is None:
+            raise JWTError("ID token signed with an unknown key")
+
+        # Multi-tenant metadata advertises "…/{tenantid}/v2.0". Fill it with our
+        # own tenant, never the token's `tid`, or any tenant's token would pass.
+        if not self.tenant_id:
+            raise JWTError("ENTRA_TENANT_ID is not configured; refusing to accept ID tokens")
+        issuer = self._metadata["issuer"].replace("{tenantid}", self.tenant_id)
+
+        claims = jwt.decode(
+            id_token,
+            key,
+            algorithms=[key.get("alg", "RS256")],
+            audience=self.client_id,
+            issuer=issuer,
+            access_token=access_token,
+        )
+        if claims.get("tid") != self.tenant_id:
+            raise JWTError("ID token issued by another tenant")
+        if not claims.get("oid"):
+            raise JWTError("ID token has no object id (oid)")
+        return claims
 
     @staticmethod
     def extract_user_info(id_token_claims: dict) -> dict:
@@ -69,14 +212,15 @@ class EntraAuthClient:
         Extract user info from Entra ID token claims.
         Returns: {user_id, email, name, role}
         """
-        email = id_token_claims.get("email") or id_token_claims.get("preferred_username")
-        
+        # preferred_username is the home-tenant UPN; `email` is user-editable.
+        email = id_token_claims.get("preferred_username")
+
         # Determine role from email domain or groups
         # For now: assume @aub.edu.lb is student, you can add other logic
         role = "student"
         if email and "professor" in email.lower():
             role = "professor"
-        
+
         return {
             "user_id": id_token_claims.get("oid"),  # Object ID
             "email": email,
@@ -86,32 +230,32 @@ class EntraAuthClient:
         }
 
 
-# Only create an Entra client if OAuth is enabled. When disabled this module
-# still exports `decode_id_token` but `entra_client` will be None so callers
-# can choose an alternative (e.g. OTP) flow.
-entra_client = EntraAuthClient() if settings.ENABLE_OAUTH else None
+# ---------------------------------------------------------------------------
+# Application singleton
+# ---------------------------------------------------------------------------
 
+_client: Optional[EntraAuthClient] = None
 
-def decode_id_token(id_token: str) -> dict:
+
+def get_entra_client() -> Optional[EntraAuthClient]:
     """
-    Decode JWT ID token without verification (we trust Microsoft's signature).
-    Returns the claims payload.
+    The Entra client, built on first use. Returns None when OAuth is disabled
+    so callers can choose an alternative (e.g. OTP) flow.
     """
-    try:
-        # JWT format: header.payload.signature
-        parts = id_token.split(".")
-        if len(parts) != 3:
-            raise ValueError("Invalid token format")
-        
-        # Decode payload (add padding if needed)
-        payload = parts[1]
-        # Add padding
-        padding = 4 - len(payload) % 4
-        if padding != 4:
-            payload += "=" * padding
-        
-        decoded = base64.urlsafe_b64decode(payload)
-        return json.loads(decoded)
-    except Exception as e:
-        logger.error(f"Failed to decode ID token: {e}")
-        raise
\ No newline at end of file
+    global _client
+    if _client is None and settings.ENABLE_OAUTH:
+        _client = EntraAuthClient()
+    return _client
+
+
+async def start_entra_client() -> None:
+    client = get_entra_client()
+    if client is not None:
+        await client.start()
+
+
+async def stop_entra_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,48 @@
+"""
+Opaque keyset-pagination cursors.
+
+A cursor encodes the sort key of the last row on a page, e.g.
+(created_at, id). The next page is `WHERE (created_at, id) < cursor`, which
+an index on the same columns serves without scanning skipped rows — unlike
+OFFSET, whose cost grows with the page number.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Optional
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[tuple[datetime, uuid.UUID]]:
+    """Inverse of encode_cursor. Raises ValueError on a malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_score_cursor(score: float, row_id: uuid.UUID) -> str:
+    """Cursor for lists ordered by a numeric score, e.g. the violation triage queue."""
+    raw = json.dumps([score, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_score_cursor(cursor: Optional[str]) -> Optional[tuple[float, uuid.UUID]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), uuid.UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,112 @@
+"""
+Per-request SQL accounting: how many statements a request ran, how long
+they spent in the database and how many rows they returned.
+
+The log_requests middleware opens a QueryStats for each request in a
+ContextVar; engine cursor events add to whichever QueryStats is current.
+The context follows the request into SQLAlchemy's greenlets, and work
+outside a request (jobs, pre-moderation workers) has none and is skipped.
+The totals go into the request-complete log line and a Server-Timing
+header, e.g.
+
+    Server-Timing: db;dur=12.40;desc="6 queries, 41 rows", total;dur=18.02
+
+N+1 detector (ENV=dev): statements are grouped by their SQL text, which
+is the statement shape — bound values are $n placeholders — and a shape
+run more than N_PLUS_ONE_THRESHOLD times in one request is logged as a
+warning with its count, pointing at a lazy load or a per-row query that
+should be a selectinload or one batched query.
+"""
+
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SHAPE_PREVIEW_CHARS = 200
+
+
+@dataclass
+class QueryStats:
+    request_id: str
+    queries: int = 0
+    db_ms: float = 0.0
+    rows: int = 0
+    shapes: Optional[Counter] = None  # statement → executions; only with the N+1 detector on
+    scope: Optional[dict] = None      # ASGI scope; the matched route appears in it once routed
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def route(self) -> Optional[str]:
+        route = (self.scope or {}).get("route")
+        return getattr(route, "path", None)
+
+    def server_timing(self) -> str:
+        total_ms = (time.perf_counter() - self.started_at) * 1000
+        return (
+            f'db;dur={self.db_ms:.2f};desc="{self.queries} queries, {self.rows} rows", '
+            f"total;dur={total_ms:.2f}"
+        )
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        if not self.shapes:
+            return []
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current() -> Optional[QueryStats]:
+    """The QueryStats of the request being served, if any."""
+    return _current.get()
+
+
+def start_request(request_id: str, scope: Optional[dict] = None):
+    """Begin accounting for a request; returns (stats, token for end_request)."""
+    stats = QueryStats(request_id, shapes=Counter() if settings.ENV == "dev" else None, scope=scope)
+    return stats, _current.set(stats)
+
+
+def end_request(stats: QueryStats, token, method: str, path: str) -> None:
+    _current.reset(token)
+    for shape, count in stats.repeated_shapes(settings.N_PLUS_ONE_THRESHOLD):
+        logger.warning(
+            "Possible N+1: request_id=%s method=%s path=%s executions=%s statement=%s",
+            stats.request_id,
+            method,
+            path,
+            count,
+            " ".join(shape.split())[:_SHAPE_PREVIEW_CHARS],
+        )
+
+
+def instrument_engine(engine) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info["query_stats_start"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is None:
+            return
+        start = conn.info.pop("query_stats_start", None)
+        if start is not None:
+            stats.db_ms += (time.perf_counter() - start) * 1000
+        stats.queries += 1
+        if cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+        if stats.shapes is not None:
+            stats.shapes[statement] += 1
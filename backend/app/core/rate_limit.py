@@ -0,0 +1,182 @@
+"""
+Rate limiting for auth and write endpoints.
+
+Sliding-window counters (two fixed windows, the previous one weighted by how
+much of it still overlaps the sliding window) keyed by scope:
+
+  email — HMAC blind index of the address (never the plaintext)
+  user  — authenticated user id
+  ip    — client IP as resolved by get_client_ip(): the peer address, or
+          with TRUSTED_PROXY_HOPS=N the address the outermost of our N
+          proxies saw (N-th X-Forwarded-For entry from the right). Entries
+          further left are client-supplied and never trusted.
+
+Each route names a policy in POLICIES; a policy is a tuple of limits and the
+request is rejected if any of them is exceeded.
+
+Backends (RATE_LIMIT_BACKEND):
+  memory — per-process dict, O(1) per check, no I/O. Limits apply per worker.
+  db     — `rate_limit_counters` table shared by every worker; one
+           primary-key read + one conditional upsert per limit.
+Both count admitted hits only, so a client that keeps retrying while
+limited is let back in once the window has slid past its earlier hits.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Literal, Optional, Protocol
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app import crud
+
+Scope = Literal["email", "user", "ip"]
+
+
+@dataclass(frozen=True)
+class Limit:
+    scope: Scope
+    limit: int
+    window_seconds: int
+
+
+POLICIES: dict[str, tuple[Limit, ...]] = {
+    "otp_request": (Limit("email", 5, 3600), Limit("ip", 30, 3600)),
+    "otp_verify": (Limit("email", 10, 600), Limit("ip", 60, 600)),
+    "review_write": (Limit("user", 10, 3600), Limit("ip", 60, 3600)),
+    "review_vote": (Limit("user", 120, 60),),
+    "violation_report": (Limit("user", 20, 3600),),
+}
+
+
+@dataclass(frozen=True)
+class RateLimitExceeded:
+    policy: str
+    scope: Scope
+    retry_after: int
+
+
+def get_client_ip(request: Request) -> str:
+    hops = settings.TRUSTED_PROXY_HOPS
+    if hops > 0:
+        forwarded = [ip.strip() for ip in request.headers.get("x-forwarded-for", "").split(",") if ip.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+def _weighted(prev: int, curr: int, window_seconds: int, now: float) -> tuple[float, float]:
+    """Return (estimated hits in the sliding window, seconds into the current window)."""
+    elapsed = now % window_seconds
+    return prev * (1 - elapsed / window_seconds) + curr, elapsed
+
+
+class Backend(Protocol):
+    async def hit(self, key: str, limit: int, window_seconds: int) -> Optional[int]:
+        """Record a hit. Returns None if allowed, else seconds until retry."""
+        ...
+
+
+class MemoryBackend:
+    """In-process sliding-window counters with LRU-bounded memory."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key → [window_index, current_count, previous_count, window_seconds]
+        self._counters: OrderedDict[str, list[int]] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> Optional[int]:
+        return self.hit_sync(key, limit, window_seconds, time.time())
+
+    def hit_sync(self, key: str, limit: int, window_seconds: int, now: float) -> Optional[int]:
+        window = int(now // window_seconds)
+        entry = self._counters.get(key)
+        if entry is None:
+            entry = [window, 0, 0, window_seconds]
+            self._counters[key] = entry
+        else:
+            self._counters.move_to_end(key)
+            if entry[0] != window:
+                entry[2] = entry[1] if entry[0] == window - 1 else 0
+                entry[1] = 0
+                entry[0] = window
+
+        estimate, elapsed = _weighted(entry[2], entry[1], window_seconds, now)
+        if estimate >= limit:
+            return max(1, math.ceil(window_seconds - elapsed))
+        entry[1] += 1
+        self._evict(now)
+        return None
+
+    def _evict(self, now: float) -> None:
+        counters = self._counters
+        while counters:
+            key, (window, _, _, window_seconds) = next(iter(counters.items()))
+            stale = window < int(now // window_seconds) - 1
+            if not stale and len(counters) <= self.max_keys:
+                break
+            counters.popitem(last=False)
+
+
+class DatabaseBackend:
+    """Counters in the shared `rate_limit_counters` table (purged by a background job)."""
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> Optional[int]:
+        now = time.time()
+        window = int(now // window_seconds)
+        async with AsyncSessionLocal() as db:
+            prev = await crud.rate_limits.get_count(db, key, window - 1)
+            carried, elapsed = _weighted(prev, 0, window_seconds, now)
+            # Like MemoryBackend, count only admitted hits: the upsert adds one
+            # only while this window's count keeps the estimate under the limit.
+            counted = None
+            if carried < limit:
+                counted = await crud.rate_limits.increment(db, key, window, window_seconds, below=math.ceil(limit - carried))
+                await db.commit()
+
+        if counted is None:
+            return max(1, math.ceil(window_seconds - elapsed))
+        return None
+
+
+class RateLimiter:
+    def __init__(self, backend: Backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    async def check(
+        self,
+        policy: str,
+        *,
+        email_index: Optional[str] = None,
+        user_id: Optional[str] = None,
+        ip: Optional[str] = None,
+    ) -> Optional[RateLimitExceeded]:
+        """Count a request against every limit in `policy`; return the first one exceeded."""
+        if not self.enabled:
+            return None
+        identities = {"email": email_index, "user": user_id, "ip": ip}
+        for limit in POLICIES[policy]:
+            identity = identities[limit.scope]
+            if identity is None:
+                continue
+            key = f"{policy}:{limit.scope}:{identity}"
+            retry_after = await self.backend.hit(key, limit.limit, limit.window_seconds)
+            if retry_after is not None:
+                return RateLimitExceeded(policy=policy, scope=limit.scope, retry_after=retry_after)
+        return None
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        backend = DatabaseBackend() if settings.RATE_LIMIT_BACKEND == "db" else MemoryBackend()
+        _limiter = RateLimiter(backend, enabled=settings.RATE_LIMIT_ENABLED)
+    return _limiter
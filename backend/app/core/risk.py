@@ -0,0 +1,158 @@
+"""
+Review risk scoring for pre-moderation: rule checks plus a naive Bayes text
+classifier trained on past approve/reject decisions.
+
+Pure CPU, no I/O on the scoring path, so it can be used by the background
+pipeline (app.core.premoderation) and by the offline train/eval command
+(scripts/premoderation.py) alike.
+
+risk = 1 − (1 − rule_risk) × (1 − model_risk), in [0, 1]. Rules contribute
+independent weights (a link and shouting together score higher than either).
+With no trained model only the rules apply.
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+# ---------------------------------------------------------------------------
+# Naive Bayes
+# ---------------------------------------------------------------------------
+
+class NaiveBayesModel:
+    """
+    Multinomial naive Bayes over unigram counts with Laplace smoothing.
+    Two classes: approved (0) and rejected (1).
+
+    Scoring is one dict lookup per token: the per-token log-likelihood ratio
+    log P(t | rejected) − log P(t | approved) is precomputed at load time.
+    """
+
+    def __init__(self, token_counts: dict[str, tuple[int, int]], doc_counts: tuple[int, int]):
+        self.token_counts = token_counts
+        self.doc_counts = doc_counts
+
+        vocab = len(token_counts) + 1  # +1 for unseen tokens
+        totals = [sum(counts[c] for counts in token_counts.values()) for c in (0, 1)]
+        denom_approved = math.log(totals[0] + vocab)
+        denom_rejected = math.log(totals[1] + vocab)
+        self._llr = {
+            token: (math.log(rejected + 1) - denom_rejected) - (math.log(approved + 1) - denom_approved)
+            for token, (approved, rejected) in token_counts.items()
+        }
+        self._unknown_llr = denom_approved - denom_rejected
+        self._prior = math.log((doc_counts[1] + 1) / (doc_counts[0] + 1))
+
+    @classmethod
+    def train(cls, samples: Iterable[tuple[str, bool]], max_vocab: int = 50_000) -> "NaiveBayesModel":
+        """samples: (text, was_rejected). Keeps the `max_vocab` most frequent tokens."""
+        counts: dict[str, list[int]] = {}
+        docs = [0, 0]
+        for text, rejected in samples:
+            label = int(rejected)
+            docs[label] += 1
+            for token in tokenize(text):
+                counts.setdefault(token, [0, 0])[label] += 1
+
+        if len(counts) > max_vocab:
+            kept = sorted(counts, key=lambda t: sum(counts[t]), reverse=True)[:max_vocab]
+            counts = {token: counts[token] for token in kept}
+        return cls({token: (a, r) for token, (a, r) in counts.items()}, (docs[0], docs[1]))
+
+    def reject_probability(self, text: str) -> float:
+        llr, unknown = self._llr, self._unknown_llr
+        score = self._prior + sum(llr.get(token, unknown) for token in tokenize(text))
+        # Numerically stable logistic.
+        if score >= 0:
+            return 1.0 / (1.0 + math.exp(-score))
+        z = math.exp(score)
+        return z / (1.0 + z)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        data = {"doc_counts": list(self.doc_counts), "token_counts": self.token_counts}
+        path.write_text(json.dumps(data, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, path: Path) -> "NaiveBayesModel":
+        data = json.loads(path.read_text())
+        return cls(
+            {token: tuple(counts) for token, counts in data["token_counts"].items()},
+            tuple(data["doc_counts"]),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Rules
+# ---------------------------------------------------------------------------
+
+_LINK = re.compile(r"https?://|www\.|\b[a-z0-9-]+\.(?:com|net|org|io|ly|me)\b", re.IGNORECASE)
+_REPEATED_CHAR = re.compile(r"(.)\1{5,}")
+
+
+def _shouting(text: str) -> bool:
+    letters = [c for c in text if c.isalpha()]
+    return len(letters) >= 20 and sum(c.isupper() for c in letters) / len(letters) > 0.6
+
+
+def _repetitive(text: str) -> bool:
+    if _REPEATED_CHAR.search(text):
+        return True
+    tokens = tokenize(text)
+    return len(tokens) >= 10 and len(set(tokens)) / len(tokens) < 0.3
+
+
+def _too_short(text: str) -> bool:
+    return sum(c.isalpha() for c in text) < 20
+
+
+# (flag, weight, predicate)
+RULES: list[tuple[str, float, Callable[[str], bool]]] = [
+    ("link", 0.5, lambda text: bool(_LINK.search(text))),
+    ("shouting", 0.3, _shouting),
+    ("repetitive", 0.3, _repetitive),
+    ("too_short", 0.2, _too_short),
+]
+
+
+# ---------------------------------------------------------------------------
+# Scorer
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RiskAssessment:
+    risk: float
+    flags: list[str] = field(default_factory=list)
+    model_risk: Optional[float] = None
+
+
+class RiskScorer:
+    def __init__(self, model: Optional[NaiveBayesModel] = None, rules=RULES):
+        self.model = model
+        self.rules = rules
+
+    def assess(self, text: str) -> RiskAssessment:
+        flags = []
+        keep = 1.0
+        for flag, weight, predicate in self.rules:
+            if predicate(text):
+                flags.append(flag)
+                keep *= 1.0 - weight
+
+        model_risk = self.model.reject_probability(text) if self.model is not None else None
+        if model_risk is not None:
+            keep *= 1.0 - model_risk
+        return RiskAssessment(risk=1.0 - keep, flags=flags, model_risk=model_risk)
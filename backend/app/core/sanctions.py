@@ -0,0 +1,36 @@
+"""
+Moderation sanctions: a user can be blocked (indefinitely) or muted (until a
+time). Both stop the user writing reviews; they don't sign the user out.
+
+Enforcement reads the state from the User row that get_current_user has
+already loaded for authentication, so it costs no query. FastAPI caches that
+dependency per request, and the row is re-read on every request, so an admin
+action applies from the user's next request in every worker. A process-level
+cache would save nothing here (the row is loaded for auth anyway) and would
+need cross-worker invalidation.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class SanctionState:
+    is_blocked: bool = False
+    muted_until: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user) -> "SanctionState":
+        return cls(is_blocked=user.is_blocked, muted_until=user.muted_until)
+
+    def is_muted(self, now: Optional[datetime] = None) -> bool:
+        return self.muted_until is not None and self.muted_until > (now or datetime.utcnow())
+
+    def denial(self, now: Optional[datetime] = None) -> Optional[str]:
+        """Why the user may not write, or None if they may."""
+        if self.is_blocked:
+            return "User is blocked"
+        if self.is_muted(now):
+            return f"User is muted until {self.muted_until.isoformat()}"
+        return None
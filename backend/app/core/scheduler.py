@@ -1,51 +1,272 @@
 """
-Optional scheduled background tasks using APScheduler.
-Usage: import and call setup_scheduler() in main.py if APScheduler is installed.
-
-Example:
-    from app.core.scheduler import setup_scheduler
-    
-    @app.on_event("startup")
-    def startup_event():
-        init_db()
-        setup_scheduler()
+Asyncio-native periodic job runner for maintenance tasks.
+
+Started and stopped from the app lifespan (see app.main). Each job:
+  - runs as a coroutine on the event loop (no threads, nothing left un-awaited),
+  - is spread out with random jitter so workers started together don't fire
+    in lockstep,
+  - runs only on the leader: the worker holding a session-level Postgres
+    advisory lock (LEADER_LOCK_ID) on a connection kept for the runner's
+    lifetime. With N uvicorn workers each job runs once per interval, not N
+    times; the others record a `skipped_not_leader` and try to take over
+    each interval, so a leader that exits or loses its connection is
+    replaced,
+  - also takes a per-job advisory lock for the duration of the run, so an
+    ad-hoc run_once() never overlaps a scheduled run (`skipped_locked`),
+  - records per-job metrics (runs, failures, skips, last duration/result).
+
+Jobs are registered in register_default_jobs(); ad-hoc runs (e.g. from a
+shell) can use `await get_job_runner().run_once("<name>")`.
 """
 
+import asyncio
+import random
+import time
+import zlib
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
 from app.core.logger import get_logger
-from app.core.tasks import cleanup_expired_otps
+from app.core import tasks
+from app.db.base import get_engine
 
 logger = get_logger(__name__)
 
+JobFunc = Callable[[], Awaitable[Optional[int]]]
+
+LEADER_LOCK_ID = 0x4A0B << 32  # held by the leading worker; same namespace as Job.lock_id
+
+
+@dataclass
+class JobMetrics:
+    runs: int = 0
+    failures: int = 0
+    skipped_locked: int = 0
+    skipped_not_leader: int = 0
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    last_result: Optional[int] = None
+    last_error: Optional[str] = None
+    total_duration_ms: float = 0.0
+
+
+@dataclass
+class Job:
+    name: str
+    func: JobFunc
+    interval_seconds: float
+    jitter_seconds: float = 0.0
+    metrics: JobMetrics = field(default_factory=JobMetrics)
+
+    @property
+    def lock_id(self) -> int:
+        # Stable across processes; namespaced so it can't collide with other advisory locks.
+        return (0x4A0B << 32) | zlib.crc32(self.name.encode())
+
+
+class JobRunner:
+    def __init__(self, use_advisory_locks: bool = True):
+        self.use_advisory_locks = use_advisory_locks
+        self._jobs: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._leader_conn: Optional[AsyncConnection] = None
+        self._leader_lock = asyncio.Lock()
+
+    def add_job(
+        self,
+        name: str,
+        func: JobFunc,
+        interval_seconds: float,
+        jitter_seconds: float = 0.0,
+    ) -> Job:
+        job = Job(name=name, func=func, interval_seconds=interval_seconds, jitter_seconds=jitter_seconds)
+        self._jobs[name] = job
+        return job
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._tasks = [
+            asyncio.create_task(self._loop(job), name=f"job-{job.name}")
+            for job in self._jobs.values()
+        ]
+        logger.info("Job runner started: jobs=%s", ",".join(self._jobs))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._resign()
+        logger.info("Job runner stopped")
+
+    def metrics(self) -> dict[str, dict]:
+        return {name: asdict(job.metrics) for name, job in self._jobs.items()}
+
+    async def run_once(self, name: str) -> Optional[int]:
+        """Run a job immediately (still under its lock). Returns its result, or None if skipped."""
+        return await self._run(self._jobs[name])
+
+    # ------------------------------------------------------------------
+
+    async def _loop(self, job: Job) -> None:
+        await asyncio.sleep(random.uniform(0, job.jitter_seconds or job.interval_seconds))
+        while True:
+            if await self._lead(job):
+                await self._run(job)
+            else:
+                job.metrics.skipped_not_leader += 1
+                logger.debug("Job %s skipped — another worker is the leader", job.name)
+            delay = job.interval_seconds + random.uniform(-job.jitter_seconds, job.jitter_seconds)
+            await asyncio.sleep(max(1.0, delay))
+
+    async def _lead(self, job: Job) -> bool:
+        """True if this worker is (or has just become) the leader."""
+        if not self.use_advisory_locks:
+            return True
+        engine = get_engine()
+        if engine.dialect.name != "postgresql":
+            return True
+
+        async with self._leader_lock:
+            try:
+                if self._leader_conn is not None:
+                    try:
+                        await self._leader_conn.scalar(text("SELECT 1"))
+                        await self._leader_conn.commit()  # don't sit idle in a transaction
+                        return True
+                    except Exception as e:
+                        # The session (and with it the lock) is gone; another worker may lead now.
+                        logger.warning("Job runner lost its leader connection — %s: %s", type(e).__name__, e)
+                        await self._resign()
+
+                conn = await engine.connect()
+                try:
+                    locked = await conn.scalar(text("SELECT pg_try_advisory_lock(:id)"), {"id": LEADER_LOCK_ID})
+                    await conn.commit()
+                except BaseException:
+                    await conn.close()
+                    raise
+                if not locked:
+                    await conn.close()
+                    return False
+                self._leader_conn = conn
+                logger.info("Job runner is the leader; scheduled jobs run on this worker")
+                return True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.metrics.failures += 1
+                job.metrics.last_error = f"{type(e).__name__}: {e}"
+                logger.error("Job %s leader election failed — %s", job.name, job.metrics.last_error)
+                return False
+
+    async def _resign(self) -> None:
+        conn, self._leader_conn = self._leader_conn, None
+        if conn is None:
+            return
+        try:
+            # Session locks survive a return to the pool, so unlock explicitly.
+            await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": LEADER_LOCK_ID})
+            await conn.commit()
+            await conn.close()
+        except Exception:
+            # Connection is broken; discard it rather than pool it (its lock died with the session).
+            await conn.invalidate()
+            await conn.close()
+
+    async def _run(self, job: Job) -> Optional[int]:
+        if not self.use_advisory_locks:
+            return await self._execute(job)
+
+        engine = get_engine()
+        if engine.dialect.name != "postgresql":
+            return await self._execute(job)
+
+        try:
+            async with engine.connect() as conn:
+                locked = await conn.scalar(text("SELECT pg_try_advisory_lock(:id)"), {"id": job.lock_id})
+                if not locked:
+                    job.metrics.skipped_locked += 1
+                    logger.debug("Job %s skipped — running on another worker", job.name)
+                    return None
+                try:
+                    return await self._execute(job)
+                finally:
+                    await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": job.lock_id})
+                    await conn.commit()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Lock connection failed (e.g. DB unreachable); count it and retry next interval.
+            job.metrics.failures += 1
+            job.metrics.last_error = f"{type(e).__name__}: {e}"
+            logger.error("Job %s lock handling failed — %s", job.name, job.metrics.last_error)
+            return None
+
+    async def _execute(self, job: Job) -> Optional[int]:
+        metrics = job.metrics
+        metrics.last_started_at = datetime.utcnow()
+        start = time.perf_counter()
+        try:
+            result = await job.func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            metrics.failures += 1
+            metrics.last_error = f"{type(e).__name__}: {e}"
+            logger.exception("Job %s failed", job.name)
+            return None
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            metrics.runs += 1
+            metrics.last_duration_ms = duration_ms
+            metrics.total_duration_ms += duration_ms
+
+        metrics.last_result = result
+        metrics.last_error = None
+        logger.info("Job %s finished: result=%s duration_ms=%.2f", job.name, result, metrics.last_duration_ms)
+        return result
+
+
+# ---------------------------------------------------------------------------
+# Application singleton
+# ---------------------------------------------------------------------------
+
+_runner: Optional[JobRunner] = None
+
+
+def register_default_jobs(runner: JobRunner) -> None:
+    runner.add_job("cleanup_expired_otps", tasks.cleanup_expired_otps, interval_seconds=30 * 60, jitter_seconds=60)
+    runner.add_job("purge_oauth_states", tasks.purge_expired_oauth_states, interval_seconds=5 * 60, jitter_seconds=30)
+    runner.add_job("purge_rate_limit_counters", tasks.purge_expired_rate_limits, interval_seconds=10 * 60, jitter_seconds=60)
+    runner.add_job("premoderate_backlog", tasks.premoderate_backlog, interval_seconds=5 * 60, jitter_seconds=30)
+
+
+def get_job_runner() -> JobRunner:
+    global _runner
+    if _runner is None:
+        _runner = JobRunner()
+        register_default_jobs(_runner)
+    return _runner
+
+
+async def start_job_runner() -> None:
+    if not settings.JOBS_ENABLED:
+        logger.info("Background jobs disabled (JOBS_ENABLED=false)")
+        return
+    await get_job_runner().start()
+
 
-def setup_scheduler():
-    """
-    Initialize the background scheduler for periodic maintenance tasks.
-    This is optional and only required if APScheduler is installed.
-    """
-    try:
-        from apscheduler.schedulers.background import BackgroundScheduler
-        
-        scheduler = BackgroundScheduler()
-        
-        # Schedule OTP cleanup every 30 minutes
-        scheduler.add_job(
-            cleanup_expired_otps,
-            "interval",
-            minutes=30,
-            id="cleanup_expired_otps",
-            name="Clean up expired OTP records",
-            replace_existing=True,
-        )
-        
-        if not scheduler.running:
-            scheduler.start()
-            logger.info("Background scheduler started")
-        
-        return scheduler
-        
-    except ImportError:
-        logger.warning("APScheduler not installed; skipping scheduled tasks. Install with: pip install apscheduler")
-        return None
-    except Exception as e:
-        logger.error(f"Failed to setup scheduler: {e}")
-        return None
+async def stop_job_runner() -> None:
+    if _runner is not None:
+        await _runner.stop()
@@ -0,0 +1,329 @@
+"""
+Slow-statement log: every SQL statement slower than SLOW_QUERY_MS is
+recorded with its route, request id, parameter shape, duration and an
+EXPLAIN plan, so a slow request can be traced to the statement behind it.
+
+  - SQL comments (sqlcommenter format): statements run while serving a
+    request carry /*route='...'*/, so they can be matched up in
+    pg_stat_activity and the Postgres logs too. The request id goes in as
+    well only with SQL_COMMENT_REQUEST_ID, because it makes every statement
+    text unique and so defeats asyncpg's prepared-statement cache.
+  - Detection happens in the cursor events, adding one perf_counter pair
+    to each statement; only slow statements do any more work.
+  - Slow statements are grouped by fingerprint: the SQL without comments,
+    whitespace normalised and expanded IN lists collapsed, so
+    `IN ($1, $2)` and `IN ($1, $2, $3)` count as the same statement.
+  - The plan is captured off the request path: a background worker runs
+    EXPLAIN (ANALYZE false), which plans the statement without executing
+    it, on its own connection to the engine the statement ran on (primary
+    or replica) with a statement timeout, at most once per fingerprint
+    every PLAN_REFRESH_SECONDS.
+  - Each slow statement becomes one JSON line in logs/slow_queries.log
+    (size-rotated). Parameter values are never written, only their types.
+  - GET /admin/slow-queries lists the top-N fingerprints of this worker.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from typing import Any, Literal, Optional
+from urllib.parse import quote
+
+from sqlalchemy import event
+
+from app.core import query_stats
+from app.core.config import settings
+from app.core.logger import LOG_DIR, get_logger, queue_handler
+
+logger = get_logger(__name__)
+
+SLOW_QUERY_LOG_FILE = LOG_DIR / "slow_queries.log"
+MAX_FINGERPRINTS = 500
+PLAN_REFRESH_SECONDS = 600.0
+EXPLAIN_TIMEOUT_MS = 5000
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_IN_LIST = re.compile(r"\(\s*\$\d+(?:\s*,\s*\$\d+)+\s*\)")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "VALUES")
+
+SortBy = Literal["total", "max", "avg", "count"]
+
+
+@lru_cache(maxsize=1024)
+def sql_comment(**tags: Optional[str]) -> str:
+    """sqlcommenter comment: sorted key='url-encoded value' pairs."""
+    pairs = [f"{key}='{quote(value, safe='')}'" for key, value in sorted(tags.items()) if value]
+    return f"/*{','.join(pairs)}*/" if pairs else ""
+
+
+def normalize_statement(statement: str) -> str:
+    text = " ".join(_COMMENT.sub(" ", statement).split())
+    return _IN_LIST.sub("($n, ...)", text)
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.blake2b(normalize_statement(statement).encode(), digest_size=8).hexdigest()
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def params_shape(parameters: Any, executemany: bool = False) -> str:
+    """Parameter types without their values, e.g. "(UUID, str, int)"."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {params_shape(rows[0])}" if rows else "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {_type_name(value)}" for key, value in parameters.items()) + "}"
+    return "(" + ", ".join(_type_name(value) for value in parameters or ()) + ")"
+
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    statement: str
+    parameters: Any            # kept in memory for EXPLAIN only, never written out
+    executemany: bool
+    duration_ms: float
+    route: Optional[str]
+    request_id: Optional[str]
+    engine: Any = None         # AsyncEngine it ran on; EXPLAIN runs there too (primary vs replica)
+    at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class SlowQueryStat:
+    fingerprint: str
+    statement: str             # normalised
+    params: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_seen: Optional[datetime] = None
+    route: Optional[str] = None
+    request_id: Optional[str] = None
+    plan: Optional[str] = None
+    plan_captured_at: float = 0.0  # monotonic
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / max(self.count, 1)
+
+
+class SlowQueryLog:
+    """Per-process slow statement aggregate + background EXPLAIN/file writer."""
+
+    def __init__(self, threshold_ms: float, explain: bool = True, queue_size: int = 200):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.stats: dict[str, SlowQueryStat] = {}
+        self.dropped = 0
+        self._queue: asyncio.Queue[SlowQuery] = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._file_logger: Optional[logging.Logger] = None
+
+    # ------------------------------------------------------------------
+    # Engine hooks
+    # ------------------------------------------------------------------
+
+    def instrument_engine(self, engine) -> None:
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info["slow_query_start"] = time.perf_counter()
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            start = conn.info.pop("slow_query_start", None)
+            if start is None:
+                return
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= self.threshold_ms and context.execution_options.get("slow_query_log", True):
+                stats = query_stats.current()
+                self.record(SlowQuery(
+                    fingerprint=fingerprint(statement),
+                    statement=statement,
+                    parameters=parameters,
+                    executemany=executemany,
+                    duration_ms=duration_ms,
+                    route=stats.route if stats else None,
+                    request_id=stats.request_id if stats else None,
+                    engine=engine,
+                ))
+
+    def record(self, query: SlowQuery) -> None:
+        stat = self.stats.get(query.fingerprint)
+        if stat is None:
+            if len(self.stats) >= MAX_FINGERPRINTS:
+                del self.stats[min(self.stats.values(), key=lambda s: s.total_ms).fingerprint]
+            stat = self.stats[query.fingerprint] = SlowQueryStat(
+                fingerprint=query.fingerprint,
+                statement=normalize_statement(query.statement),
+                params=params_shape(query.parameters, query.executemany),
+            )
+        stat.count += 1
+        stat.total_ms += query.duration_ms
+        stat.max_ms = max(stat.max_ms, query.duration_ms)
+        stat.last_seen = query.at
+        stat.route, stat.request_id = query.route, query.request_id
+
+        logger.warning(
+            "Slow query: fingerprint=%s duration_ms=%.2f route=%s request_id=%s",
+            query.fingerprint,
+            query.duration_ms,
+            query.route,
+            query.request_id,
+        )
+        if self._task is None:
+            return
+        try:
+            self._queue.put_nowait(query)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def top(self, limit: int = 20, sort_by: SortBy = "total") -> list[SlowQueryStat]:
+        key = {
+            "total": lambda s: s.total_ms,
+            "max": lambda s: s.max_ms,
+            "avg": lambda s: s.avg_ms,
+            "count": lambda s: s.count,
+        }[sort_by]
+        return sorted(self.stats.values(), key=key, reverse=True)[:limit]
+
+    # ------------------------------------------------------------------
+    # Background worker
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        LOG_DIR.mkdir(exist_ok=True)
+        handler = RotatingFileHandler(
+            SLOW_QUERY_LOG_FILE,
+            maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._file_logger = logging.getLogger("app.slow_queries.file")
+        self._file_logger.propagate = False
+        self._file_logger.setLevel(logging.INFO)
+        if not self._file_logger.handlers:
+            self._file_logger.addHandler(queue_handler(handler))  # written off the event loop
+        self._task = asyncio.create_task(self._worker(), name="slow-query-log")
+        logger.info("Slow query log started: threshold_ms=%s explain=%s", self.threshold_ms, self.explain)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _worker(self) -> None:
+        while True:
+            query = await self._queue.get()
+            try:
+                plan = await self._plan_for(query)
+                self._write(query, plan)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Slow query log failed for fingerprint %s", query.fingerprint)
+            finally:
+                self._queue.task_done()
+
+    async def _plan_for(self, query: SlowQuery) -> Optional[str]:
+        stat = self.stats.get(query.fingerprint)
+        if stat is not None and stat.plan and time.monotonic() - stat.plan_captured_at < PLAN_REFRESH_SECONDS:
+            return stat.plan
+        if (
+            not self.explain
+            or query.engine is None
+            or query.executemany
+            or not normalize_statement(query.statement).upper().startswith(_EXPLAINABLE)
+        ):
+            return None
+        try:
+            async with query.engine.connect() as conn:
+                conn = await conn.execution_options(slow_query_log=False)
+                await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE false) {query.statement}",
+                    query.parameters if query.parameters else (),
+                )
+                plan = "\n".join(row[0] for row in result)
+                await conn.rollback()
+        except Exception as exc:
+            logger.debug("EXPLAIN failed for fingerprint %s: %s", query.fingerprint, exc)
+            return None
+        if stat is not None:
+            stat.plan, stat.plan_captured_at = plan, time.monotonic()
+        return plan
+
+    def _write(self, query: SlowQuery, plan: Optional[str]) -> None:
+        self._file_logger.info(json.dumps({
+            "at": query.at.isoformat(),
+            "fingerprint": query.fingerprint,
+            "duration_ms": round(query.duration_ms, 2),
+            "route": query.route,
+            "request_id": query.request_id,
+            "params": params_shape(query.parameters, query.executemany),
+            "statement": query.statement,
+            "plan": plan,
+        }))
+
+
+# ---------------------------------------------------------------------------
+# Application singleton
+# ---------------------------------------------------------------------------
+
+_log: Optional[SlowQueryLog] = None
+
+
+def get_slow_query_log() -> Optional[SlowQueryLog]:
+    """The process-wide slow query log, or None when SLOW_QUERY_MS is 0."""
+    global _log
+    if _log is None and settings.SLOW_QUERY_MS > 0:
+        _log = SlowQueryLog(settings.SLOW_QUERY_MS, explain=settings.SLOW_QUERY_EXPLAIN)
+    return _log
+
+
+def instrument_engine(engine) -> None:
+    if settings.SQL_COMMENTS:
+        @event.listens_for(engine.sync_engine, "before_cursor_execute", retval=True)
+        def _comment(conn, cursor, statement, parameters, context, executemany):
+            stats = query_stats.current()
+            if stats is not None:
+                comment = sql_comment(
+                    route=stats.route,
+                    request_id=stats.request_id if settings.SQL_COMMENT_REQUEST_ID else None,
+                )
+                if comment:
+                    statement = f"{statement} {comment}"
+            return statement, parameters
+
+    slow_log = get_slow_query_log()
+    if slow_log is not None:
+        slow_log.instrument_engine(engine)
+
+
+async def start_slow_query_log() -> None:
+    slow_log = get_slow_query_log()
+    if slow_log is not None:
+        await slow_log.start()
+
+
+async def stop_slow_query_log() -> None:
+    if _log is not None:
+        await _log.stop()
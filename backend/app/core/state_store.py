@@ -0,0 +1,96 @@
+"""
+PKCE / OAuth state stores.
+
+/login stores (state → code_verifier) for a few minutes; /callback consumes it
+exactly once. Two backends, selected by OAUTH_STATE_BACKEND:
+
+  memory — dict + min-heap on expiry. put/pop are O(log n); purging only
+           touches entries that have actually expired instead of scanning the
+           whole dict. Only correct with a single worker process.
+  db     — `oauth_states` table shared by every worker. pop is a single
+           DELETE … RETURNING on the primary key; expired rows are purged in
+           bounded batches by the purge_oauth_states job.
+"""
+
+import heapq
+import time
+from typing import Optional, Protocol
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app import crud
+
+STATE_TTL_SECONDS = 300
+
+
+class StateStore(Protocol):
+    async def put(self, state: str, code_verifier: str, ttl_seconds: int = STATE_TTL_SECONDS) -> None: ...
+
+    async def pop(self, state: str) -> Optional[str]:
+        """Consume a state; return its code_verifier, or None if unknown/expired."""
+        ...
+
+
+class InMemoryStateStore:
+    """Single-process store with heap-indexed expiry."""
+
+    def __init__(self):
+        self._entries: dict[str, tuple[str, float]] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def put(self, state: str, code_verifier: str, ttl_seconds: int = STATE_TTL_SECONDS) -> None:
+        now = time.monotonic()
+        self._purge(now)
+        expires_at = now + ttl_seconds
+        self._entries[state] = (code_verifier, expires_at)
+        heapq.heappush(self._expiry_heap, (expires_at, state))
+
+    async def pop(self, state: str) -> Optional[str]:
+        # Consumed entries stay in the heap until their expiry comes up;
+        # _purge skips them because they are no longer in _entries.
+        entry = self._entries.pop(state, None)
+        if entry is None:
+            return None
+        code_verifier, expires_at = entry
+        if expires_at < time.monotonic():
+            return None
+        return code_verifier
+
+    def _purge(self, now: float) -> None:
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, state = heapq.heappop(heap)
+            entry = self._entries.get(state)
+            if entry is not None and entry[1] == expires_at:
+                del self._entries[state]
+
+
+class DatabaseStateStore:
+    """Cross-process store backed by the `oauth_states` table."""
+
+    async def put(self, state: str, code_verifier: str, ttl_seconds: int = STATE_TTL_SECONDS) -> None:
+        async with AsyncSessionLocal() as db:
+            await crud.oauth_states.create(db, state, code_verifier, ttl_seconds)
+            await db.commit()
+
+    async def pop(self, state: str) -> Optional[str]:
+        async with AsyncSessionLocal() as db:
+            code_verifier = await crud.oauth_states.pop_valid(db, state)
+            await db.commit()
+        return code_verifier
+
+
+_store: Optional[StateStore] = None
+
+
+def get_state_store() -> StateStore:
+    global _store
+    if _store is None:
+        if settings.OAUTH_STATE_BACKEND == "db":
+            _store = DatabaseStateStore()
+        else:
+            _store = InMemoryStateStore()
+    return _store
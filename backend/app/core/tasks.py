@@ -1,32 +1,59 @@
 """
-Background tasks and scheduled jobs.
+Background maintenance jobs, scheduled by app.core.scheduler.
+
+Deletes run in capped batches, each in its own short transaction, so a large
+backlog never holds locks on the table for long or loads rows into memory.
 """
 
-import asyncio
 from app.db.base import AsyncSessionLocal
 from app.core.logger import get_logger
 from app import crud
 
 logger = get_logger(__name__)
 
+CLEANUP_BATCH_SIZE = 1000
+CLEANUP_MAX_BATCHES = 100  # at most 100k rows per run; the rest waits for the next run
+PREMOD_BACKLOG_BATCH_SIZE = 500
+
+
+async def _delete_in_batches(delete_batch, label: str) -> int:
+    total = 0
+    for _ in range(CLEANUP_MAX_BATCHES):
+        async with AsyncSessionLocal() as db:
+            try:
+                count = await delete_batch(db, limit=CLEANUP_BATCH_SIZE)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        total += count
+        if count < CLEANUP_BATCH_SIZE:
+            break
+    if total > 0:
+        logger.info(f"Cleaned up {total} expired {label} records")
+    return total
+
 
 async def cleanup_expired_otps() -> int:
     """Clean up expired OTP records from the database."""
+    return await _delete_in_batches(crud.otps.cleanup_expired, "OTP")
+
+
+async def purge_expired_oauth_states() -> int:
+    return await _delete_in_batches(crud.oauth_states.purge_expired, "OAuth state")
+
+
+async def purge_expired_rate_limits() -> int:
+    return await _delete_in_batches(crud.rate_limits.purge_expired, "rate limit counter")
+
+
+async def premoderate_backlog() -> int:
+    """Queue pending reviews that pre-moderation never scored (queue full, restart)."""
+    from app.core.premoderation import get_premoderation
+
+    pipeline = get_premoderation()
+    if pipeline is None or not pipeline.running:
+        return 0
     async with AsyncSessionLocal() as db:
-        try:
-            count = await crud.otps.cleanup_expired(db)
-            await db.commit()
-            if count > 0:
-                logger.info(f"Cleaned up {count} expired OTP records")
-            return count
-        except Exception as e:
-            await db.rollback()
-            logger.error(f"Failed to cleanup expired OTPs: {e}")
-            return 0
-
-
-async def run_periodically(interval_seconds: int):
-    """Run OTP cleanup on a schedule while the app is alive."""
-    while True:
-        await cleanup_expired_otps()
-        await asyncio.sleep(interval_seconds)
\ No newline at end of file
+        backlog = await crud.reviews.get_unscored_pending_ids(db, limit=PREMOD_BACKLOG_BATCH_SIZE)
+    return sum(pipeline.enqueue(review_id, version) for review_id, version in backlog)
@@ -0,0 +1,131 @@
+"""
+Anonymous username allocation.
+
+Usernames are AdjectiveNoun#### drawn from the word lists in
+app.models.student (47 × 52 × 10,000 ≈ 24M names). Instead of one SELECT per
+random guess, the allocator:
+
+  1. draws a batch of distinct candidates, skipping any that the process-local
+     Bloom filter already knows are taken,
+  2. checks the whole batch with a single `WHERE username IN (...)` query,
+  3. records every taken name it saw in the filter and returns the free ones.
+
+The filter only ever learns names that really exist (collisions seen and names
+handed out), so a false positive merely skips a free candidate — it can never
+cause a duplicate. The unique index on students.username stays the source of
+truth for races between workers; see crud.students.create.
+
+The batch size grows with the observed collision rate, so a nearly full name
+space still resolves in one round trip; only if a whole batch is taken does the
+allocator fall back to a random hex suffix.
+"""
+
+import hashlib
+import math
+import random
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.student import Student, _ADJECTIVES, _NOUNS
+
+NAME_SPACE = len(_ADJECTIVES) * len(_NOUNS) * 10_000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (blake2b, double hashing)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def random_username() -> str:
+    adjective = random.choice(_ADJECTIVES).capitalize()
+    noun = random.choice(_NOUNS).capitalize()
+    return f"{adjective}{noun}{random.randint(0, 9999)}"
+
+
+class UsernameAllocator:
+    MIN_BATCH = 8
+    MAX_BATCH = 256
+
+    def __init__(self, filter_capacity: int = 2_000_000):
+        self.taken = BloomFilter(filter_capacity)
+        self.queries = 0
+        self.collisions = 0
+        self.allocated = 0
+
+    def batch_size(self) -> int:
+        """Candidates per query, sized so P(whole batch taken) stays below ~1e-6."""
+        # Use the larger of the observed collision rate and what the filter has learned.
+        seen = self.collisions + self.allocated
+        rate = max(self.collisions / seen if seen else 0.0, self.taken.count / NAME_SPACE)
+        if rate <= 0.0:
+            return self.MIN_BATCH
+        if rate >= 0.999:
+            return self.MAX_BATCH
+        needed = math.ceil(math.log(1e-6) / math.log(rate))
+        return max(self.MIN_BATCH, min(self.MAX_BATCH, needed))
+
+    def _candidates(self, count: int) -> list[str]:
+        candidates: dict[str, None] = {}
+        # Bounded so a saturated filter can't spin forever.
+        for _ in range(count * 8):
+            if len(candidates) == count:
+                break
+            name = random_username()
+            if name not in self.taken:
+                candidates[name] = None
+        return list(candidates)
+
+    async def allocate(self, db: AsyncSession) -> list[str]:
+        """Return free usernames in preference order (one query). Never empty."""
+        candidates = self._candidates(self.batch_size())
+        taken: set[str] = set()
+        if candidates:
+            result = await db.execute(select(Student.username).where(Student.username.in_(candidates)))
+            taken = set(result.scalars().all())
+            self.queries += 1
+        for name in taken:
+            self.mark_taken(name)
+        self.collisions += len(taken)
+
+        free = [name for name in candidates if name not in taken]
+        if not free:
+            free = [f"{random_username()}-{random.getrandbits(32):08x}"]
+        return free
+
+    def mark_taken(self, username: str) -> None:
+        self.taken.add(username)
+
+    def mark_allocated(self, username: str) -> None:
+        self.allocated += 1
+        self.taken.add(username)
+
+
+_allocator: Optional[UsernameAllocator] = None
+
+
+def get_username_allocator() -> UsernameAllocator:
+    global _allocator
+    if _allocator is None:
+        _allocator = UsernameAllocator()
+    return _allocator
@@ -21,7 +21,13 @@ from app.crud import (
     reviews,
     review_interactions,
     violations,
+    violation_groups,
     roles,
+    oauth_states,
+    rate_limits,
+    dashboard,
+    blocked_terms,
+    review_fingerprints,
 )
 
 __all__ = [
@@ -35,5 +41,11 @@ __all__ = [
     "reviews",
     "review_interactions",
     "violations",
+    "violation_groups",
     "roles",
+    "oauth_states",
+    "rate_limits",
+    "dashboard",
+    "blocked_terms",
+    "review_fingerprints",
 ]
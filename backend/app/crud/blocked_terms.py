@@ -0,0 +1,43 @@
+"""
+CRUD operations for BlockedTerm model.
+"""
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.blocked_term import BlockedTerm
+
+BlockedTermCategory = Literal["hate_speech", "harassment", "spam", "other"]
+
+
+async def get_all(db: AsyncSession) -> list[BlockedTerm]:
+    result = await db.execute(select(BlockedTerm).order_by(BlockedTerm.term))
+    return list(result.scalars().all())
+
+
+async def get_signature(db: AsyncSession) -> tuple[int, Optional[datetime]]:
+    """(count, latest update): changes whenever a term is added, re-categorised or removed."""
+    result = await db.execute(select(func.count(), func.max(BlockedTerm.updated_at)))
+    count, latest = result.one()
+    return count, latest
+
+
+async def upsert(db: AsyncSession, term: str, category: BlockedTermCategory) -> BlockedTerm:
+    """Add `term` (already normalised) or change its category."""
+    now = datetime.utcnow()
+    stmt = insert(BlockedTerm).values(term=term, category=category, created_at=now, updated_at=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BlockedTerm.term],
+        set_={"category": stmt.excluded.category, "updated_at": now},
+    ).returning(BlockedTerm)
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    return result.scalar_one()
+
+
+async def remove(db: AsyncSession, term: str) -> bool:
+    result = await db.execute(delete(BlockedTerm).where(BlockedTerm.term == term))
+    return result.rowcount > 0
@@ -0,0 +1,197 @@
+"""
+CRUD operations for the admin dashboard rollups.
+
+`dashboard_counters` holds running totals keyed by name:
+    reviews.<status>                 pending / approved / rejected
+    violations.<status>.<severity>   e.g. violations.open.high
+    users.<status>                   active / suspended / inactive
+`dashboard_daily` holds one row of activity counts per UTC day.
+
+The review, violation and user CRUD write paths call bump()/bump_daily()
+in the same transaction as their change, so the rollups commit or roll back
+with it. Deletes that cascade (review → violations, user → student →
+reviews) go through forget_reviews() first. Reading the dashboard is a
+primary-key scan of a few dozen counter rows plus N daily rows, whatever
+the size of the base tables.
+
+rebuild() recomputes everything from the base tables, for backfills and
+repair (scripts/rebuild_dashboard.py).
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.dashboard import DashboardCounter, DashboardDaily
+from app.models.review import Review
+from app.models.violation import Violation
+
+DAILY_COLUMNS = (
+    "reviews_submitted",
+    "reviews_approved",
+    "reviews_rejected",
+    "violations_reported",
+    "users_created",
+    "active_users",
+)
+
+
+def review_key(status: str) -> str:
+    return f"reviews.{status}"
+
+
+def violation_key(status: str, severity: str) -> str:
+    return f"violations.{status}.{severity}"
+
+
+def user_key(status: str) -> str:
+    return f"users.{status}"
+
+
+def today() -> date:
+    return datetime.utcnow().date()
+
+
+def moves(changes: Iterable[tuple[str, str]]) -> dict[str, int]:
+    """Counter deltas for rows moving between keys, given (old key, new key) pairs."""
+    deltas: dict[str, int] = {}
+    for old_key, new_key in changes:
+        if old_key != new_key:
+            deltas[old_key] = deltas.get(old_key, 0) - 1
+            deltas[new_key] = deltas.get(new_key, 0) + 1
+    return deltas
+
+
+# ---------------------------------------------------------------------------
+# Maintenance (called from the CRUD write paths)
+# ---------------------------------------------------------------------------
+
+async def bump(db: AsyncSession, deltas: dict[str, int]) -> None:
+    """Add `deltas` to the named counters in one upsert."""
+    rows = [{"name": name, "value": delta} for name, delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+    # Sorted keys keep the row-lock order stable across concurrent writers.
+    stmt = pg_insert(DashboardCounter).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DashboardCounter.name],
+            set_={"value": DashboardCounter.value + stmt.excluded.value},
+        )
+    )
+
+
+async def bump_daily(db: AsyncSession, day: date, **deltas: int) -> None:
+    """Add `deltas` (DAILY_COLUMNS) to the row for `day`."""
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    stmt = pg_insert(DashboardDaily).values(day=day, **deltas)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DashboardDaily.day],
+            set_={column: getattr(DashboardDaily, column) + stmt.excluded[column] for column in deltas},
+        )
+    )
+
+
+async def forget_reviews(db: AsyncSession, *conditions) -> None:
+    """
+    Take reviews matching `conditions` (and their violations) out of the
+    counters. Call before a delete that removes them, directly or by cascade.
+    """
+    deltas: dict[str, int] = {}
+    result = await db.execute(
+        select(Review.status, func.count()).where(*conditions).group_by(Review.status)
+    )
+    for status, count in result.all():
+        deltas[review_key(status)] = -count
+
+    result = await db.execute(
+        select(Violation.status, Violation.severity, func.count())
+        .join(Review, Review.id == Violation.review_id)
+        .where(*conditions)
+        .group_by(Violation.status, Violation.severity)
+    )
+    for status, severity, count in result.all():
+        deltas[violation_key(status, severity)] = -count
+
+    await bump(db, deltas)
+
+
+_REBUILD_SQL = [
+    text("LOCK TABLE dashboard_counters, dashboard_daily IN SHARE ROW EXCLUSIVE MODE"),
+    text("DELETE FROM dashboard_counters"),
+    text("""
+INSERT INTO dashboard_counters (name, value)
+SELECT 'reviews.' || status, count(*) FROM reviews GROUP BY status
+UNION ALL
+SELECT 'violations.' || status || '.' || severity, count(*) FROM violations GROUP BY status, severity
+UNION ALL
+SELECT 'users.' || status, count(*) FROM users GROUP BY status
+"""),
+    text("DELETE FROM dashboard_daily"),
+    text("""
+INSERT INTO dashboard_daily (
+    day, reviews_submitted, reviews_approved, reviews_rejected,
+    violations_reported, users_created, active_users
+)
+SELECT day, sum(rs), sum(ra), sum(rr), sum(vr), sum(uc), sum(au)
+FROM (
+    SELECT CAST(created_at AS date) AS day, 1 AS rs, 0 AS ra, 0 AS rr, 0 AS vr, 0 AS uc, 0 AS au FROM reviews
+    UNION ALL
+    SELECT CAST(updated_at AS date), 0, CAST(status = 'approved' AS int), CAST(status = 'rejected' AS int), 0, 0, 0
+    FROM reviews WHERE status IN ('approved', 'rejected')
+    UNION ALL
+    SELECT CAST(created_at AS date), 0, 0, 0, 1, 0, 0 FROM violations
+    UNION ALL
+    SELECT CAST(created_at AS date), 0, 0, 0, 0, 1, 0 FROM users
+    UNION ALL
+    SELECT CAST(last_login AS date), 0, 0, 0, 0, 0, 1 FROM users WHERE last_login IS NOT NULL
+) activity
+GROUP BY day
+"""),
+]
+
+
+async def rebuild(db: AsyncSession) -> None:
+    """
+    Recompute every counter and daily row from the base tables.
+
+    The lock makes concurrent bump()s wait until this commits, so a write is
+    either counted by the rebuild or applied on top of it, never both.
+    Moderation and sign-in history isn't stored, so rebuilt days attribute
+    approvals/rejections to the review's updated_at and active users to
+    their latest login only.
+    """
+    for statement in _REBUILD_SQL:
+        await db.execute(statement)
+
+
+# ---------------------------------------------------------------------------
+# Dashboard
+# ---------------------------------------------------------------------------
+
+async def get_counters(db: AsyncSession) -> dict[str, int]:
+    result = await db.execute(select(DashboardCounter.name, DashboardCounter.value))
+    return dict(result.all())
+
+
+async def get_daily(db: AsyncSession, days: int) -> list[dict]:
+    """The last `days` UTC days, oldest first, with empty days zero-filled."""
+    end = today()
+    start = end - timedelta(days=days - 1)
+    result = await db.execute(
+        select(DashboardDaily).where(DashboardDaily.day >= start).order_by(DashboardDaily.day)
+    )
+    by_day = {row.day: row for row in result.scalars().all()}
+
+    series = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = by_day.get(day)
+        series.append({"day": day, **{column: getattr(row, column) if row else 0 for column in DAILY_COLUMNS}})
+    return series
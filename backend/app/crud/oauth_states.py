@@ -0,0 +1,51 @@
+"""
+CRUD operations for OAuthState model.
+Every operation is a single statement so concurrent workers never race.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.oauth_state import OAuthState
+
+
+async def create(db: AsyncSession, state: str, code_verifier: str, ttl_seconds: int) -> OAuthState:
+    entry = OAuthState(
+        state=state,
+        code_verifier=code_verifier,
+        expires_at=datetime.utcnow() + timedelta(seconds=ttl_seconds),
+    )
+    db.add(entry)
+    await db.flush()
+    return entry
+
+
+async def pop_valid(db: AsyncSession, state: str) -> Optional[str]:
+    """
+    Atomically consume a state. Returns its code_verifier, or None if the state
+    is unknown, already used, or expired. DELETE … RETURNING guarantees a state
+    can be redeemed at most once even if two callbacks race.
+    """
+    result = await db.execute(
+        delete(OAuthState)
+        .where(OAuthState.state == state, OAuthState.expires_at > datetime.utcnow())
+        .returning(OAuthState.code_verifier)
+    )
+    return result.scalar_one_or_none()
+
+
+async def purge_expired(db: AsyncSession, limit: int = 1000) -> int:
+    """Delete up to `limit` expired states via the expires_at index. Returns count deleted."""
+    expired = (
+        select(OAuthState.state)
+        .where(OAuthState.expires_at <= datetime.utcnow())
+        .limit(limit)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        delete(OAuthState).where(OAuthState.state.in_(expired)).execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
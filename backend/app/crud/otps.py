@@ -1,6 +1,6 @@
 """
 CRUD operations for OTP model.
-Business logic: generation, verification, rate limiting, cleanup.
+Business logic: generation, verification, cleanup.
 """
 
 import secrets
@@ -8,11 +8,11 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.otp import OTP
-from app.core.encryption import blind_index, hash_otp, verify_otp
+from app.core.encryption import blind_index, blind_indexes, hash_otp, verify_otp
 
 # ---------------------------------------------------------------------------
 # Config
@@ -21,8 +21,7 @@ from app.core.encryption import blind_index, hash_otp, verify_otp
 OTP_LENGTH = 6
 OTP_EXPIRY_MINUTES = 10
 OTP_MAX_ATTEMPTS = 5
-OTP_RATE_LIMIT_COUNT = 5       # max OTPs per email per window
-OTP_RATE_LIMIT_MINUTES = 60
+OTP_RATE_LIMIT_MINUTES = 60     # request limits live in app.core.rate_limit.POLICIES
 
 
 def _generate_code() -> str:
@@ -39,7 +38,7 @@ async def get_latest_for_email(db: AsyncSession, email: str) -> Optional[OTP]:
     result = await db.execute(
         select(OTP)
         .where(
-            OTP.email_index == blind_index(email),
+            OTP.email_index.in_(blind_indexes(email)),
             OTP.expires_at > datetime.utcnow(),
             OTP.verified_at.is_(None),
         )
@@ -57,7 +56,7 @@ async def count_recent_for_email(
     cutoff = datetime.utcnow() - timedelta(minutes=minutes)
     result = await db.execute(
         select(func.count(OTP.id)).where(
-            OTP.email_index == blind_index(email),
+            OTP.email_index.in_(blind_indexes(email)),
             OTP.created_at > cutoff,
         )
     )
@@ -131,19 +130,18 @@ async def verify(
     return True, otp, None
 
 
-async def is_rate_limited(db: AsyncSession, email: str) -> bool:
-    """Return True if this email has hit the OTP request rate limit."""
-    count = await count_recent_for_email(db, email)
-    return count >= OTP_RATE_LIMIT_COUNT
-
-
-async def cleanup_expired(db: AsyncSession) -> int:
-    """Delete all expired OTP records. Returns count deleted."""
+async def cleanup_expired(db: AsyncSession, limit: int = 1000) -> int:
+    """
+    Delete up to `limit` expired OTP records in one set-based statement
+    (DELETE … WHERE id IN (SELECT … LIMIT n)). Returns count deleted.
+    """
+    expired = (
+        select(OTP.id)
+        .where(OTP.expires_at <= datetime.utcnow())
+        .limit(limit)
+        .scalar_subquery()
+    )
     result = await db.execute(
-        select(OTP).where(OTP.expires_at <= datetime.utcnow())
+        delete(OTP).where(OTP.id.in_(expired)).execution_options(synchronize_session=False)
     )
-    expired = result.scalars().all()
-    for otp in expired:
-        await db.delete(otp)
-    await db.flush()
-    return len(expired)
+    return result.rowcount or 0
@@ -0,0 +1,62 @@
+"""
+CRUD operations for RateLimitCounter model.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.rate_limit import RateLimitCounter
+
+
+async def get_count(db: AsyncSession, key: str, window: int) -> int:
+    result = await db.execute(
+        select(RateLimitCounter.count).where(
+            RateLimitCounter.key == key,
+            RateLimitCounter.window == window,
+        )
+    )
+    return result.scalar_one_or_none() or 0
+
+
+async def increment(
+    db: AsyncSession,
+    key: str,
+    window: int,
+    window_seconds: int,
+    below: int,
+) -> Optional[int]:
+    """
+    Atomically add one hit to (key, window) if its count is still below
+    `below`. Returns the new count, or None if the hit was not counted.
+    """
+    stmt = insert(RateLimitCounter).values(
+        key=key,
+        window=window,
+        count=1,
+        expires_at=datetime.utcfromtimestamp((window + 2) * window_seconds),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RateLimitCounter.key, RateLimitCounter.window],
+        set_={"count": RateLimitCounter.count + 1},
+        where=RateLimitCounter.count < below,
+    ).returning(RateLimitCounter.count)
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+async def purge_expired(db: AsyncSession, limit: int = 5000) -> int:
+    """Delete up to `limit` counters that can no longer affect any window."""
+    expired = (
+        select(RateLimitCounter.key, RateLimitCounter.window)
+        .where(RateLimitCounter.expires_at <= datetime.utcnow())
+        .limit(limit)
+    )
+    result = await db.execute(
+        delete(RateLimitCounter)
+        .where(tuple_(RateLimitCounter.key, RateLimitCounter.window).in_(expired))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
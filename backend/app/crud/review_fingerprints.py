@@ -0,0 +1,143 @@
+"""
+CRUD operations for ReviewFingerprint model: near-duplicate review lookup.
+
+index_review() is called when a review is submitted or edited, in the same
+transaction: it fingerprints the text, finds earlier reviews sharing an LSH
+bucket, confirms them on the signature and stores the new fingerprint.
+Only other students' reviews that weren't rejected count: a student reusing
+their own text, or copying a review moderators already threw out, isn't a
+duplicate of anything visible.
+flag_near_duplicate() then marks the review for a human (risk flag
+"near_duplicate", so pre-moderation won't auto-approve it) and, unless
+disabled, files a system `spam` report.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, delete, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.fingerprint import lsh_buckets, minhash, similarity
+from app.crud import reviews, violations
+from app.models.review import Review
+from app.models.review_fingerprint import ReviewFingerprint
+from app.models.violation import Violation
+
+# Bucket collisions to confirm per lookup; a campaign bigger than this is
+# still caught, it just doesn't list every copy.
+MAX_CANDIDATES = 200
+NEAR_DUPLICATE_FLAG = "near_duplicate"
+
+
+async def find_similar(
+    db: AsyncSession,
+    review_id: uuid.UUID,
+    author_id: uuid.UUID,
+    signature: list[int],
+    buckets: list[int],
+    threshold: float,
+) -> list[tuple[uuid.UUID, float]]:
+    """Other authors' non-rejected reviews with estimated similarity >= threshold, most similar first."""
+    result = await db.execute(
+        select(ReviewFingerprint.review_id, ReviewFingerprint.signature)
+        .join(Review, Review.id == ReviewFingerprint.review_id)
+        .where(
+            ReviewFingerprint.buckets.overlap(literal(buckets, ARRAY(BigInteger))),
+            ReviewFingerprint.review_id != review_id,
+            Review.student_id != author_id,
+            Review.status != "rejected",
+        )
+        .limit(MAX_CANDIDATES)
+    )
+    scored = [(other_id, similarity(signature, other)) for other_id, other in result.all()]
+    return sorted((m for m in scored if m[1] >= threshold), key=lambda m: m[1], reverse=True)
+
+
+async def upsert(db: AsyncSession, review_id: uuid.UUID, signature: list[int], buckets: list[int]) -> None:
+    stmt = insert(ReviewFingerprint).values(
+        review_id=review_id,
+        signature=signature,
+        buckets=buckets,
+        created_at=datetime.utcnow(),
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ReviewFingerprint.review_id],
+            set_={"signature": stmt.excluded.signature, "buckets": stmt.excluded.buckets},
+        )
+    )
+
+
+async def index_review(db: AsyncSession, review: Review, threshold: float) -> list[tuple[uuid.UUID, float]]:
+    """(Re)fingerprint `review` and return its near-duplicates among indexed reviews."""
+    signature = minhash(review.content)
+    if signature is None:
+        # Too short to fingerprint (or edited down to that): drop any stale entry.
+        await db.execute(delete(ReviewFingerprint).where(ReviewFingerprint.review_id == review.id))
+        return []
+    buckets = lsh_buckets(signature)
+    duplicates = await find_similar(db, review.id, review.student_id, signature, buckets, threshold)
+    await upsert(db, review.id, signature, buckets)
+    return duplicates
+
+
+async def flag_near_duplicate(
+    db: AsyncSession,
+    review: Review,
+    duplicates: list[tuple[uuid.UUID, float]],
+    auto_report: bool = True,
+) -> Optional[Violation]:
+    """
+    Hold `review` for a human and, if `auto_report`, file a system spam
+    report (reporter NULL) unless one is already open. Returns the new report.
+    """
+    if review.status == "pending":
+        await reviews.set_risk(db, review, 1.0, [NEAR_DUPLICATE_FLAG])
+    if not auto_report:
+        return None
+
+    existing = await db.execute(
+        select(Violation.id).where(
+            Violation.review_id == review.id,
+            Violation.reported_by_student_id.is_(None),
+            Violation.violation_type == "spam",
+            Violation.status.in_(("open", "in_review")),
+        ).limit(1)
+    )
+    if existing.scalar_one_or_none() is not None:
+        return None
+
+    closest_id, closest = duplicates[0]
+    return await violations.create(
+        db,
+        review_id=review.id,
+        reporter_student_id=None,
+        violation_type="spam",
+        severity="medium",
+        reason=(
+            f"Automatic: near-duplicate of {len(duplicates)} other review(s); "
+            f"closest {closest_id} ({closest:.0%} similar)."
+        ),
+    )
+
+
+async def get_unindexed(
+    db: AsyncSession,
+    after: Optional[tuple[datetime, uuid.UUID]] = None,
+    limit: int = 500,
+) -> list[Review]:
+    """Reviews without a fingerprint, oldest first, keyset-paged on (created_at, id) — for backfills."""
+    query = (
+        select(Review)
+        .outerjoin(ReviewFingerprint, ReviewFingerprint.review_id == Review.id)
+        .where(ReviewFingerprint.review_id.is_(None))
+        .order_by(Review.created_at, Review.id)
+        .limit(limit)
+    )
+    if after is not None:
+        query = query.where(tuple_(Review.created_at, Review.id) > tuple_(*after))
+    result = await db.execute(query)
+    return list(result.scalars().all())
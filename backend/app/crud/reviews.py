@@ -6,10 +6,13 @@ import uuid
 from typing import Optional, Literal
 from datetime import datetime
 
-from sqlalchemy import select, desc, func
+from sqlalchemy import any_, desc, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud import dashboard
 from app.models.review import Review
 from app.models.section import Section
 
@@ -32,10 +35,15 @@ async def get_by_id(
     db: AsyncSession,
     review_id: uuid.UUID,
     load_relations: bool = False,
+    for_update: bool = False,
 ) -> Optional[Review]:
     query = select(Review).where(Review.id == review_id)
     if load_relations:
         query = query.options(*_review_section_options())
+    if for_update:
+        # populate_existing: an instance already in the session is refreshed
+        # from the locked row, not returned with its earlier (unlocked) values.
+        query = query.with_for_update().execution_options(populate_existing=True)
     result = await db.execute(query)
     return result.scalar_one_or_none()
 
@@ -221,6 +229,8 @@ async def create(
     )
     db.add(review)
     await db.flush()
+    await dashboard.bump(db, {dashboard.review_key("pending"): 1})
+    await dashboard.bump_daily(db, dashboard.today(), reviews_submitted=1)
     return review
 
 
@@ -229,24 +239,104 @@ async def update_status(
     review: Review,
     status: ReviewStatus,
 ) -> Review:
+    """Load `review` with for_update=True: the dashboard move uses its status."""
+    previous = review.status
     review.status = status
     review.updated_at = datetime.utcnow()
     await db.flush()
+    if previous != status:
+        await dashboard.bump(db, dashboard.moves([(dashboard.review_key(previous), dashboard.review_key(status))]))
+        await dashboard.bump_daily(db, dashboard.today(), **{f"reviews_{status}": 1})
     return review
 
 
+async def bulk_update_status(
+    db: AsyncSession,
+    review_ids: list[uuid.UUID],
+    status: ReviewStatus,
+) -> tuple[set[uuid.UUID], set[uuid.UUID]]:
+    """
+    Set `status` on many reviews in one `UPDATE … WHERE id = ANY(:ids)`.
+    Rows already in that status are left untouched.
+    Returns (updated ids, existing ids).
+    """
+    # Lock the rows and read their current status first, for the dashboard deltas.
+    result = await db.execute(
+        select(Review.id, Review.status)
+        .where(Review.id == any_(literal(review_ids, ARRAY(UUID(as_uuid=True)))))
+        .with_for_update()
+    )
+    current = dict(result.all())
+    changed = [review_id for review_id, previous in current.items() if previous != status]
+    if changed:
+        await db.execute(
+            update(Review)
+            .where(Review.id == any_(literal(changed, ARRAY(UUID(as_uuid=True)))))
+            .values(status=status, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await dashboard.bump(db, dashboard.moves(
+            (dashboard.review_key(current[review_id]), dashboard.review_key(status)) for review_id in changed
+        ))
+        await dashboard.bump_daily(db, dashboard.today(), **{f"reviews_{status}": len(changed)})
+    return set(changed), set(current)
+
+
+async def set_risk(
+    db: AsyncSession,
+    review: Review,
+    risk_score: float,
+    risk_flags: list[str],
+) -> Review:
+    """
+    Store the pre-moderation assessment (app.core.premoderation).
+
+    A Core UPDATE that sets updated_at to itself, so the model's onupdate
+    doesn't fire: scoring (and the near-duplicate hold) isn't an edit, and
+    updated_at is also the version pre-moderation checks against.
+    """
+    await db.execute(
+        update(Review)
+        .where(Review.id == review.id)
+        .values(risk_score=risk_score, risk_flags=risk_flags, updated_at=Review.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    set_committed_value(review, "risk_score", risk_score)
+    set_committed_value(review, "risk_flags", risk_flags)
+    return review
+
+
+async def get_unscored_pending_ids(db: AsyncSession, limit: int = 500) -> list[tuple[uuid.UUID, datetime]]:
+    """Pending reviews pre-moderation has not scored yet, oldest first, as (id, version)."""
+    result = await db.execute(
+        select(Review.id, Review.updated_at)
+        .where(Review.status == "pending", Review.risk_score.is_(None))
+        .order_by(Review.created_at)
+        .limit(limit)
+    )
+    return [(review_id, version) for review_id, version in result.all()]
+
+
 async def update_content(
     db: AsyncSession,
     review: Review,
     content: str,
     rating: float,
 ) -> Review:
-    """Student editing their own review — goes back to pending for re-approval."""
+    """
+    Student editing their own review — goes back to pending for re-approval.
+    Load `review` with for_update=True: the dashboard move uses its status.
+    """
+    previous = review.status
     review.content = content
     review.rating = rating
     review.status = "pending"
+    review.risk_score = None
+    review.risk_flags = None
     review.updated_at = datetime.utcnow()
     await db.flush()
+    if previous != "pending":
+        await dashboard.bump(db, dashboard.moves([(dashboard.review_key(previous), dashboard.review_key("pending"))]))
     return review
 
 
@@ -275,6 +365,7 @@ async def decrement_dislikes(db: AsyncSession, review: Review) -> Review:
 
 
 async def delete(db: AsyncSession, review: Review) -> None:
+    await dashboard.forget_reviews(db, Review.id == review.id)
     await db.delete(review)
     await db.flush()
 
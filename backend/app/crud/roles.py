@@ -7,7 +7,8 @@ Runtime operations are primarily assigning/revoking roles from users.
 import uuid
 from typing import Optional
 
-from sqlalchemy import select, func
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -110,6 +111,22 @@ async def get_user_roles(db: AsyncSession, user_id: uuid.UUID) -> list[Role]:
     return list(result.scalars().all())
 
 
+async def get_roles_for_users(db: AsyncSession, user_ids: list[uuid.UUID]) -> dict[uuid.UUID, list[str]]:
+    """Role names for many users in one query: {user_id: [role, ...]} (users without roles omitted)."""
+    if not user_ids:
+        return {}
+    result = await db.execute(
+        select(UserRole.user_id, Role.role)
+        .join(Role, Role.id == UserRole.role_id)
+        .where(UserRole.user_id.in_(user_ids))
+        .order_by(UserRole.user_id, Role.role)
+    )
+    roles: dict[uuid.UUID, list[str]] = {}
+    for user_id, role in result.all():
+        roles.setdefault(user_id, []).append(role)
+    return roles
+
+
 async def get_user_permissions(db: AsyncSession, user_id: uuid.UUID) -> list[str]:
     """Return a flat list of permission strings for a user (across all their roles)."""
     result = await db.execute(
@@ -163,6 +180,41 @@ async def revoke_role_from_user(
     return True
 
 
+async def set_roles_for_users(
+    db: AsyncSession,
+    user_ids: list[uuid.UUID],
+    role_names: list[str],
+) -> None:
+    """
+    Make each user's role set exactly `role_names`, set-based: one lookup of
+    the role ids, one DELETE of roles outside the set, one
+    INSERT ... ON CONFLICT DO NOTHING for roles inside it.
+    Raises LookupError if a role name is not configured.
+    """
+    if not user_ids:
+        return
+    result = await db.execute(select(Role.id, Role.role).where(Role.role.in_(role_names)))
+    role_ids = {name: role_id for role_id, name in result.all()}
+    missing = set(role_names) - role_ids.keys()
+    if missing:
+        raise LookupError(f"Role(s) not configured: {', '.join(sorted(missing))}")
+
+    await db.execute(
+        delete(UserRole)
+        .where(UserRole.user_id.in_(user_ids), UserRole.role_id.not_in(role_ids.values()))
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        pg_insert(UserRole)
+        .values([
+            {"id": uuid.uuid4(), "user_id": user_id, "role_id": role_id}
+            for user_id in user_ids
+            for role_id in role_ids.values()
+        ])
+        .on_conflict_do_nothing(index_elements=["user_id", "role_id"])
+    )
+
+
 async def user_has_permission(
     db: AsyncSession,
     user_id: uuid.UUID,
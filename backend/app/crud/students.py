@@ -6,9 +6,21 @@ import uuid
 from typing import Optional
 
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.student import Student, generate_unique_username
+from app.core.usernames import get_username_allocator
+from app.crud import dashboard
+from app.models.review import Review
+from app.models.student import Student
+
+USERNAME_INDEX = "ix_students_username"
+
+
+def _violated_constraint(error: IntegrityError) -> Optional[str]:
+    # asyncpg's exception (with constraint_name) is the cause of the DBAPI adapter's.
+    cause = getattr(error.orig, "__cause__", None)
+    return getattr(cause, "constraint_name", None) or getattr(error.orig, "constraint_name", None)
 
 
 async def get_by_id(db: AsyncSession, student_id: uuid.UUID) -> Optional[Student]:
@@ -33,37 +45,30 @@ async def create(
 ) -> Student:
     """
     Create a student profile for an existing user.
-    Username is auto-generated anonymously.
+    Username is auto-generated anonymously (see app.core.usernames).
     """
-    # generate_unique_username uses a sync session internally;
-    # for async we replicate the uniqueness check here
-    username = await _generate_unique_username(db)
-    student = Student(
-        user_id=user_id,
-        username=username,
-        major=major,
-    )
-    db.add(student)
-    await db.flush()
-    return student
-
-
-async def _generate_unique_username(db: AsyncSession) -> str:
-    """Async-safe unique username generation."""
-    import random
-    import secrets
-    from app.models.student import _ADJECTIVES, _NOUNS
-
-    for _ in range(100):
-        adj = random.choice(_ADJECTIVES).capitalize()
-        noun = random.choice(_NOUNS).capitalize()
-        number = random.randint(0, 9999)
-        username = f"{adj}{noun}{number}"
-        result = await db.execute(select(Student.id).where(Student.username == username))
-        if result.scalar_one_or_none() is None:
-            return username
-
-    return f"User{secrets.token_hex(8)}"
+    allocator = get_username_allocator()
+    candidates = await allocator.allocate(db)
+    for i, username in enumerate(candidates):
+        student = Student(user_id=user_id, username=username, major=major)
+        try:
+            # Savepoint: another worker may claim the same name between our
+            # check and the insert; fall through to the next free candidate.
+            async with db.begin_nested():
+                db.add(student)
+                await db.flush()
+        except IntegrityError as e:
+            # Only a username collision is worth another candidate; anything
+            # else (e.g. an unknown user_id) fails the same way every time.
+            if _violated_constraint(e) != USERNAME_INDEX:
+                raise
+            allocator.mark_taken(username)
+            if i == len(candidates) - 1:
+                raise
+            continue
+        allocator.mark_allocated(username)
+        return student
+    raise RuntimeError("username allocation returned no candidates")
 
 
 async def update_major(db: AsyncSession, student: Student, major: str) -> Student:
@@ -73,5 +78,6 @@ async def update_major(db: AsyncSession, student: Student, major: str) -> Studen
 
 
 async def delete(db: AsyncSession, student: Student) -> None:
+    await dashboard.forget_reviews(db, Review.student_id == student.id)
     await db.delete(student)
     await db.flush()
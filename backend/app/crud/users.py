@@ -6,26 +6,30 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, tuple_, update
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud import dashboard
+from app.models.review import Review
 from app.models.user import User
 from app.models.student import Student
 from app.models.professor import Professor
 from app.models.role import Role, UserRole
-from app.core.encryption import encrypt_field, blind_index
+from app.core.encryption import encrypt_field, blind_indexes
 
 
-async def get_by_id(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
-    result = await db.execute(select(User).where(User.id == user_id))
+async def get_by_id(db: AsyncSession, user_id: uuid.UUID, for_update: bool = False) -> Optional[User]:
+    query = select(User).where(User.id == user_id)
+    if for_update:
+        query = query.with_for_update().execution_options(populate_existing=True)
+    result = await db.execute(query)
     return result.scalar_one_or_none()
 
 
 async def get_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Look up a user by email using the blind index (never the encrypted column)."""
-    idx = blind_index(email)
-    result = await db.execute(select(User).where(User.email_index == idx))
+    result = await db.execute(select(User).where(User.email_index.in_(blind_indexes(email))))
     return result.scalar_one_or_none()
 
 
@@ -33,33 +37,148 @@ async def create(db: AsyncSession, email: str) -> User:
     user = User.make(email=email)
     db.add(user)
     await db.flush()  # get id without committing — caller manages transaction
+    await dashboard.bump(db, {dashboard.user_key(user.status): 1})
+    await dashboard.bump_daily(db, dashboard.today(), users_created=1)
     return user
 
 
 async def update_status(db: AsyncSession, user: User, status: str) -> User:
-    """status: 'active' | 'suspended' | 'inactive'"""
+    """
+    status: 'active' | 'suspended' | 'inactive'. Load `user` with
+    for_update=True: the dashboard move uses its current status.
+    """
+    previous = user.status
     user.status = status
     await db.flush()
+    if previous != status:
+        await dashboard.bump(db, dashboard.moves([(dashboard.user_key(previous), dashboard.user_key(status))]))
     return user
 
 
+async def update_sanctions(
+    db: AsyncSession,
+    user: User,
+    is_blocked: Optional[bool] = None,
+    muted_until: Optional[datetime] = None,
+    unmute: bool = False,
+) -> User:
+    """Block/unblock and mute/unmute. Arguments left as None are unchanged."""
+    if is_blocked is not None:
+        user.is_blocked = is_blocked
+    if muted_until is not None or unmute:
+        user.muted_until = muted_until
+    await db.flush()
+    return user
+
+
+async def get_existing_ids(db: AsyncSession, user_ids: list[uuid.UUID]) -> set[uuid.UUID]:
+    result = await db.execute(select(User.id).where(User.id.in_(user_ids)))
+    return set(result.scalars().all())
+
+
+async def get_statuses(db: AsyncSession, user_ids: list[uuid.UUID]) -> dict[uuid.UUID, str]:
+    if not user_ids:
+        return {}
+    result = await db.execute(select(User.id, User.status).where(User.id.in_(user_ids)))
+    return dict(result.all())
+
+
+async def bulk_update(db: AsyncSession, user_ids: list[uuid.UUID], **values) -> int:
+    """Set the same column values on many users in one UPDATE; returns rows matched."""
+    if not user_ids or not values:
+        return 0
+    if "status" in values:
+        # Lock the rows and read their current status first, for the dashboard deltas.
+        result = await db.execute(
+            select(User.status).where(User.id.in_(user_ids)).order_by(User.id).with_for_update()
+        )
+        await dashboard.bump(db, dashboard.moves(
+            (dashboard.user_key(previous), dashboard.user_key(values["status"])) for previous in result.scalars().all()
+        ))
+    result = await db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(**values)
+        .execution_options(synchronize_session="fetch")
+    )
+    return result.rowcount
+
+
 async def update_last_login(db: AsyncSession, user: User) -> User:
-    user.last_login = datetime.utcnow()
+    now = datetime.utcnow()
+    first_today = user.last_login is None or user.last_login.date() < now.date()
+    user.last_login = now
     await db.flush()
+    if first_today:
+        await dashboard.bump_daily(db, now.date(), active_users=1)
     return user
 
 
 async def delete(db: AsyncSession, user: User) -> None:
+    # Student profile, reviews and their reports go with the user by cascade.
+    await dashboard.forget_reviews(
+        db, Review.student_id.in_(select(Student.id).where(Student.user_id == user.id))
+    )
+    await dashboard.bump(db, {dashboard.user_key(user.status): -1})
     await db.delete(user)
     await db.flush()
 
 
 async def exists_by_email(db: AsyncSession, email: str) -> bool:
-    idx = blind_index(email)
-    result = await db.execute(select(User.id).where(User.email_index == idx))
+    result = await db.execute(select(User.id).where(User.email_index.in_(blind_indexes(email))))
     return result.scalar_one_or_none() is not None
 
 
+def _admin_filters(
+    role: Optional[str],
+    status: Optional[str],
+    search: Optional[str],
+) -> list:
+    """WHERE clauses shared by list_for_admin and count_for_admin (EXISTS, so no join fan-out)."""
+    filters = []
+    if role:
+        filters.append(
+            select(UserRole.id)
+            .join(Role, Role.id == UserRole.role_id)
+            .where(UserRole.user_id == User.id, Role.role == role)
+            .exists()
+        )
+
+    if status:
+        filters.append(User.status == status)
+
+    if search:
+        like = f"%{search.lower()}%"
+        filters.append(
+            or_(
+                select(Student.id)
+                .where(Student.user_id == User.id, func.lower(Student.username).like(like))
+                .exists(),
+                select(Professor.id)
+                .where(
+                    Professor.user_id == User.id,
+                    or_(
+                        func.lower(Professor.first_name).like(like),
+                        func.lower(Professor.last_name).like(like),
+                    ),
+                )
+                .exists(),
+            )
+        )
+    return filters
+
+
+async def get_for_admin(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+    """Single user with student/professor eagerly loaded (for AdminUserOut)."""
+    result = await db.execute(
+        select(User)
+        .options(selectinload(User.student), selectinload(User.professor))
+        .where(User.id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
 async def list_for_admin(
     db: AsyncSession,
     role: Optional[str] = None,
@@ -67,36 +186,37 @@ async def list_for_admin(
     search: Optional[str] = None,
     skip: int = 0,
     limit: int = 50,
+    after: Optional[tuple[datetime, uuid.UUID]] = None,
 ) -> list[User]:
+    """
+    One page of users, newest first, ordered by (created_at, id).
+
+    Pass `after` (the last row's (created_at, id)) for keyset pagination —
+    served by ix_users_created_at_id regardless of depth. `skip` is kept for
+    older clients and costs O(skip).
+    """
     query = (
         select(User)
         .options(selectinload(User.student), selectinload(User.professor))
-        .order_by(User.created_at.desc())
+        .where(*_admin_filters(role, status, search))
+        .order_by(User.created_at.desc(), User.id.desc())
     )
+    if after is not None:
+        query = query.where(tuple_(User.created_at, User.id) < tuple_(*after))
+    elif skip:
+        query = query.offset(skip)
 
-    if role:
-        query = (
-            query.join(UserRole, UserRole.user_id == User.id)
-            .join(Role, Role.id == UserRole.role_id)
-            .where(Role.role == role)
-        )
-
-    if status:
-        query = query.where(User.status == status)
+    result = await db.execute(query.limit(limit))
+    return list(result.scalars().all())
 
-    if search:
-        like = f"%{search.lower()}%"
-        query = (
-            query.outerjoin(Student, Student.user_id == User.id)
-            .outerjoin(Professor, Professor.user_id == User.id)
-            .where(
-                or_(
-                    func.lower(Student.username).like(like),
-                    func.lower(Professor.first_name).like(like),
-                    func.lower(Professor.last_name).like(like),
-                )
-            )
-        )
 
-    result = await db.execute(query.distinct().offset(skip).limit(limit))
-    return list(result.scalars().all())
+async def count_for_admin(
+    db: AsyncSession,
+    role: Optional[str] = None,
+    status: Optional[str] = None,
+    search: Optional[str] = None,
+) -> int:
+    result = await db.execute(
+        select(func.count()).select_from(User).where(*_admin_filters(role, status, search))
+    )
+    return result.scalar_one()
@@ -0,0 +1,258 @@
+"""
+CRUD operations for ViolationGroup — the per-review moderation aggregate.
+
+Every report on a review rolls up into one `violation_groups` row, so a
+review reported 40 times is one triage-queue entry.
+
+Maintenance:
+  - record_report(): new report → one INSERT … ON CONFLICT DO UPDATE that
+    applies the delta (+1 open/total, max severity, type set, timestamps).
+    Row-level upsert semantics make concurrent reports safe.
+  - refresh(): after an admin changes status/severity, re-aggregate just the
+    affected reviews' reports (index on violations.review_id), under a row
+    lock on their groups so it can't race with concurrent deltas.
+  - rebuild(): full recompute, for backfills and repair.
+
+Priority is severity weight × open report count × recency, with recency
+decaying by half every PRIORITY_HALF_LIFE_SECONDS. It is stored in log space:
+
+    priority = ln(2^(rank-1) × open_count) + ln2 × epoch(last_reported_at) / half_life
+
+The "now" term of the decay is the same for every row, so it drops out of
+the ordering and a stored score never goes stale.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import violations
+from app.models.review import Review
+from app.models.student import Student
+from app.models.violation import Violation
+from app.models.violation_group import ViolationGroup
+
+SEVERITY_RANK = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+SEVERITY_BY_RANK = {rank: name for name, rank in SEVERITY_RANK.items()}
+OPEN_STATUSES = ("open", "in_review")
+PRIORITY_HALF_LIFE_SECONDS = 24 * 60 * 60
+
+_RANK_SQL = (
+    "CASE severity WHEN 'low' THEN 1 WHEN 'medium' THEN 2 "
+    "WHEN 'high' THEN 3 WHEN 'critical' THEN 4 ELSE 0 END"
+)
+
+
+def _priority_sql(rank: str, open_count: str, last_reported_at: str) -> str:
+    return (
+        f"CASE WHEN {open_count} > 0 THEN "
+        f"ln(power(2, greatest({rank}, 1) - 1) * {open_count}) "
+        f"+ ln(2) * extract(epoch FROM {last_reported_at}) / {PRIORITY_HALF_LIFE_SECONDS} END"
+    )
+
+
+_RECORD_REPORT_SQL = text(f"""
+INSERT INTO violation_groups AS g (
+    review_id, open_count, total_count, max_severity_rank, violation_types,
+    first_reported_at, last_reported_at, priority, updated_at
+)
+VALUES (
+    :review_id, 1, 1, CAST(:rank AS smallint), ARRAY[CAST(:violation_type AS varchar(40))],
+    CAST(:reported_at AS timestamp), CAST(:reported_at AS timestamp),
+    {_priority_sql("CAST(:rank AS integer)", "1", "CAST(:reported_at AS timestamp)")},
+    now() AT TIME ZONE 'utc'
+)
+ON CONFLICT (review_id) DO UPDATE SET
+    open_count = g.open_count + 1,
+    total_count = g.total_count + 1,
+    max_severity_rank = greatest(g.max_severity_rank, EXCLUDED.max_severity_rank),
+    violation_types = CASE
+        WHEN EXCLUDED.violation_types[1] = ANY(g.violation_types) THEN g.violation_types
+        ELSE g.violation_types || EXCLUDED.violation_types
+    END,
+    first_reported_at = least(g.first_reported_at, EXCLUDED.first_reported_at),
+    last_reported_at = greatest(g.last_reported_at, EXCLUDED.last_reported_at),
+    priority = {_priority_sql(
+        "greatest(g.max_severity_rank, EXCLUDED.max_severity_rank)",
+        "(g.open_count + 1)",
+        "greatest(g.last_reported_at, EXCLUDED.last_reported_at)",
+    )},
+    updated_at = EXCLUDED.updated_at
+""")
+
+
+def _aggregate_sql(where: str) -> str:
+    """Recompute groups from `violations` rows matching `where` (upsert)."""
+    return f"""
+WITH v AS (
+    SELECT review_id, violation_type, created_at,
+           {_RANK_SQL} AS rank,
+           status IN ('open', 'in_review') AS is_open
+    FROM violations
+    WHERE {where}
+), agg AS (
+    SELECT review_id,
+           count(*) FILTER (WHERE is_open) AS open_count,
+           count(*) AS total_count,
+           coalesce(max(rank) FILTER (WHERE is_open), 0) AS max_severity_rank,
+           coalesce(array_agg(DISTINCT violation_type) FILTER (WHERE is_open), '{{}}') AS violation_types,
+           min(created_at) AS first_reported_at,
+           coalesce(max(created_at) FILTER (WHERE is_open), max(created_at)) AS last_reported_at
+    FROM v
+    GROUP BY review_id
+)
+INSERT INTO violation_groups AS g (
+    review_id, open_count, total_count, max_severity_rank, violation_types,
+    first_reported_at, last_reported_at, priority, updated_at
+)
+SELECT review_id, open_count, total_count, max_severity_rank, violation_types,
+       first_reported_at, last_reported_at,
+       {_priority_sql("max_severity_rank", "open_count", "last_reported_at")},
+       now() AT TIME ZONE 'utc'
+FROM agg
+ON CONFLICT (review_id) DO UPDATE SET
+    open_count = EXCLUDED.open_count,
+    total_count = EXCLUDED.total_count,
+    max_severity_rank = EXCLUDED.max_severity_rank,
+    violation_types = EXCLUDED.violation_types,
+    first_reported_at = EXCLUDED.first_reported_at,
+    last_reported_at = EXCLUDED.last_reported_at,
+    priority = EXCLUDED.priority,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+_REFRESH_SQL = text(_aggregate_sql("review_id = ANY(CAST(:review_ids AS uuid[]))"))
+_REBUILD_SQL = text(_aggregate_sql("TRUE"))
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+async def record_report(db: AsyncSession, violation: Violation) -> None:
+    """Apply a newly created (open) report to its review's group."""
+    await db.execute(
+        _RECORD_REPORT_SQL,
+        {
+            "review_id": violation.review_id,
+            "rank": SEVERITY_RANK.get(violation.severity, 0),
+            "violation_type": violation.violation_type,
+            "reported_at": violation.created_at,
+        },
+    )
+
+
+async def refresh(db: AsyncSession, review_ids: list[uuid.UUID]) -> None:
+    """Re-aggregate the groups for `review_ids` after reports changed status or severity."""
+    if not review_ids:
+        return
+    review_ids = sorted(set(review_ids))
+    # Lock existing group rows (in a stable order) so concurrent record_report
+    # deltas queue behind the recompute instead of being overwritten by it.
+    await db.execute(
+        select(ViolationGroup.review_id)
+        .where(ViolationGroup.review_id.in_(review_ids))
+        .order_by(ViolationGroup.review_id)
+        .with_for_update()
+    )
+    await db.execute(_REFRESH_SQL, {"review_ids": review_ids})
+
+
+async def rebuild(db: AsyncSession) -> None:
+    """Recompute every group from scratch."""
+    await db.execute(_REBUILD_SQL)
+
+
+# ---------------------------------------------------------------------------
+# Queue
+# ---------------------------------------------------------------------------
+
+def _group_select():
+    """Group aggregates plus the review fields the queue shows (one joined row per group)."""
+    return (
+        select(
+            ViolationGroup.review_id,
+            ViolationGroup.open_count,
+            ViolationGroup.total_count,
+            ViolationGroup.max_severity_rank,
+            ViolationGroup.violation_types,
+            ViolationGroup.first_reported_at,
+            ViolationGroup.last_reported_at,
+            ViolationGroup.priority,
+            Review.status.label("review_status"),
+            Student.username.label("review_author_username"),
+            func.left(Review.content, violations.LIST_EXCERPT_CHARS).label("review_excerpt"),
+        )
+        .join(Review, Review.id == ViolationGroup.review_id)
+        .join(Student, Student.id == Review.student_id)
+    )
+
+
+async def list_queue(
+    db: AsyncSession,
+    limit: int = 50,
+    after: Optional[tuple[float, uuid.UUID]] = None,
+    min_severity: Optional[str] = None,
+) -> list[dict]:
+    """Open groups, highest priority first (served by ix_violation_groups_open_priority)."""
+    query = (
+        _group_select()
+        .where(ViolationGroup.open_count > 0)
+        .order_by(ViolationGroup.priority.desc(), ViolationGroup.review_id.desc())
+    )
+    if min_severity:
+        query = query.where(ViolationGroup.max_severity_rank >= SEVERITY_RANK[min_severity])
+    if after is not None:
+        query = query.where(tuple_(ViolationGroup.priority, ViolationGroup.review_id) < tuple_(*after))
+
+    result = await db.execute(query.limit(limit))
+    return [_with_severity(dict(row)) for row in result.mappings().all()]
+
+
+async def get(db: AsyncSession, review_id: uuid.UUID) -> Optional[dict]:
+    result = await db.execute(_group_select().where(ViolationGroup.review_id == review_id))
+    row = result.mappings().one_or_none()
+    return _with_severity(dict(row)) if row else None
+
+
+def _with_severity(row: dict) -> dict:
+    row["max_severity"] = SEVERITY_BY_RANK.get(row.pop("max_severity_rank"))
+    return row
+
+
+async def resolve(
+    db: AsyncSession,
+    review_id: uuid.UUID,
+    admin_user_id: uuid.UUID,
+    status: str,
+    admin_notes: Optional[str] = None,
+) -> int:
+    """
+    Close every open report on a review in one UPDATE, then refresh its group.
+    Returns the number of reports closed.
+    """
+    now = datetime.utcnow()
+    values = {
+        "status": status,
+        "resolved_at": now,
+        "updated_at": now,
+        "assigned_admin_id": admin_user_id,
+    }
+    if admin_notes is not None:
+        values["admin_notes"] = admin_notes
+    rows = await violations.lock_for_status_change(
+        db, Violation.review_id == review_id, Violation.status.in_(OPEN_STATUSES)
+    )
+    result = await db.execute(
+        update(Violation)
+        .where(Violation.review_id == review_id, Violation.status.in_(OPEN_STATUSES))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await refresh(db, [review_id])
+    await violations.record_status_change(db, rows, status)
+    return result.rowcount
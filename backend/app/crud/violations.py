@@ -6,10 +6,12 @@ import uuid
 from datetime import datetime
 from typing import Optional, Literal
 
-from sqlalchemy import select, desc, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import any_, func, literal, literal_column, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import aliased, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud import dashboard, violation_groups
 from app.models.review import Review
 from app.models.student import Student
 from app.models.violation import Violation
@@ -47,10 +49,13 @@ async def get_by_id(
     db: AsyncSession,
     violation_id: uuid.UUID,
     load_relations: bool = False,
+    for_update: bool = False,
 ) -> Optional[Violation]:
     query = select(Violation).where(Violation.id == violation_id)
     if load_relations:
         query = query.options(*_violation_review_options())
+    if for_update:
+        query = query.with_for_update().execution_options(populate_existing=True)
     result = await db.execute(query)
     return result.scalar_one_or_none()
 
@@ -69,6 +74,32 @@ async def get_existing_by_reporter(
     return result.scalar_one_or_none()
 
 
+LIST_EXCERPT_CHARS = 280
+
+_FTS_CONFIG = literal_column("'english'::regconfig")
+
+
+def _search_filter(search: str):
+    """
+    Full-text match on review content or report reason, each served by its own
+    GIN expression index (ix_reviews_content_fts / ix_violations_reason_fts),
+    plus an exact (indexed) match on the reporter's or author's username.
+    The expressions must stay identical to the index definitions.
+    """
+    query = func.websearch_to_tsquery(_FTS_CONFIG, search)
+    term = search.strip()
+    return or_(
+        Violation.review_id.in_(
+            select(Review.id).where(func.to_tsvector(_FTS_CONFIG, Review.content).op("@@")(query))
+        ),
+        func.to_tsvector(_FTS_CONFIG, func.coalesce(Violation.reason, literal_column("''"))).op("@@")(query),
+        Violation.reported_by_student_id.in_(select(Student.id).where(Student.username == term)),
+        Violation.review_id.in_(
+            select(Review.id).join(Student, Student.id == Review.student_id).where(Student.username == term)
+        ),
+    )
+
+
 async def list_for_admin(
     db: AsyncSession,
     status: Optional[ViolationStatus] = None,
@@ -77,11 +108,41 @@ async def list_for_admin(
     search: Optional[str] = None,
     skip: int = 0,
     limit: int = 50,
-) -> list[Violation]:
+    after: Optional[tuple[datetime, uuid.UUID]] = None,
+) -> list[dict]:
+    """
+    Moderation queue page as a flat projection (one query, no relationship
+    loading): violation columns, reporter/author usernames and a review
+    excerpt. Full details come from get_by_id(load_relations=True).
+
+    Ordered newest first by (created_at, id); pass `after` for keyset paging.
+    """
+    author = aliased(Student)
+    reporter = aliased(Student)
     query = (
-        select(Violation)
-        .options(*_violation_review_options())
-        .order_by(desc(Violation.created_at))
+        select(
+            Violation.id,
+            Violation.review_id,
+            Violation.reported_by_student_id,
+            reporter.username.label("reporter_username"),
+            Violation.assigned_admin_id,
+            Violation.violation_type,
+            Violation.severity,
+            Violation.reason,
+            Violation.admin_notes,
+            Violation.status,
+            Violation.created_at,
+            Violation.updated_at,
+            Violation.resolved_at,
+            Review.status.label("review_status"),
+            Review.student_id.label("review_author_id"),
+            author.username.label("review_author_username"),
+            func.left(Review.content, LIST_EXCERPT_CHARS).label("review_excerpt"),
+        )
+        .join(Review, Review.id == Violation.review_id)
+        .join(author, author.id == Review.student_id)
+        .outerjoin(reporter, reporter.id == Violation.reported_by_student_id)
+        .order_by(Violation.created_at.desc(), Violation.id.desc())
     )
 
     if status:
@@ -90,21 +151,16 @@ async def list_for_admin(
         query = query.where(Violation.severity == severity)
     if violation_type:
         query = query.where(Violation.violation_type == violation_type)
-    if search:
-        search_pattern = f"%{search.strip()}%"
-        query = (
-            query.join(Violation.review)
-            .outerjoin(Violation.reported_by_student)
-            .where(
-                or_(
-                    Review.content.ilike(search_pattern),
-                    Student.username.ilike(search_pattern),
-                )
-            )
-        )
+    if search and search.strip():
+        query = query.where(_search_filter(search))
 
-    result = await db.execute(query.offset(skip).limit(limit))
-    return list(result.scalars().all())
+    if after is not None:
+        query = query.where(tuple_(Violation.created_at, Violation.id) < tuple_(*after))
+    elif skip:
+        query = query.offset(skip)
+
+    result = await db.execute(query.limit(limit))
+    return [dict(row) for row in result.mappings().all()]
 
 
 async def create(
@@ -125,6 +181,9 @@ async def create(
     )
     db.add(violation)
     await db.flush()
+    await violation_groups.record_report(db, violation)
+    await dashboard.bump(db, {dashboard.violation_key("open", severity): 1})
+    await dashboard.bump_daily(db, dashboard.today(), violations_reported=1)
     return violation
 
 
@@ -136,6 +195,8 @@ async def update_for_admin(
     severity: Optional[ViolationSeverity] = None,
     admin_notes: Optional[str] = None,
 ) -> Violation:
+    """Load `violation` with for_update=True: the dashboard move uses its status and severity."""
+    previous_key = dashboard.violation_key(violation.status, violation.severity)
     violation.assigned_admin_id = admin_user_id
 
     if status is not None:
@@ -153,4 +214,65 @@ async def update_for_admin(
 
     violation.updated_at = datetime.utcnow()
     await db.flush()
+    current_key = dashboard.violation_key(violation.status, violation.severity)
+    if current_key != previous_key:
+        await violation_groups.refresh(db, [violation.review_id])
+        await dashboard.bump(db, dashboard.moves([(previous_key, current_key)]))
     return violation
+
+
+async def bulk_update_status(
+    db: AsyncSession,
+    violation_ids: list[uuid.UUID],
+    admin_user_id: uuid.UUID,
+    status: ViolationStatus,
+    admin_notes: Optional[str] = None,
+) -> tuple[set[uuid.UUID], set[uuid.UUID]]:
+    """
+    Set `status` on many violations in one `UPDATE … WHERE id = ANY(:ids)`
+    and refresh the affected review groups. Rows already in that status are
+    left untouched. Returns (updated ids, existing ids).
+    """
+    now = datetime.utcnow()
+    values = {
+        "status": status,
+        "assigned_admin_id": admin_user_id,
+        "resolved_at": now if status in ("resolved", "dismissed") else None,
+        "updated_at": now,
+    }
+    if admin_notes is not None:
+        values["admin_notes"] = admin_notes
+
+    current = await lock_for_status_change(
+        db, Violation.id == any_(literal(violation_ids, ARRAY(UUID(as_uuid=True))))
+    )
+    changed = [row for row in current if row.status != status]
+    if changed:
+        await db.execute(
+            update(Violation)
+            .where(Violation.id == any_(literal([row.id for row in changed], ARRAY(UUID(as_uuid=True)))))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await violation_groups.refresh(db, [row.review_id for row in changed])
+        await record_status_change(db, changed, status)
+    return {row.id for row in changed}, {row.id for row in current}
+
+
+async def lock_for_status_change(db: AsyncSession, *conditions) -> list:
+    """Lock matching violations and return (id, review_id, status, severity) rows."""
+    result = await db.execute(
+        select(Violation.id, Violation.review_id, Violation.status, Violation.severity)
+        .where(*conditions)
+        .order_by(Violation.id)
+        .with_for_update()
+    )
+    return result.all()
+
+
+async def record_status_change(db: AsyncSession, rows: list, status: ViolationStatus) -> None:
+    """Move rows from lock_for_status_change() to `status` in the dashboard counters."""
+    await dashboard.bump(db, dashboard.moves(
+        (dashboard.violation_key(row.status, row.severity), dashboard.violation_key(status, row.severity))
+        for row in rows
+    ))
@@ -1,11 +1,21 @@
 """
 Async database engine, session factory, and Base.
 This is the single source of truth for DB setup — core/database.py is not used.
+
+Two session dependencies:
+  - get_db: read-write session on the primary, committed on success.
+  - get_read_db: for routes that only read. Its transaction is started
+    READ ONLY (asyncpg sends BEGIN ... READ ONLY, so no extra SET TRANSACTION
+    round trip) and is never committed, only released. It runs on
+    DATABASE_REPLICA_URL when that is set, otherwise on the primary's pool.
+    A write attempted through it fails with a read-only transaction error
+    instead of being committed.
 """
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable, Optional
 
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
     async_sessionmaker,
@@ -14,6 +24,8 @@ from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core import query_stats, slow_queries
+from app.core.metrics import InstrumentedAsyncPool, instrument_engine
 
 
 def _normalize_asyncpg_url(database_url: str) -> tuple[str, dict]:
@@ -35,19 +47,84 @@ def _normalize_asyncpg_url(database_url: str) -> tuple[str, dict]:
     return url.render_as_string(hide_password=False), connect_args
 
 
-normalized_database_url, normalized_connect_args = _normalize_asyncpg_url(settings.DATABASE_URL)
-
-
-engine = create_async_engine(
-    normalized_database_url,
-    echo=settings.ENV == "dev",
-    pool_pre_ping=True,
-    pool_recycle=280,  # recycle before Neon's ~5-minute idle timeout
-    connect_args=normalized_connect_args,
+class _LazySessionFactory(async_sessionmaker):
+    """Session factory that creates its engine on first use."""
+
+    def __init__(self, ensure_engine: Callable[[], AsyncEngine], **kw):
+        super().__init__(**kw)
+        self._ensure_engine = ensure_engine
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        self._ensure_engine()
+        return super().__call__(**local_kw)
+
+
+_engine: Optional[AsyncEngine] = None
+_read_engine: Optional[AsyncEngine] = None
+
+
+def _create_engine(database_url: str, name: str) -> AsyncEngine:
+    database_url, connect_args = _normalize_asyncpg_url(database_url)
+    engine_kwargs: dict = {}
+    if settings.METRICS_ENABLED:
+        engine_kwargs["poolclass"] = InstrumentedAsyncPool  # times checkout waits
+    engine = create_async_engine(
+        database_url,
+        echo=settings.ENV == "dev",
+        pool_pre_ping=True,
+        pool_recycle=280,  # recycle before Neon's ~5-minute idle timeout
+        connect_args=connect_args,
+        **engine_kwargs,
+    )
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine, name)
+    query_stats.instrument_engine(engine)
+    slow_queries.instrument_engine(engine)
+    return engine
+
+
+def get_engine() -> AsyncEngine:
+    """
+    The application engine, created on first use (normally from the app
+    lifespan). Importing this module does not load the DB driver or build a pool.
+    """
+    global _engine
+    if _engine is None:
+        _engine = _create_engine(settings.DATABASE_URL, "primary")
+        AsyncSessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def get_read_engine() -> AsyncEngine:
+    """Engine behind get_read_db: the replica if configured, else the primary."""
+    global _read_engine
+    if _read_engine is None:
+        if settings.DATABASE_REPLICA_URL:
+            _read_engine = _create_engine(settings.DATABASE_REPLICA_URL, "replica")
+        else:
+            _read_engine = get_engine()
+        ReadSessionLocal.configure(bind=_read_engine.execution_options(postgresql_readonly=True))
+    return _read_engine
+
+
+async def dispose_engine() -> None:
+    global _engine, _read_engine
+    if _read_engine is not None and _read_engine is not _engine:
+        await _read_engine.dispose()
+    _read_engine = None
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+
+AsyncSessionLocal = _LazySessionFactory(
+    get_engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
 )
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
+ReadSessionLocal = _LazySessionFactory(
+    get_read_engine,
     expire_on_commit=False,
     class_=AsyncSession,
 )
@@ -65,4 +142,10 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.commit()
         except Exception:
             await session.rollback()
-            raise
\ No newline at end of file
+            raise
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency for read-only routes — READ ONLY transaction, never committed."""
+    async with ReadSessionLocal() as session:
+        yield session
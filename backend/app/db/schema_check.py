@@ -0,0 +1,267 @@
+"""
+Schema verification: compare the live database with the ORM models and the
+Alembic head, once, off the request path.
+
+Checks:
+  - revision — alembic_version matches the head of alembic/versions
+  - table    — every mapped table exists
+  - check    — named CHECK constraints exist and allow the same literals
+  - unique   — named UNIQUE constraints exist
+  - index    — named indexes exist
+
+Only check constraints and indexes are repaired automatically; the rest
+needs a migration. A CHECK repair is dropped and re-added NOT VALID in one
+transaction and validated in a second one, so the ACCESS EXCLUSIVE lock is
+held for a catalog update only; the validation scan runs under SHARE UPDATE
+EXCLUSIVE, which lets reads and writes carry on.
+An index is built with CREATE INDEX CONCURRENTLY (outside a transaction, in
+autocommit), so writes to the table carry on during the build; an INVALID
+index left behind by an interrupted build is dropped and rebuilt.
+Repairs take a session-level advisory lock, held across all of a repair's
+steps, so several workers starting together don't race, and a lock_timeout
+so a busy table can't stall startup.
+
+Runs from the app lifespan (SCHEMA_CHECK = off | warn | repair | strict) and
+from scripts/check_schema.py.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import CheckConstraint, UniqueConstraint, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import AddConstraint, CreateIndex
+
+import app.models  # noqa: F401 — register every table on Base.metadata
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.db.base import Base, get_engine
+
+logger = get_logger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+REPAIR_LOCK_KEY = 0x5C4E_3A11  # pg_advisory_lock key for repairs
+REPAIR_LOCK_TIMEOUT = "5s"
+
+_QUOTED = re.compile(r"'((?:[^']|'')*)'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+@dataclass
+class SchemaDrift:
+    kind: str  # "revision" | "table" | "check" | "unique" | "index"
+    table: Optional[str]
+    name: str
+    detail: str
+    repairable: bool = False
+
+    def __str__(self) -> str:
+        where = f"{self.table}.{self.name}" if self.table else self.name
+        return f"{self.kind} {where}: {self.detail}"
+
+
+def _literals(sql: str) -> frozenset[str]:
+    """
+    The string and numeric literals in a CHECK expression. Postgres rewrites
+    `status IN ('a', 'b')` as `status = ANY (ARRAY['a'::varchar, …])`, so the
+    text never round-trips; the literal set does, for the IN-list and range
+    checks the models use.
+    """
+    strings = _QUOTED.findall(sql)
+    numbers = _NUMBER.findall(_QUOTED.sub("", sql))
+    return frozenset(strings) | frozenset(numbers)
+
+
+def expected_head() -> Optional[str]:
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_current_head()
+
+
+def find_drift(conn: Connection) -> list[SchemaDrift]:
+    """Compare the live schema on `conn` (sync) with Base.metadata."""
+    from alembic.runtime.migration import MigrationContext
+
+    drift: list[SchemaDrift] = []
+
+    head = expected_head()
+    current = MigrationContext.configure(conn).get_current_heads()
+    if tuple(current) != ((head,) if head else ()):
+        drift.append(SchemaDrift(
+            "revision", None, "alembic_version",
+            f"database at {', '.join(current) or 'no revision'}, code expects {head}",
+        ))
+
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            drift.append(SchemaDrift("table", None, table.name, "missing"))
+            continue
+
+        live_checks = {c["name"]: c["sqltext"] for c in inspector.get_check_constraints(table.name)}
+        live_uniques = {c["name"] for c in inspector.get_unique_constraints(table.name)}
+        live_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+
+        for constraint in table.constraints:
+            if not constraint.name:
+                continue
+            if isinstance(constraint, CheckConstraint):
+                expected = str(constraint.sqltext)
+                live = live_checks.get(constraint.name)
+                if live is None:
+                    drift.append(SchemaDrift("check", table.name, constraint.name, "missing", repairable=True))
+                elif _literals(live) != _literals(expected):
+                    drift.append(SchemaDrift(
+                        "check", table.name, constraint.name,
+                        f"live `{live}` differs from model `{expected}`",
+                        repairable=True,
+                    ))
+            elif isinstance(constraint, UniqueConstraint) and constraint.name not in live_uniques:
+                drift.append(SchemaDrift("unique", table.name, constraint.name, "missing"))
+
+        for index in table.indexes:
+            if index.name not in live_indexes:
+                drift.append(SchemaDrift("index", table.name, index.name, "missing", repairable=True))
+
+    return drift
+
+
+def _repair_statements(item: SchemaDrift, conn: Connection) -> list[str]:
+    table = Base.metadata.tables[item.table]
+    if item.kind == "check":
+        constraint = next(c for c in table.constraints if c.name == item.name)
+        add = str(AddConstraint(constraint).compile(dialect=conn.dialect))
+        return [
+            f'ALTER TABLE {table.name} DROP CONSTRAINT IF EXISTS "{item.name}"',
+            f"{add} NOT VALID",
+            f'ALTER TABLE {table.name} VALIDATE CONSTRAINT "{item.name}"',
+        ]
+    if item.kind == "index":
+        index = next(i for i in table.indexes if i.name == item.name)
+        index.dialect_options["postgresql"]["concurrently"] = True
+        try:
+            create = str(CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect))
+        finally:
+            index.dialect_options["postgresql"]["concurrently"] = False
+        return [f'DROP INDEX CONCURRENTLY IF EXISTS "{item.name}"', create]
+    raise ValueError(f"{item.kind} drift is not repairable")
+
+
+def _repair_index(conn: Connection, item: SchemaDrift) -> bool:
+    # CONCURRENTLY cannot run in a transaction block, so this uses autocommit
+    # and a session-level advisory lock, released before returning.
+    default_isolation = conn.get_isolation_level()
+    conn.execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": REPAIR_LOCK_KEY}).scalar():
+            return False
+        try:
+            conn.execute(text(f"SET lock_timeout = '{REPAIR_LOCK_TIMEOUT}'"))
+            drop, create = _repair_statements(item, conn)
+            # find_drift only reports names the inspector didn't list, so an
+            # index found here is the INVALID leftover of a failed build.
+            if conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": item.name}).scalar():
+                conn.execute(text(drop))
+            conn.execute(text(create))
+        finally:
+            conn.execute(text("RESET lock_timeout"))
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": REPAIR_LOCK_KEY})
+    finally:
+        conn.commit()  # end the autobegun (no-op) transaction so the level can change back
+        conn.execution_options(isolation_level=default_isolation)
+    return True
+
+
+def _repair_check(conn: Connection, item: SchemaDrift) -> bool:
+    with conn.begin():
+        if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": REPAIR_LOCK_KEY}).scalar():
+            return False
+    try:
+        drop, add, validate = _repair_statements(item, conn)
+        # ACCESS EXCLUSIVE, released at this commit: catalog changes only.
+        with conn.begin():
+            conn.execute(text(f"SET LOCAL lock_timeout = '{REPAIR_LOCK_TIMEOUT}'"))
+            conn.execute(text(drop))
+            conn.execute(text(add))
+        # The scan of existing rows, under SHARE UPDATE EXCLUSIVE.
+        with conn.begin():
+            conn.execute(text(f"SET LOCAL lock_timeout = '{REPAIR_LOCK_TIMEOUT}'"))
+            conn.execute(text(validate))
+    finally:
+        with conn.begin():
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": REPAIR_LOCK_KEY})
+    return True
+
+
+def repair(conn: Connection, item: SchemaDrift) -> bool:
+    """
+    Repair one drift item (sync `conn`, not in a transaction): a check in
+    two transactions, an index in autocommit. Returns False if another
+    process holds the repair lock.
+    """
+    if item.kind == "index":
+        return _repair_index(conn, item)
+    return _repair_check(conn, item)
+
+
+def check_and_repair(conn: Connection, apply_repairs: bool) -> list[SchemaDrift]:
+    """Find drift, optionally repair what can be, and return what is left."""
+    drift = find_drift(conn)
+    conn.rollback()  # end the inspection transaction before repairs begin their own
+    if not apply_repairs:
+        return drift
+
+    remaining = []
+    for item in drift:
+        if not item.repairable:
+            remaining.append(item)
+            continue
+        try:
+            repaired = repair(conn, item)
+        except SQLAlchemyError as e:
+            logger.error("Schema repair failed: %s (%s)", item, type(e).__name__)
+            remaining.append(item)
+            continue
+        if repaired:
+            logger.warning("Schema repaired: %s", item)
+        else:
+            logger.info("Schema repair skipped, another process holds the lock: %s", item)
+            remaining.append(item)
+    return remaining
+
+
+async def verify_schema(mode: Optional[str] = None) -> list[SchemaDrift]:
+    """
+    Startup hook. Modes:
+      off    — do nothing
+      warn   — log drift
+      repair — repair check constraints and indexes, log the rest
+      strict — log drift and fail startup if any remains
+    An unreachable database is logged and skipped except in strict mode.
+    """
+    mode = (mode or settings.SCHEMA_CHECK).lower()
+    if mode == "off":
+        return []
+
+    try:
+        async with get_engine().connect() as conn:
+            drift = await conn.run_sync(check_and_repair, mode == "repair")
+    except (OSError, SQLAlchemyError) as e:
+        if mode == "strict":
+            raise
+        logger.warning("Schema check skipped: database unavailable (%s)", type(e).__name__)
+        return []
+
+    for item in drift:
+        logger.warning("Schema drift: %s", item)
+    if not drift:
+        logger.info("Schema check passed")
+    elif mode == "strict":
+        raise RuntimeError(f"{len(drift)} schema drift item(s); run `alembic upgrade head` or scripts/check_schema.py --repair")
+    return drift
@@ -6,12 +6,14 @@ Injected via Depends() in route functions.
 import uuid
 from typing import Optional, Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_db
+from app.db.base import get_db, get_read_db
 from app.core.jwt import decode_access_token
+from app.core.rate_limit import RateLimitExceeded, get_client_ip, get_rate_limiter
+from app.core.sanctions import SanctionState
 from app.models.user import User
 from app.models.student import Student
 from app.models.professor import Professor
@@ -25,6 +27,11 @@ bearer_scheme = HTTPBearer(auto_error=False)
 
 DBDep = Annotated[AsyncSession, Depends(get_db)]
 
+# Read-only routes: READ ONLY transaction, never committed, on the replica
+# when DATABASE_REPLICA_URL is set. Replicas can lag, so keep DBDep for
+# reads that must see the caller's own writes (moderation queues, "my" data).
+ReadDBDep = Annotated[AsyncSession, Depends(get_read_db)]
+
 
 # ---------------------------------------------------------------------------
 # Auth dependencies
@@ -118,6 +125,54 @@ async def require_admin(
     return user
 
 
+# ---------------------------------------------------------------------------
+# Sanctions (mute / block)
+# ---------------------------------------------------------------------------
+
+def get_sanction_state(user: Annotated[User, Depends(get_current_user)]) -> SanctionState:
+    """From the request's cached get_current_user row: no extra query."""
+    return SanctionState.from_user(user)
+
+
+def enforce_not_muted_or_blocked(sanctions: Annotated[SanctionState, Depends(get_sanction_state)]) -> None:
+    """Blocks review posting/editing/deleting if the user is blocked or muted."""
+    denial = sanctions.denial()
+    if denial:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=denial)
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+def raise_rate_limited(exceeded: RateLimitExceeded) -> None:
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests. Please slow down and try again later.",
+        headers={"Retry-After": str(exceeded.retry_after)},
+    )
+
+
+def rate_limited(policy: str):
+    """
+    Dependency factory: enforce a POLICIES entry keyed by the current user and client IP.
+    Reuses the request's cached get_current_user, so it adds no queries.
+    """
+    async def dependency(
+        request: Request,
+        user: Annotated[User, Depends(get_current_user)],
+    ) -> None:
+        exceeded = await get_rate_limiter().check(
+            policy,
+            user_id=str(user.id),
+            ip=get_client_ip(request),
+        )
+        if exceeded:
+            raise_rate_limited(exceeded)
+
+    return Depends(dependency)
+
+
 # Annotated shortcuts for cleaner route signatures
 CurrentUser = Annotated[User, Depends(get_current_user)]
 CurrentUserOptional = Annotated[Optional[User], Depends(get_current_user_optional)]
@@ -4,14 +4,27 @@ FastAPI application entry point.
 
 import time
 import uuid
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi import HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.core.config import settings
-from app.core.logger import get_logger, setup_logger
+from app.core.content_filter import start_content_filter, stop_content_filter
+from app.core.encryption import load_keys
+from app.core.logger import get_logger, setup_logger, should_log_success, shutdown_logger
+from app.core.mailer import start_mail_dispatcher, stop_mail_dispatcher
+from app.core import metrics
+from app.core.oauth2 import start_entra_client, stop_entra_client
+from app.core.premoderation import start_premoderation, stop_premoderation
+from app.core import query_stats
+from app.core.rate_limit import get_client_ip
+from app.core.scheduler import start_job_runner, stop_job_runner
+from app.core.slow_queries import start_slow_query_log, stop_slow_query_log
+from app.db.base import dispose_engine, get_engine
+from app.db.schema_check import verify_schema
 
 from app.api.auth import router as auth_router
 from app.api.users import router as users_router
@@ -23,16 +36,58 @@ from app.api.courses import (
 )
 from app.api.reviews import router as reviews_router
 from app.api.violations import router as violations_router
+from app.api.admin_stream import router as admin_stream_router
+from app.api.dashboard import router as dashboard_router
+from app.api.blocklist import router as blocklist_router
+from app.api.admin import router as admin_router
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logger("DEBUG" if settings.ENV == "dev" else "INFO")
+    logger.info(
+        "Application startup: app=%s env=%s version=%s",
+        settings.APP_NAME,
+        settings.ENV,
+        app.version,
+    )
+    # Singletons are built here, not at import time, so importing app.main
+    # (workers, tests, tooling) stays cheap; a bad key still fails startup.
+    load_keys()
+    get_engine()
+    await metrics.start_metrics()
+    await start_slow_query_log()
+    await verify_schema()
+    await start_entra_client()
+    await start_mail_dispatcher()
+    await start_content_filter()
+    await start_premoderation()
+    await start_job_runner()
+
+    yield
+
+    await stop_job_runner()
+    await stop_premoderation()
+    await stop_content_filter()
+    await stop_mail_dispatcher()
+    await stop_entra_client()
+    await stop_slow_query_log()
+    await metrics.stop_metrics()
+    await dispose_engine()
+    logger.info("Application shutdown: app=%s env=%s", settings.APP_NAME, settings.ENV)
+    shutdown_logger()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
-logger = get_logger(__name__)
-
 # ---------------------------------------------------------------------------
 # CORS
 # ---------------------------------------------------------------------------
@@ -43,32 +98,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "X-Next-Cursor", "X-Total-Count", "Server-Timing"],
 )
 
 
-@app.on_event("startup")
-async def startup_logging() -> None:
-    setup_logger("DEBUG" if settings.ENV == "dev" else "INFO")
-    logger.info(
-        "Application startup: app=%s env=%s version=%s",
-        settings.APP_NAME,
-        settings.ENV,
-        app.version,
-    )
-
-
-@app.on_event("shutdown")
-async def shutdown_logging() -> None:
-    logger.info("Application shutdown: app=%s env=%s", settings.APP_NAME, settings.ENV)
-
-
-def _get_client_ip(request: Request) -> str:
-    x_forwarded_for = request.headers.get("x-forwarded-for", "")
-    if x_forwarded_for:
-        return x_forwarded_for.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
-
-
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     request_id = request.headers.get("x-request-id") or str(uuid.uuid4())
@@ -76,57 +109,75 @@ async def log_requests(request: Request, call_next):
 
     path = request.url.path
     method = request.method
-    client_ip = _get_client_ip(request)
+    client_ip = get_client_ip(request)
     start = time.perf_counter()
+    stats, stats_token = query_stats.start_request(request_id, request.scope)
+    if settings.METRICS_ENABLED:
+        metrics.HTTP_IN_FLIGHT.inc(method)
 
-    logger.info(
-        "Request start: request_id=%s method=%s path=%s client_ip=%s",
-        request_id,
-        method,
-        path,
-        client_ip,
+    logger.debug(
+        "Request start",
+        extra={"request_id": request_id, "method": method, "path": path, "client_ip": client_ip},
     )
 
     try:
         response = await call_next(request)
     except Exception:
         duration_ms = (time.perf_counter() - start) * 1000
+        if settings.METRICS_ENABLED:
+            metrics.HTTP_IN_FLIGHT.dec(method)
+            metrics.observe_request(method, metrics.route_label(request.scope), 500, duration_ms / 1000)
+        query_stats.end_request(stats, stats_token, method, path)
         logger.exception(
-            "Request crash: request_id=%s method=%s path=%s duration_ms=%.2f",
-            request_id,
-            method,
-            path,
-            duration_ms,
+            "Request crash",
+            extra={
+                "request_id": request_id,
+                "method": method,
+                "path": path,
+                "duration_ms": round(duration_ms, 2),
+                "queries": stats.queries,
+                "db_ms": round(stats.db_ms, 2),
+            },
         )
         raise
 
     duration_ms = (time.perf_counter() - start) * 1000
     response.headers["X-Request-ID"] = request_id
-
-    level = "warning" if response.status_code >= 400 else "info"
-    getattr(logger, level)(
-        "Request complete: request_id=%s method=%s path=%s status=%s duration_ms=%.2f",
-        request_id,
-        method,
-        path,
-        response.status_code,
-        duration_ms,
-    )
+    response.headers["Server-Timing"] = stats.server_timing()
+    query_stats.end_request(stats, stats_token, method, path)
+    if settings.METRICS_ENABLED:
+        # The route is matched by now, so latency is labelled by template, not raw path.
+        metrics.HTTP_IN_FLIGHT.dec(method)
+        metrics.observe_request(method, metrics.route_label(request.scope), response.status_code, duration_ms / 1000)
+
+    # One line per request. Errors and slow requests are always logged;
+    # successes are sampled per route (LOG_ROUTE_SAMPLE_RATES).
+    failed = response.status_code >= 400
+    if failed or duration_ms >= settings.LOG_SLOW_REQUEST_MS or should_log_success(stats.route):
+        (logger.warning if failed else logger.info)(
+            "Request complete",
+            extra={
+                "request_id": request_id,
+                "method": method,
+                "path": path,
+                "route": stats.route,
+                "status": response.status_code,
+                "duration_ms": round(duration_ms, 2),
+                "queries": stats.queries,
+                "db_ms": round(stats.db_ms, 2),
+                "rows": stats.rows,
+                "client_ip": client_ip,
+                **({"detail": request.state.error_detail} if failed and hasattr(request.state, "error_detail") else {}),
+            },
+        )
 
     return response
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_logger(request: Request, exc: HTTPException):
-    request_id = getattr(request.state, "request_id", "unknown")
-    logger.warning(
-        "HTTP exception: request_id=%s method=%s path=%s status=%s detail=%s",
-        request_id,
-        request.method,
-        request.url.path,
-        exc.status_code,
-        exc.detail,
-    )
+    # Logged with the request's own line in log_requests, not as a second line.
+    request.state.error_detail = exc.detail
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
@@ -138,11 +189,13 @@ async def http_exception_logger(request: Request, exc: HTTPException):
 async def unhandled_exception_logger(request: Request, exc: Exception):
     request_id = getattr(request.state, "request_id", "unknown")
     logger.exception(
-        "Unhandled exception: request_id=%s method=%s path=%s error=%s",
-        request_id,
-        request.method,
-        request.url.path,
-        str(exc),
+        "Unhandled exception",
+        extra={
+            "request_id": request_id,
+            "method": request.method,
+            "path": request.url.path,
+            "error": str(exc),
+        },
     )
     return JSONResponse(
         status_code=500,
@@ -153,19 +206,31 @@ async def unhandled_exception_logger(request: Request, exc: Exception):
 # Routers (ALL under /api/v1)
 # ---------------------------------------------------------------------------
 
-app.include_router(auth_router,       prefix="/api/v1")
-app.include_router(users_router,      prefix="/api/v1")
-app.include_router(courses_router,    prefix="/api/v1")
-app.include_router(professors_router, prefix="/api/v1")
-app.include_router(sections_router,   prefix="/api/v1")
-app.include_router(semesters_router,  prefix="/api/v1")
-app.include_router(reviews_router,    prefix="/api/v1")
-app.include_router(violations_router, prefix="/api/v1")
+app.include_router(auth_router,         prefix="/api/v1")
+app.include_router(users_router,        prefix="/api/v1")
+app.include_router(courses_router,      prefix="/api/v1")
+app.include_router(professors_router,   prefix="/api/v1")
+app.include_router(sections_router,     prefix="/api/v1")
+app.include_router(semesters_router,    prefix="/api/v1")
+app.include_router(reviews_router,      prefix="/api/v1")
+app.include_router(violations_router,   prefix="/api/v1")
+app.include_router(admin_stream_router, prefix="/api/v1")
+app.include_router(dashboard_router,    prefix="/api/v1")
+app.include_router(blocklist_router,    prefix="/api/v1")
+app.include_router(admin_router,        prefix="/api/v1")
 
 # ---------------------------------------------------------------------------
-# Health check
+# Health check + metrics
 # ---------------------------------------------------------------------------
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "env": settings.ENV}
\ No newline at end of file
+    return {"status": "ok", "env": settings.ENV}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape target; not under /api/v1, keep it off the public ingress."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(metrics.collect(), media_type=metrics.CONTENT_TYPE)
\ No newline at end of file
@@ -13,7 +13,13 @@ from app.models.section import Section
 from app.models.review import Review
 from app.models.review_interaction import ReviewInteraction
 from app.models.violation import Violation
+from app.models.violation_group import ViolationGroup
 from app.models.otp import OTP
+from app.models.oauth_state import OAuthState
+from app.models.rate_limit import RateLimitCounter
+from app.models.dashboard import DashboardCounter, DashboardDaily
+from app.models.blocked_term import BlockedTerm
+from app.models.review_fingerprint import ReviewFingerprint
 
 __all__ = [
     "User",
@@ -29,5 +35,12 @@ __all__ = [
     "Review",
     "ReviewInteraction",
     "Violation",
+    "ViolationGroup",
     "OTP",
+    "OAuthState",
+    "RateLimitCounter",
+    "DashboardCounter",
+    "DashboardDaily",
+    "BlockedTerm",
+    "ReviewFingerprint",
 ]
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+BlockedTerm ORM model.
+Admin-managed word/phrase blocklist checked at review submission
+(see app.core.content_filter). Terms are stored normalised.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class BlockedTerm(Base):
+    __tablename__ = "blocked_terms"
+    __table_args__ = (
+        CheckConstraint(
+            "category IN ('hate_speech', 'harassment', 'spam', 'other')",
+            name="ck_blocked_term_category",
+        ),
+    )
+
+    # Case-folded, look-alikes undone, words joined by single spaces
+    term: Mapped[str] = mapped_column(String(100), primary_key=True)
+    # Violation type a review containing it would otherwise have been reported as
+    category: Mapped[str] = mapped_column(String(40), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<BlockedTerm(term={self.term!r}, category={self.category})>"
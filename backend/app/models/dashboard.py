@@ -0,0 +1,42 @@
+"""
+Admin dashboard rollup models.
+Maintained incrementally by crud.dashboard from the review, violation and
+user write paths, so the dashboard never counts the base tables.
+"""
+
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DashboardCounter(Base):
+    """A running total, e.g. "reviews.pending", "violations.open.high", "users.active"."""
+
+    __tablename__ = "dashboard_counters"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DashboardCounter(name={self.name}, value={self.value})>"
+
+
+class DashboardDaily(Base):
+    """Activity counts for one UTC day."""
+
+    __tablename__ = "dashboard_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    reviews_submitted: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reviews_approved: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reviews_rejected: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    violations_reported: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    users_created: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Distinct users who signed in that day (first login of the day counts).
+    active_users: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DashboardDaily(day={self.day})>"
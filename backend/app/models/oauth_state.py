@@ -0,0 +1,24 @@
+"""
+OAuthState ORM model.
+Short-lived PKCE verifier keyed by the OAuth `state` parameter, shared by all
+worker processes so /callback can land on a different worker than /login.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class OAuthState(Base):
+    __tablename__ = "oauth_states"
+
+    # secrets.token_urlsafe(32) → 43 chars
+    state: Mapped[str] = mapped_column(String(128), primary_key=True)
+    code_verifier: Mapped[str] = mapped_column(String(128), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<OAuthState(state={self.state[:8]}…, expires_at={self.expires_at.isoformat()})>"
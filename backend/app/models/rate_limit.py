@@ -0,0 +1,27 @@
+"""
+RateLimitCounter ORM model.
+Shared sliding-window counters for the `db` rate-limit backend
+(see app.core.rate_limit). One row per (key, fixed window).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, Integer, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limit_counters"
+
+    # "<policy>:<scope>:<identity>" — identity is a blind index, user id or IP
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # floor(unix_time / window_seconds)
+    window: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Once past this the row can no longer affect any sliding window
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<RateLimitCounter(key={self.key}, window={self.window}, count={self.count})>"
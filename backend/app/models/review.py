@@ -6,9 +6,9 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, DateTime, Integer, ForeignKey, Text, Float, CheckConstraint
+from sqlalchemy import String, DateTime, Integer, ForeignKey, Text, Float, CheckConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 
 from app.db.base import Base
 
@@ -26,6 +26,12 @@ class Review(Base):
         CheckConstraint("status IN ('pending', 'approved', 'rejected')", name="ck_review_status"),
         CheckConstraint("likes_count >= 0", name="ck_review_likes_non_negative"),
         CheckConstraint("dislikes_count >= 0", name="ck_review_dislikes_non_negative"),
+        # Full-text search in the moderation queue (see crud.violations.list_for_admin).
+        Index(
+            "ix_reviews_content_fts",
+            text("to_tsvector('english'::regconfig, content)"),
+            postgresql_using="gin",
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -44,6 +50,10 @@ class Review(Base):
     # Moderation status: 'pending' → 'approved' | 'rejected'
     status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False, index=True)
 
+    # Pre-moderation assessment (app.core.premoderation); NULL until scored or after an edit.
+    risk_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    risk_flags: Mapped[Optional[list[str]]] = mapped_column(ARRAY(String(40)), nullable=True)
+
     # Denormalised counters — kept in sync by CRUD layer when interactions change
     likes_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     dislikes_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
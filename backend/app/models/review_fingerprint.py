@@ -0,0 +1,34 @@
+"""
+ReviewFingerprint ORM model.
+MinHash signature + LSH bucket keys per review for near-duplicate lookup
+(see app.core.fingerprint and crud.review_fingerprints).
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ReviewFingerprint(Base):
+    __tablename__ = "review_fingerprints"
+    __table_args__ = (
+        # Candidate lookup: buckets && :buckets — one GIN probe per band.
+        Index("ix_review_fingerprints_buckets", "buckets", postgresql_using="gin"),
+    )
+
+    review_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("reviews.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    signature: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), nullable=False)
+    buckets: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ReviewFingerprint(review_id={self.review_id})>"
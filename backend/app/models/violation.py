@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -39,6 +39,13 @@ class Violation(Base):
             "status IN ('open', 'in_review', 'resolved', 'dismissed')",
             name="ck_violation_status",
         ),
+        # Moderation queue: filtered by status, newest first, keyset-paged.
+        Index("ix_violations_status_created_at_id", "status", "created_at", "id"),
+        Index(
+            "ix_violations_reason_fts",
+            text("to_tsvector('english'::regconfig, coalesce(reason, ''))"),
+            postgresql_using="gin",
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
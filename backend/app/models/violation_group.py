@@ -0,0 +1,50 @@
+"""
+ViolationGroup ORM model.
+Per-review aggregate of moderation reports, maintained by
+crud.violation_groups so the triage queue never aggregates at read time.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, SmallInteger, String, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+
+
+class ViolationGroup(Base):
+    __tablename__ = "violation_groups"
+    __table_args__ = (
+        # Triage queue: open groups, highest priority first, keyset-paged.
+        Index(
+            "ix_violation_groups_open_priority",
+            text("priority DESC"),
+            text("review_id DESC"),
+            postgresql_where=text("open_count > 0"),
+        ),
+    )
+
+    review_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("reviews.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Reports still needing action (status open / in_review) vs. all reports.
+    open_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # 1=low … 4=critical, over open reports; 0 when none are open.
+    max_severity_rank: Mapped[int] = mapped_column(SmallInteger, default=0, nullable=False)
+    violation_types: Mapped[list[str]] = mapped_column(ARRAY(String(40)), default=list, nullable=False)
+    first_reported_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_reported_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Log-space score; see crud.violation_groups. NULL when nothing is open.
+    priority: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    review: Mapped["Review"] = relationship("Review")
+
+    def __repr__(self) -> str:
+        return f"<ViolationGroup(review_id={self.review_id}, open={self.open_count}, priority={self.priority})>"
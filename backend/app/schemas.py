@@ -3,10 +3,10 @@ Pydantic schemas for request validation and response serialization.
 """
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, Literal
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 
 # ---------------------------------------------------------------------------
@@ -102,6 +102,35 @@ class AdminUserStatusUpdate(BaseModel):
     status: Literal["active", "suspended", "inactive"]
 
 
+class AdminBulkUserUpdate(BaseModel):
+    """Apply the same changes to many users. Omitted fields are left unchanged."""
+    user_ids: list[uuid.UUID] = Field(min_length=1, max_length=500)
+    roles: Optional[list[Literal["admin", "professor", "student"]]] = Field(default=None, min_length=1)
+    status: Optional[Literal["active", "suspended", "inactive"]] = None
+    mute_minutes: Optional[int] = Field(default=None, ge=0, le=60 * 24 * 30)  # 0 = unmute
+    is_blocked: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def _has_changes(self):
+        if self.roles is None and self.status is None and self.mute_minutes is None and self.is_blocked is None:
+            raise ValueError("At least one of roles, status, mute_minutes or is_blocked is required.")
+        return self
+
+
+class AdminBulkUserResult(BaseModel):
+    id: uuid.UUID
+    ok: bool
+    error: Optional[str] = None
+    roles: Optional[list[str]] = None
+    status: Optional[str] = None
+
+
+class AdminBulkUserResponse(BaseModel):
+    updated: int
+    failed: int
+    results: list[AdminBulkUserResult]
+
+
 # ---------------------------------------------------------------------------
 # Professor
 # ---------------------------------------------------------------------------
@@ -207,10 +236,21 @@ class ReviewOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class PendingReviewOut(ReviewOut):
+    """Moderation queue view: ReviewOut plus the pre-moderation assessment."""
+    risk_score: Optional[float] = None
+    risk_flags: Optional[list[str]] = None
+
+
 class ReviewStatusUpdate(BaseModel):
     status: Literal["approved", "rejected"]
 
 
+class BulkReviewStatusUpdate(BaseModel):
+    review_ids: list[uuid.UUID] = Field(min_length=1, max_length=500)
+    status: Literal["approved", "rejected"]
+
+
 # ---------------------------------------------------------------------------
 # Review Interaction
 # ---------------------------------------------------------------------------
@@ -271,6 +311,162 @@ class ViolationOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ViolationListItem(BaseModel):
+    """Moderation queue row: no nested review/section graph, just an excerpt."""
+    id: uuid.UUID
+    review_id: uuid.UUID
+    reported_by_student_id: Optional[uuid.UUID]
+    reporter_username: Optional[str] = None
+    assigned_admin_id: Optional[uuid.UUID]
+    violation_type: Literal[
+        "spam",
+        "harassment",
+        "hate_speech",
+        "misinformation",
+        "personal_data",
+        "other",
+    ]
+    severity: Literal["low", "medium", "high", "critical"]
+    reason: Optional[str]
+    admin_notes: Optional[str]
+    status: Literal["open", "in_review", "resolved", "dismissed"]
+    created_at: datetime
+    updated_at: datetime
+    resolved_at: Optional[datetime]
+    review_status: str
+    review_author_id: uuid.UUID
+    review_author_username: str
+    review_excerpt: str
+
+
+class BulkViolationUpdate(BaseModel):
+    violation_ids: list[uuid.UUID] = Field(min_length=1, max_length=500)
+    status: Literal["in_review", "resolved", "dismissed"]
+    admin_notes: Optional[str] = Field(default=None, max_length=5000)
+
+
+class ViolationGroupOut(BaseModel):
+    """Triage-queue entry: all reports on one review, aggregated."""
+    review_id: uuid.UUID
+    open_count: int
+    total_count: int
+    max_severity: Optional[Literal["low", "medium", "high", "critical"]] = None
+    violation_types: list[str]
+    first_reported_at: datetime
+    last_reported_at: datetime
+    priority: Optional[float] = None
+    review_status: str
+    review_author_username: str
+    review_excerpt: str
+
+
+class ViolationGroupResolve(BaseModel):
+    status: Literal["resolved", "dismissed"]
+    admin_notes: Optional[str] = Field(default=None, max_length=5000)
+
+
+class ViolationGroupResolveResult(BaseModel):
+    closed: int
+    group: ViolationGroupOut
+
+
+# ---------------------------------------------------------------------------
+# Admin dashboard
+# ---------------------------------------------------------------------------
+
+class DashboardDay(BaseModel):
+    day: date
+    reviews_submitted: int
+    reviews_approved: int
+    reviews_rejected: int
+    violations_reported: int
+    users_created: int
+    active_users: int
+
+
+class DashboardOut(BaseModel):
+    reviews_by_status: dict[str, int]
+    violations_by_status: dict[str, int]
+    open_violations_by_severity: dict[str, int]  # open + in_review
+    users_by_status: dict[str, int]
+    daily: list[DashboardDay]
+
+
+class PremoderationOut(BaseModel):
+    enabled: bool
+    running: bool = False
+    model_loaded: bool = False
+    auto_approve_below: Optional[float] = None
+    queue_size: int = 0
+    stats: dict[str, float] = {}
+
+
+class SlowQueryOut(BaseModel):
+    fingerprint: str
+    statement: str
+    params: str
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    last_seen: Optional[datetime] = None
+    route: Optional[str] = None
+    request_id: Optional[str] = None
+    plan: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
+class SlowQueriesOut(BaseModel):
+    enabled: bool
+    threshold_ms: Optional[float] = None
+    dropped: int = 0
+    queries: list[SlowQueryOut] = []
+
+
+# ---------------------------------------------------------------------------
+# Content filter blocklist
+# ---------------------------------------------------------------------------
+
+class BlockedTermCreate(BaseModel):
+    term: str = Field(min_length=1, max_length=100)
+    category: Literal["hate_speech", "harassment", "spam", "other"] = "hate_speech"
+
+
+class BlockedTermOut(BaseModel):
+    term: str
+    category: str
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+# ---------------------------------------------------------------------------
+# Bulk actions
+# ---------------------------------------------------------------------------
+
+class BulkItemResult(BaseModel):
+    id: uuid.UUID
+    outcome: Literal["updated", "unchanged", "not_found"]
+
+
+class BulkActionResult(BaseModel):
+    updated: int
+    results: list[BulkItemResult]
+
+    @classmethod
+    def build(cls, ids: list[uuid.UUID], updated: set[uuid.UUID], existing: set[uuid.UUID]) -> "BulkActionResult":
+        results = [
+            BulkItemResult(
+                id=item_id,
+                outcome="updated" if item_id in updated else "unchanged" if item_id in existing else "not_found",
+            )
+            for item_id in dict.fromkeys(ids)
+        ]
+        return cls(updated=len(updated), results=results)
+
+
 # ---------------------------------------------------------------------------
 # Pagination
 # ---------------------------------------------------------------------------
@@ -0,0 +1,76 @@
+"""
+Fingerprint existing reviews for near-duplicate detection.
+
+Walks reviews without a fingerprint oldest first, in batches of --batch-size
+(one transaction each), and indexes them the same way review submission
+does. Because earlier reviews are indexed first, each review is compared
+with everything older, so in a pasted campaign the copies — not the
+original — are the near-duplicates.
+
+With --report, near-duplicates found along the way are also handled like
+new submissions: pending ones are held for a human (risk flag
+near_duplicate) and a system spam report is filed (DUPLICATE_AUTO_REPORT).
+Without it the backfill only builds the index.
+
+Safe to re-run and to run while the app is serving; reviews too short to
+fingerprint are skipped every time.
+
+Usage (from backend/, with .env or DATABASE_URL set):
+    python scripts/backfill_fingerprints.py --batch-size 500 [--report]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings  # noqa: E402
+from app.crud import review_fingerprints  # noqa: E402
+from app.db.base import AsyncSessionLocal, dispose_engine  # noqa: E402
+
+
+async def run(batch_size: int, report: bool) -> None:
+    start = time.perf_counter()
+    seen = duplicates = reports = 0
+    after = None
+    try:
+        while True:
+            async with AsyncSessionLocal() as db:
+                batch = await review_fingerprints.get_unindexed(db, after=after, limit=batch_size)
+                if not batch:
+                    break
+                for review in batch:
+                    found = await review_fingerprints.index_review(
+                        db, review, settings.DUPLICATE_SIMILARITY_THRESHOLD
+                    )
+                    if found:
+                        duplicates += 1
+                        if report:
+                            violation = await review_fingerprints.flag_near_duplicate(
+                                db, review, found, auto_report=settings.DUPLICATE_AUTO_REPORT
+                            )
+                            reports += violation is not None
+                await db.commit()
+            seen += len(batch)
+            after = (batch[-1].created_at, batch[-1].id)
+            print(f"{seen} reviews, {duplicates} near-duplicates, {reports} reports filed")
+    finally:
+        await dispose_engine()
+
+    elapsed = time.perf_counter() - start
+    print(f"done in {elapsed:.1f}s ({seen / max(elapsed, 1e-9):,.0f} reviews/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--report", action="store_true", help="flag and report near-duplicates found")
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size, args.report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark for the logging pipeline (app/core/logger.py).
+
+Drives the real app in-process (httpx ASGITransport, no server, no DB)
+with --requests GETs to /health at --concurrency, and prints requests per
+second with
+  1. logging disabled,
+  2. synchronous handlers (console + file written on the event loop, the
+     old setup_logger), and
+  3. the queue pipeline (records handed to a background writer thread).
+Console output goes to a temp file so the terminal isn't the bottleneck.
+--stall-ms adds a sleep to every write, to show what a slow disk or a
+blocked stdout pipe does to request throughput in each mode.
+
+Usage (from backend/):
+    python scripts/bench_logging.py --requests 5000 --concurrency 50 --stall-ms 1
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+
+from app.core.logger import make_formatter, queue_handler, shutdown_logger  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+class StallingStream:
+    """File wrapper that sleeps on every write (simulated slow disk)."""
+
+    def __init__(self, stream, stall_seconds: float):
+        self.stream = stream
+        self.stall_seconds = stall_seconds
+
+    def write(self, data: str) -> int:
+        if self.stall_seconds:
+            time.sleep(self.stall_seconds)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def make_handlers(directory: Path, stall_seconds: float) -> list[logging.Handler]:
+    formatter = make_formatter()
+    console = logging.StreamHandler(StallingStream(open(directory / "console.log", "w"), stall_seconds))
+    file_handler = logging.StreamHandler(StallingStream(open(directory / "app.log", "w"), stall_seconds))
+    for handler in (console, file_handler):
+        handler.setFormatter(formatter)
+    return [console, file_handler]
+
+
+def configure(mode: str, directory: Path, stall_seconds: float) -> None:
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    shutdown_logger()
+    logging.disable(logging.NOTSET)
+    root.setLevel(logging.INFO)
+    for name in ("httpx", "httpcore"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    if mode == "disabled":
+        logging.disable(logging.CRITICAL)
+    elif mode == "sync":
+        for handler in make_handlers(directory, stall_seconds):
+            root.addHandler(handler)
+    else:
+        root.addHandler(queue_handler(*make_handlers(directory, stall_seconds)))
+
+
+async def run(requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get("/health")
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--stall-ms", type=float, default=0.0, help="sleep per log write")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, stall {args.stall_ms} ms per write")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("disabled", "sync", "queue"):
+            configure(mode, Path(tmp), args.stall_ms / 1000)
+            asyncio.run(run(min(200, args.requests), args.concurrency))  # warm-up
+            rps = asyncio.run(run(args.requests, args.concurrency))
+            shutdown_logger()
+            print(f"  {mode:<9} {rps:>9.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Throughput benchmark for the OTP mail dispatcher.
+
+Runs a local SMTP stand-in (no TLS, no auth) and pushes N messages through
+  1. the legacy path: one connection + handshake per message, and
+  2. MailDispatcher with a pool of persistent connections,
+then prints emails/second for each.
+
+--connect-latency-ms simulates the cost of TCP + STARTTLS + LOGIN that a real
+relay (e.g. Mailjet) charges per connection.
+
+Usage (from backend/):
+    python scripts/bench_mailer.py --messages 500 --pool-size 4 --connect-latency-ms 80
+"""
+
+import argparse
+import asyncio
+import smtplib
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.mailer import MailDispatcher, build_otp_message  # noqa: E402
+
+
+class SMTPStandIn:
+    """Minimal SMTP server: accepts and counts messages, nothing else."""
+
+    def __init__(self, connect_latency: float, message_latency: float):
+        self.connect_latency = connect_latency
+        self.message_latency = message_latency
+        self.received = 0
+        self.connections = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.connect_latency)
+        writer.write(b"220 standin ESMTP\r\n")
+        try:
+            while line := await reader.readline():
+                cmd = line[:4].upper()
+                if cmd == b"EHLO":
+                    writer.write(b"250-standin\r\n250 8BITMIME\r\n")
+                elif cmd == b"DATA":
+                    writer.write(b"354 go ahead\r\n")
+                    await writer.drain()
+                    while (await reader.readline()) != b".\r\n":
+                        pass
+                    await asyncio.sleep(self.message_latency)
+                    self.received += 1
+                    writer.write(b"250 OK queued\r\n")
+                elif cmd == b"QUIT":
+                    writer.write(b"221 bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"250 OK\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def _send_one_per_connection(port: int, message) -> None:
+    with smtplib.SMTP("127.0.0.1", port) as server:
+        server.send_message(message)
+
+
+async def bench_legacy(port: int, count: int) -> float:
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        loop.run_in_executor(None, _send_one_per_connection, port, _message(i))
+        for i in range(count)
+    ])
+    return time.perf_counter() - start
+
+
+async def bench_dispatcher(port: int, count: int, pool_size: int, batch_size: int) -> tuple[float, MailDispatcher]:
+    dispatcher = MailDispatcher(
+        host="127.0.0.1",
+        port=port,
+        sender="bench@example.com",
+        use_starttls=False,
+        pool_size=pool_size,
+        queue_size=count,
+        batch_size=batch_size,
+    )
+    await dispatcher.start()
+    messages = [_message(i) for i in range(count)]
+    start = time.perf_counter()
+    for i, message in enumerate(messages):
+        dispatcher.enqueue(message, log_key=f"bench-{i}")
+    enqueued = time.perf_counter() - start
+    await dispatcher.join()
+    elapsed = time.perf_counter() - start
+    await dispatcher.stop()
+    print(f"  enqueue latency:  {enqueued / count * 1e6:.1f} µs/message")
+    return elapsed, dispatcher
+
+
+def _message(i: int):
+    msg = build_otp_message(f"student{i}@mail.aub.edu", f"{i % 1_000_000:06d}")
+    msg["From"] = "bench@example.com"
+    return msg
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--connect-latency-ms", type=float, default=80.0)
+    parser.add_argument("--message-latency-ms", type=float, default=2.0)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    standin = SMTPStandIn(args.connect_latency_ms / 1000, args.message_latency_ms / 1000)
+    port = await standin.start()
+    print(f"SMTP stand-in on 127.0.0.1:{port} "
+          f"(connect={args.connect_latency_ms}ms, message={args.message_latency_ms}ms)")
+
+    if not args.skip_legacy:
+        before = standin.received
+        elapsed = await bench_legacy(port, args.messages)
+        print(f"legacy (connection per message): {args.messages / elapsed:8.1f} emails/s "
+              f"[{standin.received - before} delivered in {elapsed:.2f}s]")
+
+    before, conns_before = standin.received, standin.connections
+    print(f"dispatcher (pool={args.pool_size}, batch={args.batch_size}):")
+    elapsed, dispatcher = await bench_dispatcher(port, args.messages, args.pool_size, args.batch_size)
+    print(f"  throughput:       {args.messages / elapsed:8.1f} emails/s "
+          f"[{standin.received - before} delivered in {elapsed:.2f}s, "
+          f"{standin.connections - conns_before} connection(s), {dispatcher.stats.batches} batch(es)]")
+
+    await standin.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Startup benchmark: import time and time-to-first-response, with budgets.
+
+Each measurement runs in a fresh interpreter so module caches don't hide
+regressions:
+  import  — wall time of `import app.main` (median of --runs)
+  ttfr    — from spawning `uvicorn app.main:app` to the first 200 from /health
+            (lifespan included; background jobs and schema check disabled)
+
+Exits non-zero if either median exceeds its budget, so it can gate CI.
+--top prints the slowest modules from `python -X importtime` to help find
+what regressed.
+
+Usage (from backend/, with .env or the equivalent variables set):
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 7 --import-budget-ms 1500 --ttfr-budget-ms 4000 --top 15
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["JOBS_ENABLED"] = "false"
+    env["SCHEMA_CHECK"] = "off"
+    return env
+
+
+def measure_import() -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_ttfr(timeout: float = 30.0) -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client() as client:
+            while time.perf_counter() - start < timeout:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health", timeout=0.5).status_code == 200:
+                        return (time.perf_counter() - start) * 1000
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"no response from /health within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def print_top_imports(count: int) -> None:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    print(f"\nslowest {count} imports (cumulative ms / self ms):")
+    for cumulative, own, name in sorted(rows, reverse=True)[:count]:
+        print(f"  {cumulative / 1000:8.1f} {own / 1000:8.1f}  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 2000)))
+    parser.add_argument("--ttfr-budget-ms", type=float, default=float(os.environ.get("STARTUP_TTFR_BUDGET_MS", 5000)))
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest imports")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    ttfrs = [measure_ttfr() for _ in range(args.runs)]
+    import_ms = statistics.median(imports)
+    ttfr_ms = statistics.median(ttfrs)
+
+    failed = False
+    for label, value, budget in (
+        ("import app.main", import_ms, args.import_budget_ms),
+        ("time to first response", ttfr_ms, args.ttfr_budget_ms),
+    ):
+        ok = value <= budget
+        failed |= not ok
+        print(f"{label:24s} {value:8.1f} ms  (budget {budget:.0f} ms)  {'ok' if ok else 'OVER BUDGET'}")
+
+    if args.top:
+        print_top_imports(args.top)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Verify the live database schema against the ORM models and the Alembic head.
+
+Lists missing tables, CHECK/UNIQUE constraints and indexes, CHECK
+constraints whose allowed values differ from the model, and a database not at
+the expected migration head. Exits 1 if any drift remains, so it can gate a
+deploy.
+
+--repair recreates drifted CHECK constraints (NOT VALID, then VALIDATE) and
+missing indexes. Everything else needs `alembic upgrade head`.
+
+Usage (from backend/, with .env or DATABASE_URL set):
+    python scripts/check_schema.py
+    python scripts/check_schema.py --repair
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.base import dispose_engine, get_engine  # noqa: E402
+from app.db.schema_check import check_and_repair  # noqa: E402
+
+
+async def run(apply_repairs: bool) -> int:
+    try:
+        async with get_engine().connect() as conn:
+            drift = await conn.run_sync(check_and_repair, apply_repairs)
+    finally:
+        await dispose_engine()
+
+    for item in drift:
+        hint = " (repairable with --repair)" if item.repairable and not apply_repairs else ""
+        print(f"DRIFT  {item}{hint}")
+    print(f"{len(drift)} drift item(s)" if drift else "schema ok")
+    return 1 if drift else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repair", action="store_true", help="repair check constraints and indexes")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.repair)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Rebuild the admin dashboard rollups from the base tables.
+
+Recomputes every running counter (reviews, violations and users by status)
+and every daily activity row in one transaction. Use it to backfill after a
+restore or bulk import, or if the counters are suspected to have drifted.
+Concurrent writes wait for it to commit rather than being lost.
+
+Usage (from backend/, with .env or DATABASE_URL set):
+    python scripts/rebuild_dashboard.py
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.crud import dashboard  # noqa: E402
+from app.db.base import AsyncSessionLocal, dispose_engine  # noqa: E402
+
+
+async def run() -> None:
+    start = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            await dashboard.rebuild(db)
+            await db.commit()
+            counters = await dashboard.get_counters(db)
+    finally:
+        await dispose_engine()
+
+    for name, value in sorted(counters.items()):
+        print(f"{name:32s} {value}")
+    print(f"rebuilt in {time.perf_counter() - start:.2f}s")
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Re-encrypt and re-index encrypted email columns after a key rotation.
+
+Streams `users` and `otps` through a server-side cursor (constant memory),
+decrypts each row with whatever key version produced it, and writes back
+rows whose ciphertext is not on the current key version or whose blind
+index was computed with a retired HMAC key. Writes are batched executemany
+UPDATEs, one short transaction per batch.
+
+Progress is checkpointed to a JSON file after every batch (last primary key
+per table), so an interrupted run resumes where it stopped. Rows already on
+the current keys are skipped, so re-running from scratch is also safe.
+
+See app/core/encryption.py for the rotation procedure.
+
+Usage (from backend/, with the new and old keys configured in .env):
+    python scripts/rotate_field_keys.py --batch-size 1000
+    python scripts/rotate_field_keys.py --dry-run
+    python scripts/rotate_field_keys.py --reset        # ignore the checkpoint file
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+load_dotenv()
+
+from sqlalchemy import bindparam, create_engine, select, update  # noqa: E402
+
+from app.core.encryption import (  # noqa: E402
+    blind_index,
+    decrypt_field,
+    encrypt_field,
+    needs_reencryption,
+)
+from app.models.user import User  # noqa: E402
+from app.models.otp import OTP  # noqa: E402
+
+TABLES = [User.__table__, OTP.__table__]
+
+
+def _load_checkpoint(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {}
+
+
+def _save_checkpoint(path: Path, checkpoint: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(checkpoint, indent=2))
+    tmp.replace(path)
+
+
+def rotate_table(engine, table, batch_size: int, checkpoint: dict, checkpoint_path: Path, dry_run: bool) -> dict:
+    state = checkpoint.setdefault(table.name, {"last_id": None, "scanned": 0, "rotated": 0, "done": False})
+    if state["done"]:
+        print(f"{table.name}: already complete per checkpoint, skipping")
+        return state
+
+    id_col = table.c.id
+    query = select(id_col, table.c.email_encrypted, table.c.email_index).order_by(id_col)
+    if state["last_id"] is not None:
+        query = query.where(id_col > id_col.type.python_type(state["last_id"]))
+
+    stmt = (
+        update(table)
+        .where(id_col == bindparam("b_id"))
+        .values(email_encrypted=bindparam("b_encrypted"), email_index=bindparam("b_index"))
+    )
+
+    start = time.perf_counter()
+    scanned_at_start = state["scanned"]
+    with engine.connect().execution_options(stream_results=True, yield_per=batch_size) as reader:
+        for rows in reader.execute(query).partitions(batch_size):
+            updates = []
+            for row in rows:
+                plaintext = decrypt_field(row.email_encrypted)
+                new_index = blind_index(plaintext)
+                if needs_reencryption(row.email_encrypted) or row.email_index != new_index:
+                    updates.append({
+                        "b_id": row.id,
+                        "b_encrypted": encrypt_field(plaintext),
+                        "b_index": new_index,
+                    })
+
+            if updates and not dry_run:
+                with engine.begin() as writer:
+                    writer.execute(stmt, updates)
+
+            state["scanned"] += len(rows)
+            state["rotated"] += len(updates)
+            state["last_id"] = str(rows[-1].id)
+            if not dry_run:
+                _save_checkpoint(checkpoint_path, checkpoint)
+
+            elapsed = time.perf_counter() - start
+            rate = (state["scanned"] - scanned_at_start) / elapsed if elapsed else 0.0
+            print(f"{table.name}: scanned={state['scanned']} rotated={state['rotated']} {rate:,.0f} rows/s")
+
+    state["done"] = True
+    if not dry_run:
+        _save_checkpoint(checkpoint_path, checkpoint)
+    return state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--checkpoint", type=Path, default=Path("rotate_field_keys.checkpoint.json"))
+    parser.add_argument("--dry-run", action="store_true", help="count rows that would change, write nothing")
+    parser.add_argument("--reset", action="store_true", help="discard an existing checkpoint")
+    args = parser.parse_args()
+
+    url = os.environ.get("DATABASE_URL")
+    if url is None:
+        raise SystemExit("DATABASE_URL missing")
+    engine = create_engine(url.replace("+asyncpg", ""), future=True)
+
+    checkpoint = {} if args.reset else _load_checkpoint(args.checkpoint)
+    start = time.perf_counter()
+    totals = [rotate_table(engine, t, args.batch_size, checkpoint, args.checkpoint, args.dry_run) for t in TABLES]
+    elapsed = time.perf_counter() - start
+
+    scanned = sum(t["scanned"] for t in totals)
+    rotated = sum(t["rotated"] for t in totals)
+    print(
+        f"\n{'[dry run] ' if args.dry_run else ''}done in {elapsed:.1f}s — "
+        f"scanned={scanned} rotated={rotated} ({scanned / elapsed if elapsed else 0:,.0f} rows/s)"
+    )
+    if not args.dry_run and args.checkpoint.exists():
+        args.checkpoint.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -126,6 +126,13 @@ const users = {
       body: JSON.stringify({ status: statusValue }),
     })
   },
+
+  async adminBulkUpdate(userIds, changes) {
+    return request("/users/admin/bulk", {
+      method: "POST",
+      body: JSON.stringify({ user_ids: userIds, ...changes }),
+    })
+  },
 }
 
 // ---------------------------------------------------------------------------
@@ -264,6 +271,13 @@ const reviews = {
     })
   },
 
+  async bulkUpdateStatus(reviewIds, status) {
+    return request("/admin/reviews/bulk-status", {
+      method: "POST",
+      body: JSON.stringify({ review_ids: reviewIds, status }),
+    })
+  },
+
   async update(reviewId, data) {
     return request(`/reviews/${reviewId}`, {
       method: "PATCH",
@@ -319,11 +333,125 @@ const violations = {
       body: JSON.stringify(data),
     })
   },
+
+  async bulkUpdate(violationIds, data) {
+    return request("/violations/bulk", {
+      method: "POST",
+      body: JSON.stringify({ violation_ids: violationIds, ...data }),
+    })
+  },
+
+  async listGroups(params = {}) {
+    const q = new URLSearchParams(params).toString()
+    return request(`/violations/groups${q ? "?" + q : ""}`)
+  },
+
+  async resolveGroup(reviewId, data) {
+    return request(`/violations/groups/${reviewId}/resolve`, {
+      method: "POST",
+      body: JSON.stringify(data),
+    })
+  },
+}
+
+// ---------------------------------------------------------------------------
+// Admin
+// ---------------------------------------------------------------------------
+
+const admin = {
+  async dashboard(params = {}) {
+    const q = new URLSearchParams(params).toString()
+    return request(`/admin/dashboard${q ? "?" + q : ""}`)
+  },
+
+  async slowQueries(params = {}) {
+    const q = new URLSearchParams(params).toString()
+    return request(`/admin/slow-queries${q ? "?" + q : ""}`)
+  },
+
+  async blocklist() {
+    return request("/admin/blocklist")
+  },
+
+  async addBlockedTerm(term, category = "hate_speech") {
+    return request("/admin/blocklist", {
+      method: "POST",
+      body: JSON.stringify({ term, category }),
+    })
+  },
+
+  async removeBlockedTerm(term) {
+    return request(`/admin/blocklist/${encodeURIComponent(term)}`, { method: "DELETE" })
+  },
+
+  async muteUser(userId, minutes) {
+    return request(`/admin/users/${userId}/mute`, {
+      method: "POST",
+      body: JSON.stringify({ minutes }),
+    })
+  },
+
+  async unmuteUser(userId) {
+    return request(`/admin/users/${userId}/unmute`, { method: "POST" })
+  },
+
+  async blockUser(userId) {
+    return request(`/admin/users/${userId}/block`, { method: "POST" })
+  },
+
+  async unblockUser(userId) {
+    return request(`/admin/users/${userId}/unblock`, { method: "POST" })
+  },
+
+  /**
+   * Follow the moderation event stream (GET /admin/stream), calling
+   * onEvent(type, data) per event. EventSource can't send the Bearer header,
+   * so the SSE body is read with fetch; the stream is reopened with
+   * Last-Event-ID after a drop until `signal` aborts.
+   */
+  async stream(onEvent, signal) {
+    let lastEventId = null
+    let retryMs = 3000
+
+    while (!signal?.aborted) {
+      try {
+        const headers = { Authorization: `Bearer ${token.get()}` }
+        if (lastEventId) headers["Last-Event-ID"] = lastEventId
+        const resp = await fetch(`${BASE}/admin/stream`, { headers, signal })
+        if (!resp.ok) throw new Error(`Stream failed (${resp.status})`)
+
+        const reader = resp.body.pipeThrough(new TextDecoderStream()).getReader()
+        let buffer = ""
+        while (true) {
+          const { value, done } = await reader.read()
+          if (done) break
+          buffer += value
+          let end
+          while ((end = buffer.indexOf("\n\n")) !== -1) {
+            const block = buffer.slice(0, end)
+            buffer = buffer.slice(end + 2)
+            let type = "message"
+            let data = ""
+            for (const line of block.split("\n")) {
+              if (line.startsWith("id: ")) lastEventId = line.slice(4)
+              else if (line.startsWith("event: ")) type = line.slice(7)
+              else if (line.startsWith("data: ")) data += line.slice(6)
+              else if (line.startsWith("retry: ")) retryMs = Number(line.slice(7)) || retryMs
+            }
+            if (data) onEvent(type, JSON.parse(data))
+          }
+        }
+      } catch (err) {
+        if (signal?.aborted) return
+      }
+      await new Promise((resolve) => setTimeout(resolve, retryMs))
+    }
+  },
 }
 
 // ---------------------------------------------------------------------------
 // Export
 // ---------------------------------------------------------------------------
 
-const api = { auth, users, courses, professors, sections, semesters, reviews, violations, token }
+const api = { auth, users, courses, professors, sections, semesters, reviews, violations, admin, token }
 export default api
\ No newline at end of file
@@ -80,6 +80,34 @@ function Admin({ user }) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [statusFilter, severityFilter, typeFilter, searchFilter, isAdmin])
 
+  // Refetch a list only when the moderation stream reports a change to it.
+  const reloadRef = useRef({})
+  reloadRef.current = { loadViolations, loadPendingReviews }
+
+  useEffect(() => {
+    if (!isAdmin) return
+    const controller = new AbortController()
+    const timers = {}
+    const schedule = (name) => {
+      clearTimeout(timers[name])
+      timers[name] = setTimeout(() => reloadRef.current[name](), 500)
+    }
+    api.admin.stream((type) => {
+      if (type === "reset") {
+        schedule("loadViolations")
+        schedule("loadPendingReviews")
+      } else if (type.startsWith("review.")) {
+        schedule("loadPendingReviews")
+      } else if (type.startsWith("violation.")) {
+        schedule("loadViolations")
+      }
+    }, controller.signal)
+    return () => {
+      controller.abort()
+      Object.values(timers).forEach(clearTimeout)
+    }
+  }, [isAdmin])
+
   const loadUsers = async () => {
     if (!isAdmin) return
     setUsersLoading(true)
@@ -425,9 +453,9 @@ function Admin({ user }) {
               <div className="admin-card-row" style={{ marginTop: "8px" }}>
                 <span className="chip">Reported: {new Date(v.created_at).toLocaleString()}</span>
                 <span className="chip">
-                  Reporter: {v.reported_by_student?.username || v.reported_by_student_id || "anonymous"}
+                  Reporter: {v.reporter_username || v.reported_by_student?.username || v.reported_by_student_id || "anonymous"}
                 </span>
-                <span className="chip">Author: {v.review?.student?.username || "unknown"}</span>
+                <span className="chip">Author: {v.review_author_username || v.review?.student?.username || "unknown"}</span>
                 <span className="chip">
                   Resolved: {v.resolved_at ? new Date(v.resolved_at).toLocaleString() : "Not resolved"}
                 </span>
@@ -439,7 +467,7 @@ function Admin({ user }) {
 
               <div style={{ marginTop: "12px" }}>
                 <p><strong>Reported Review</strong></p>
-                <p>{v.review?.content || "No review content available."}</p>
+                <p>{v.review?.content || v.review_excerpt || "No review content available."}</p>
               </div>
 
               <div className="admin-card-controls">
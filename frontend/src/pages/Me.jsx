@@ -37,7 +37,7 @@ function Me({ onLogout }) {
           const studentId = me?.student?.id
           const visibleViolations = (violations || []).filter((violation) => {
             if (!violation || violation.status !== "resolved") return false
-            return studentId && violation.review?.student?.id === studentId
+            return studentId && violation.review_author_id === studentId
           })
           setResolvedViolations(visibleViolations)
         } catch (violationErr) {
@@ -201,10 +201,10 @@ function Me({ onLogout }) {
                       </div>
                     </div>
 
-                    {violation.review?.content && (
+                    {violation.review_excerpt && (
                       <div className="violation-detail">
                         <p><strong>Reported Review</strong></p>
-                        <p>{violation.review.content}</p>
+                        <p>{violation.review_excerpt}</p>
                       </div>
                     )}
 